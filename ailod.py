@@ -0,0 +1,54 @@
+import pygame
+
+# (max distance from player, update interval in ticks) - checked in order, last tier catches everything
+LOD_TIERS = [
+    (700, 1),  # Near the player: full rate
+    (1400, 2),  # Mid range: every 2nd tick, double step
+    (float("inf"), 4),  # Far away: every 4th tick, quadruple step
+]
+SCREEN_MARGIN = 100  # Enemies this close to the camera view count as on-screen
+
+
+class AILODScheduler:
+    """Picks which enemies run AI this tick. Distant, off-screen enemies update less often with larger steps."""
+
+    def __init__(self, view_width, view_height, tiers=LOD_TIERS):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.tiers = [(distance * distance, interval) for distance, interval in tiers]
+        self.tick = 0
+        self._next_bucket = 0
+        self.updated_last_tick = 0
+        self.skipped_last_tick = 0
+
+    def schedule(self, enemies, player, camera_x, camera_y):
+        """Returns [(enemy, step)] for enemies due this tick. `step` is how many ticks of movement to apply."""
+        self.tick += 1
+        view = pygame.Rect(camera_x - SCREEN_MARGIN, camera_y - SCREEN_MARGIN,
+                           self.view_width + SCREEN_MARGIN * 2, self.view_height + SCREEN_MARGIN * 2)
+        player_x, player_y = player.rect.center
+        due = []
+
+        for enemy in enemies:
+            rect = enemy.rect
+            if rect is None or not enemy.AI_LOD or view.colliderect(rect):
+                due.append((enemy, 1))  # On-screen or exempt (boss): every tick
+                continue
+
+            dx, dy = rect.centerx - player_x, rect.centery - player_y
+            distance_sq = dx * dx + dy * dy
+            interval = next(interval for max_distance_sq, interval in self.tiers if distance_sq <= max_distance_sq)
+            if interval == 1:
+                due.append((enemy, 1))
+                continue
+
+            # ✅ Round-robin buckets spread each tier's updates evenly across ticks
+            if enemy.lod_bucket is None:
+                enemy.lod_bucket = self._next_bucket
+                self._next_bucket += 1
+            if (self.tick + enemy.lod_bucket) % interval == 0:
+                due.append((enemy, interval))
+
+        self.updated_last_tick = len(due)
+        self.skipped_last_tick = len(enemies) - len(due)
+        return due
@@ -0,0 +1,42 @@
+import numpy as np
+from bullet import handle_enemy_kill
+from entities import HEALTH, COLLIDER
+
+
+class AoEResolver:
+    """Collects area-of-effect damage during a tick and resolves it in batched passes."""
+
+    def __init__(self, particles):
+        self.particles = particles  # The game's ParticleSystem, for the blast visuals
+        self.pending = []  # (center_x, center_y, radius, damage) queued this tick
+
+    def queue(self, center, radius, damage=1):
+        """Queues an explosion and starts its visual effect right away."""
+        self.pending.append((center[0], center[1], radius, damage))
+        self.particles.explosion(center, radius)
+
+    def resolve(self, game):
+        """Applies all queued explosions. Missiles caught in a blast detonate and are resolved in the next round."""
+        while self.pending:
+            blasts = np.array(self.pending, dtype=np.float64)
+            self.pending = []
+
+            # Chain reaction: missiles caught in a blast go off too (queued for the next round)
+            game.enemy_bullets.detonate_near(blasts, game)
+
+            targets = [enemy for enemy in game.enemies.each(HEALTH, COLLIDER)
+                       if enemy.rect is not None and not enemy.is_dying]
+            if not targets:
+                continue
+
+            # ✅ One distance matrix for every blast against every target
+            centers = np.array([enemy.rect.center for enemy in targets], dtype=np.float64)
+            dx = centers[None, :, 0] - blasts[:, None, 0]
+            dy = centers[None, :, 1] - blasts[:, None, 1]
+            in_range = dx * dx + dy * dy <= (blasts[:, 2] ** 2)[:, None]
+            damage = (in_range * blasts[:, 3, None]).sum(axis=0)
+
+            for index in np.flatnonzero(damage):
+                enemy = targets[index]
+                if enemy.take_damage(int(damage[index])):
+                    handle_enemy_kill(enemy, game)
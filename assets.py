@@ -0,0 +1,120 @@
+import threading
+import pygame
+
+# Every texture the game uses: name -> (file path, has per-pixel alpha)
+TEXTURES = {
+    "floor": ("textures/StoneFloorTexture.png", True),
+    "grass": ("textures/grass.jpg", False),
+    "wall": ("textures/wall.png", True),
+    "menu_background": ("textures/Menu.webp", False),
+    "leaderboard_background": ("textures/leaderboard_background.webp", False),
+}
+
+
+class AssetManager:
+    """Lazily loads textures, converts them to the display format once, and caches scaled variants."""
+
+    def __init__(self, textures):
+        self.textures = textures
+        self._decoded = {}  # (name, size) -> surface decoded/scaled but not yet converted
+        self._converted = {}  # (name, size) -> display-format surface ready to blit
+        self._lock = threading.Lock()
+        self._preload_thread = None
+        self._preload_total = 0
+        self._preload_done = 0
+
+    def get(self, name, size=None):
+        """Returns the texture converted to the display format, scaled to `size` if given."""
+        key = (name, size)
+        surface = self._converted.get(key)
+        if surface is not None:
+            return surface  # ✅ Fast path: already converted
+
+        with self._lock:
+            decoded = self._decoded.pop(key, None)
+        if decoded is None:
+            decoded = self._decode(name, size)
+
+        surface = self._convert(name, decoded)
+        self._converted[key] = surface
+        return surface
+
+    def _decode(self, name, size):
+        """Reads the file from disk and scales it. Safe to call off the main thread."""
+        path, _ = self.textures[name]
+        surface = pygame.image.load(path)
+        if size is not None and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        return surface
+
+    def _convert(self, name, surface):
+        """Converts to the display pixel format. Needs a display mode, so it stays on the main thread."""
+        if pygame.display.get_surface() is None:
+            return surface  # No window yet (headless tools); blit will convert on the fly
+        _, alpha = self.textures[name]
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def preload(self, requests):
+        """Decodes and scales `(name, size)` pairs on a worker thread."""
+        if self._preload_thread is not None and self._preload_thread.is_alive():
+            return
+
+        pending = [key for key in requests if key not in self._converted]
+        self._preload_total = len(pending)
+        self._preload_done = 0
+
+        def worker():
+            for name, size in pending:
+                decoded = self._decode(name, size)
+                with self._lock:
+                    self._decoded[(name, size)] = decoded
+                    self._preload_done += 1
+
+        self._preload_thread = threading.Thread(target=worker, name="asset-preload", daemon=True)
+        self._preload_thread.start()
+
+    def preload_progress(self):
+        """Returns preload progress between 0 and 1."""
+        if self._preload_total == 0:
+            return 1.0
+        with self._lock:
+            return self._preload_done / self._preload_total
+
+    def is_preloading(self):
+        return self._preload_thread is not None and self._preload_thread.is_alive()
+
+    def finish_preload(self):
+        """Converts everything the worker decoded. Call from the main thread once the window exists."""
+        if self._preload_thread is not None:
+            self._preload_thread.join()
+            self._preload_thread = None
+
+        with self._lock:
+            decoded, self._decoded = self._decoded, {}
+        for (name, size), surface in decoded.items():
+            self._converted[(name, size)] = self._convert(name, surface)
+
+    def show_loading_screen(self, screen, font, requests):
+        """Preloads `requests` in the background while drawing a progress bar."""
+        self.preload(requests)
+        clock = pygame.time.Clock()
+        width, height = screen.get_size()
+        bar_width, bar_height = width // 2, 20
+        bar_x, bar_y = (width - bar_width) // 2, height // 2
+
+        while self.is_preloading():
+            pygame.event.pump()  # Keep the window responsive while loading
+
+            screen.fill((30, 30, 30))
+            text_surface = font.render("Loading...", True, (255, 255, 255))
+            screen.blit(text_surface, ((width - text_surface.get_width()) // 2, bar_y - 40))
+            pygame.draw.rect(screen, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
+            pygame.draw.rect(screen, (50, 150, 255),
+                             (bar_x, bar_y, int(bar_width * self.preload_progress()), bar_height))
+            pygame.display.flip()
+            clock.tick(60)
+
+        self.finish_preload()
+
+
+ASSETS = AssetManager(TEXTURES)
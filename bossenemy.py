@@ -1,106 +1,129 @@
 import pygame
-import random
 import math
 from enemy import Enemy, EliteShooter
-from missile import Missile  # Assuming we create a Missile class separately
+from entities import DIES_ON_CONTACT, RANGED
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW
 
 
 class BossEnemy(Enemy):
+    AI_LOD = False  # The boss always runs full AI
+    COMPONENTS = (Enemy.COMPONENTS - {DIES_ON_CONTACT}) | {RANGED}  # Survives touching the player
+    SEPARATION_STRENGTH = 0  # Too big for the separation grid; moves on its own terms
+    SIZE = 100  # Override size
+    SPEED = 0.75  # Normal movement speed (sub-pixel, kept exact by the float position)
+    DASH_SPEED = 100  # Much faster dash speed for dashing
+    DASH_COOLDOWN = 3000  # 3-second cooldown between dashes
+    CHARGE_TIME = 800  # 0.8-second warning before dashing
+    MISSILE_COOLDOWN = 3000  # Fire missile every 3 seconds
+    MISSILE_RETRY = 250  # Re-check this often while the player is behind cover
+    SUMMON_COOLDOWN = 25000  # Summon Elite Shooters every 25 seconds
+    HIT_EFFECT_DURATION = 150  # Duration of hit flash effect
+    COLOR = (0, 0, 0)  # Set Boss color to black
+    __slots__ = ("summon_timer", "last_dash_time", "is_charging", "charge_start_time", "last_missile_time",
+                 "missile_timer", "target")
+
     def __init__(self, x, y):
         super().__init__(x, y, health=150)
-        self.rect = pygame.Rect(x, y, 100, 100)  # Override size
-        self.base_speed = 0.75  # Normal movement speed
-        self.dash_speed = 100  # Much faster dash speed for dashing
-        self.speed = self.base_speed
         self.summon_timer = 0  # Timer for summoning Elite Shooters
-        self.missile_timer = 0  # Timer for launching homing missiles
-        self.dash_cooldown = 3000  # 3-second cooldown between dashes
-        self.charge_time = 800  # 0.8-second warning before dashing
-        self.last_dash_time = pygame.time.get_ticks()
+        self.last_dash_time = GAME_CLOCK.now
         self.is_charging = False
         self.charge_start_time = 0
-        self.missile_cooldown = 3000  # Fire missile every 3 seconds
-        self.summon_cooldown = 25000  # Summon Elite Shooters every 25 seconds
-        self.last_missile_time = pygame.time.get_ticks()
+        self.last_missile_time = GAME_CLOCK.now
+        self.missile_timer = None  # Repeating missile timer, started on the first update
         self.target = None  # Player target reference (set externally)
-        self.color = (0, 0, 0)  # Set Boss color to black
-        self.hit_timer = 0
-        self.hit_effect_duration = 150  # Duration of hit flash effect
-        self.is_dying = False
 
-    def update(self, player, obstacles, game, enemy_bullets=None):
+    def update(self, player, world, game, step=1):
         """ Updates Boss logic, including movement, attacks, and summons. """
-        super().update(player, obstacles, game)  # Keeps base movement logic
+        super().update(player, world, game, step=step)  # Keeps base movement logic
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
+        center_x, center_y = self.center
         distance_to_player = math.sqrt(
-            (player.rect.centerx - self.rect.centerx) ** 2 + (player.rect.centery - self.rect.centery) ** 2)
+            (player.rect.centerx - center_x) ** 2 + (player.rect.centery - center_y) ** 2)
 
         # Ensure boss has a target
         if self.target is None:
             self.target = player
 
-        # Start charging phase if close enough and cooldown is up
-        if distance_to_player < 200 and current_time - self.last_dash_time > self.dash_cooldown and not self.is_charging:
+        # Start charging phase if close enough and cooldown is up; the dash itself is a timer
+        if distance_to_player < 200 and current_time - self.last_dash_time > self.DASH_COOLDOWN and not self.is_charging:
             self.is_charging = True
             self.charge_start_time = current_time  # Store charge start time
             self.speed = 0  # Stop moving during charge phase
-
-        # After charge_time, actually dash
-        if self.is_charging and current_time - self.charge_start_time > self.charge_time:
-            self.is_charging = False
-            self.speed = self.dash_speed
-            self.last_dash_time = current_time  # Reset cooldown
+            GAME_CLOCK.schedule(self.CHARGE_TIME + 1, self.dash, game)
 
         # If not charging, return to normal movement speed
         elif not self.is_charging:
-            self.speed = self.base_speed
+            self.speed = self.SPEED
 
-        # Missile attack logic
-        if current_time - self.last_missile_time >= self.missile_cooldown:
-            self.fire_missile(game)
-            self.last_missile_time = current_time
+        # Missile attack logic (fires from its own repeating timer)
+        if self.missile_timer is None:
+            self.missile_timer = GAME_CLOCK.timers.schedule(self.last_missile_time + self.MISSILE_COOLDOWN,
+                                                            self.missile_due, game)
 
         # Summon Elite Shooters
         self.summon_timer += 1
-        if self.summon_timer >= self.summon_cooldown:
+        if self.summon_timer >= self.SUMMON_COOLDOWN:
             self.summon_elite_shooters(game)
             self.summon_timer = 0
 
+    def dash(self, game):
+        """Timer callback: the charge-up is over, so the next movement step is a dash."""
+        if self not in game.enemies or self.is_dying:
+            return
+        self.is_charging = False
+        self.speed = self.DASH_SPEED
+        self.last_dash_time = GAME_CLOCK.now  # Reset cooldown
+
+    def missile_due(self, game):
+        """Timer callback: fires a missile and schedules the next one."""
+        if self not in game.enemies or self.is_dying:
+            return
+        if self.target and not game.world.line_of_sight(*self.center, *self.target.rect.center):
+            # ✅ Don't waste a missile on a wall: try again shortly
+            self.missile_timer = GAME_CLOCK.schedule(self.MISSILE_RETRY, self.missile_due, game)
+            return
+        self.fire_missile(game)
+        self.last_missile_time = GAME_CLOCK.now
+        self.missile_timer = GAME_CLOCK.schedule(self.MISSILE_COOLDOWN, self.missile_due, game)
+
     def fire_missile(self, game):
         """ Fires a homing missile at the player. """
         if self.target:
-            missile = Missile(self.rect.centerx, self.rect.centery, self.target)
-            game.enemies.append(missile)
+            game.enemy_bullets.fire_missile(self.rect.centerx, self.rect.centery, self.target)
 
     def summon_elite_shooters(self, game):
         """ Summons 3 Elite Shooters randomly around the arena. """
         for _ in range(3):
-            spawn_x = random.randint(100, 2400)  # Adjust based on map size
-            spawn_y = random.randint(100, 1800)
+            spawn_x = game.rng.ai.randint(100, 2400)  # Adjust based on map size
+            spawn_y = game.rng.ai.randint(100, 1800)
             elite = EliteShooter(spawn_x, spawn_y)
             game.enemies.append(elite)
 
-    def take_damage(self, amount):
-        """Handles damage taken by the Boss. Does not remove Boss instantly."""
+    def take_damage(self, amount=1):
+        """Handles damage taken by the Boss. Returns True on the hit that kills it."""
         self.health -= amount
-        self.hit_timer = pygame.time.get_ticks()  # Trigger hit effect
+        self.hit_timer = GAME_CLOCK.now  # Trigger hit effect
 
         if self.health <= 0 and not self.is_dying:
             self.is_dying = True
-            self.death_timer = pygame.time.get_ticks()
+            self.death_timer = GAME_CLOCK.now
+            return True
+
+        return False
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the boss with a black outline, hit effect, and health bar."""
         if self.rect is None:
             return  # Don't draw if the boss is removed
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)  # Default black outline
         base_color = (50, 50, 50)  # Dark gray for boss
 
         # Damage effect
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             boss_color = (255, 255, 255)  # White flash
             outline_color = (255, 0, 0)  # Red outline on hit
         elif self.is_dying:
@@ -109,17 +132,7 @@ class BossEnemy(Enemy):
             boss_color = base_color
 
         # Shrink slightly when dying
-        shrink_factor = 0.75 if self.is_dying else 1.0
-        width, height = int(self.rect.width * shrink_factor), int(self.rect.height * shrink_factor)
-        draw_x = self.rect.x - camera_x + (self.rect.width - width) // 2
-        draw_y = self.rect.y - camera_y + (self.rect.height - height) // 2
-
-        # Draw outline
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(draw_x - 3, draw_y - 3, width + 6, height + 6))
-
-        # Draw boss
-        pygame.draw.rect(screen, boss_color, pygame.Rect(draw_x, draw_y, width, height))
+        self.draw_box(screen, camera_x, camera_y, boss_color, outline_color, 0.75 if self.is_dying else 1.0)
 
         # Draw health bar
         if not self.is_dying:
@@ -130,6 +143,7 @@ class BossEnemy(Enemy):
         bar_width = self.rect.width
         bar_height = 5
         health_percentage = max(self.health / 150, 0)  # Normalize health
-        health_bar_rect = pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y - 10,
-                                      bar_width * health_percentage, bar_height)
+        scale = WORLD_VIEW.scale
+        health_bar_rect = pygame.Rect((self.rect.x - camera_x) * scale, (self.rect.y - camera_y - 10) * scale,
+                                      bar_width * health_percentage * scale, max(bar_height * scale, 1))
         pygame.draw.rect(screen, (0, 255, 0), health_bar_rect)  # Green health bar
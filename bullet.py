@@ -1,229 +1,223 @@
 import pygame
 import math
-import random
-from enemy import Enemy, FastEnemy, TankEnemy, DasherEnemy, ShooterEnemy, DeathAnimation, SwarmEnemy
+import numpy as np
 from currency import CurrencyPickup
-from effects import ExplosionEffect
+from entities import COLLIDER
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW, scale_sprite
 
 BULLET_SPEED = 10
+BULLET_SIZE = 10
 BORDER_THICKNESS = 10  # Matches the border thickness
 TRAVEL_DISTANCE_AFTER_HIT = 5
+EXPLOSION_RADIUS = 50
 
-class Bullet:
-    def __init__(self, x, y, angle, map_width, map_height, pierce=0, delay=0, ricochet_count=0, explosive=False):
-        """Initializes a bullet with movement, piercing ability, and a fire delay."""
-        self.rect = pygame.Rect(x, y, 10, 10)
-        self.speed_x = BULLET_SPEED * math.cos(angle)
-        self.speed_y = BULLET_SPEED * math.sin(angle)
+# Bullet colors, indexed by pierce level (capped at 3), with explosive bullets last
+BULLET_COLORS = [
+    (255, 255, 0),  # Yellow (default)
+    (255, 165, 0),  # Orange (piercing level 1)
+    (255, 69, 0),  # Red-orange (piercing level 2)
+    (255, 0, 0),  # Red (high piercing level)
+    (153, 76, 0),  # Brown (explosive)
+]
+EXPLOSIVE_COLOR_INDEX = len(BULLET_COLORS) - 1
+
+
+def handle_enemy_kill(enemy, game):
+    """Plays the death animation, removes the enemy and grants XP, score and currency drops."""
+    game.particles.death(enemy.rect)
+    game.enemies.discard(enemy)
+
+    # ✅ Handle XP & Score Rewards (per-archetype table, no type dispatch)
+    score, xp, drop_chance, (min_currency, max_currency) = enemy.REWARD
+    game.score += score
+    game.player.gain_xp(xp, game)
+
+    # ✅ Drop Currency with Random Chance (loot stream, pre-drawn in batches)
+    if game.rng.loot.chance(drop_chance):
+        currency_amount = game.rng.loot.randint(min_currency, max_currency)
+        currency_pickup = CurrencyPickup(enemy.rect.centerx, enemy.rect.centery, currency_amount)
+        game.currency_drops.append(currency_pickup)
+
+
+class BulletPool:
+    """All player bullets, stored in NumPy arrays and moved, bounced and hit-tested in batched passes."""
+
+    def __init__(self, map_width, map_height, capacity=256):
         self.MAP_WIDTH = map_width
         self.MAP_HEIGHT = map_height
-        self.pierce = pierce
-        self.damage = 1  # ✅ Piercing hits multiple enemies
-        self.fired = False  # ✅ Prevents bullets from moving before firing
-        self.fire_time = pygame.time.get_ticks() + delay  # ✅ Sets fire time
-        self.ricochet_count = ricochet_count
-        self.explosive = explosive
-        self.active = True
-
-    def fire(self):
-        """Activates bullet movement."""
-        self.fired = True
-
-    def update(self, obstacles, enemies, game):
-        """Moves the bullet and handles collisions with walls, obstacles, and enemies."""
-        current_time = pygame.time.get_ticks()
-        if current_time < self.fire_time:
-            return  # ✅ Delayed bullet waiting to fire
-
-        if not self.fired:
-            self.fire()  # ✅ Activate bullet movement
-
-        self.rect.x += self.speed_x
-        self.rect.y += self.speed_y
-
-        # ✅ Check for obstacle (wall) collisions FIRST
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle.rect):
-                if self.ricochet_count > 0:
-                    self.ricochet_count -= 1
-
-                    # ✅ Determine if collision was horizontal or vertical
-                    overlap_x = min(abs(self.rect.right - obstacle.rect.left),
-                                    abs(self.rect.left - obstacle.rect.right))
-                    overlap_y = min(abs(self.rect.bottom - obstacle.rect.top),
-                                    abs(self.rect.top - obstacle.rect.bottom))
-
-                    if overlap_x < overlap_y:
-                        self.speed_x = -self.speed_x  # ✅ Flip horizontally
-                        self.rect.x += self.speed_x * 3  # ✅ Prevent sticking
-                    else:
-                        self.speed_y = -self.speed_y  # ✅ Flip vertically
-                        self.rect.y += self.speed_y * 3  # ✅ Prevent sticking
-
-                    break  # ✅ Prevent multiple ricochets in one frame
-                else:
-                    # ✅ Remove bullet if out of ricochets
-                    if self in game.player.bullets:
-                        game.player.bullets.remove(self)
-                    return
-
-                    # ✅ Check for Screen Border Collisions (AFTER obstacles)
-        if self.rect.top <= 0 or self.rect.bottom >= self.MAP_HEIGHT:
-            if self.ricochet_count > 0:
-                self.ricochet_count -= 1
-                self.speed_y = -self.speed_y  # ✅ Flip only the vertical component
-                self.rect.y += self.speed_y  # ✅ Prevents sticking
-            else:
-                if self in game.player.bullets:
-                    game.player.bullets.remove(self)
-                return
-
-        if self.rect.left <= 0 or self.rect.right >= self.MAP_WIDTH:
-            if self.ricochet_count > 0:
-                self.ricochet_count -= 1
-                self.speed_x = -self.speed_x  # ✅ Flip only the horizontal component
-                self.rect.x += self.speed_x  # ✅ Prevents sticking
+        self.count = 0
+        self._allocate(capacity)
+
+        # Pre-rendered bullet sprites so drawing is a single batched blit
+        self.sprites = []
+        for color in BULLET_COLORS:
+            sprite = pygame.Surface((BULLET_SIZE, BULLET_SIZE))
+            sprite.fill(color)
+            self.sprites.append(sprite)
+        self.scaled_sprites = {1.0: self.sprites}  # Per world render scale, built on first use
+
+    def _allocate(self, capacity):
+        """(Re)allocates the arrays, keeping the live bullets."""
+        old = getattr(self, "x", None)
+        fields = {
+            "x": np.float64, "y": np.float64,  # Top-left of the bullet box
+            "speed_x": np.float64, "speed_y": np.float64,
+            "pierce": np.int32, "ricochet_count": np.int32, "damage": np.int32,
+            "explosive": np.bool_, "fire_time": np.int64,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, angle, pierce=0, delay=0, ricochet_count=0, explosive=False):
+        """Adds a bullet at (x, y) travelling along `angle`. Delayed bullets wait `delay` ms before moving."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed_x[i] = BULLET_SPEED * math.cos(angle)
+        self.speed_y[i] = BULLET_SPEED * math.sin(angle)
+        self.pierce[i] = pierce
+        self.ricochet_count[i] = ricochet_count
+        self.damage[i] = 1  # ✅ Piercing hits multiple enemies
+        self.explosive[i] = explosive
+        self.fire_time[i] = GAME_CLOCK.now + delay
+        self.count += 1
+
+    def _compact(self, alive):
+        """Drops dead bullets, keeping firing order."""
+        kept = int(alive.sum())
+        if kept == self.count:
+            return
+        for name in ("x", "y", "speed_x", "speed_y", "pierce", "ricochet_count", "damage", "explosive", "fire_time"):
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][alive]
+        self.count = kept
+
+    def update(self, game):
+        """Moves every bullet and resolves wall, border and enemy collisions for this tick."""
+        n = self.count
+        if n == 0:
+            return
+
+        x, y = self.x[:n], self.y[:n]
+        speed_x, speed_y = self.speed_x[:n], self.speed_y[:n]
+        ricochet = self.ricochet_count[:n]
+        alive = np.ones(n, dtype=bool)
+
+        # ✅ Delayed bullets wait to fire
+        moving = self.fire_time[:n] <= GAME_CLOCK.now
+        x += np.where(moving, speed_x, 0.0)
+        y += np.where(moving, speed_y, 0.0)
+
+        # ✅ Check for obstacle (wall) collisions FIRST, one raster lookup for every bullet
+        wall_ids = game.world.lookup_rects(x, y, BULLET_SIZE, BULLET_SIZE)
+        for i in np.flatnonzero(wall_ids):
+            if ricochet[i] <= 0:
+                alive[i] = False  # ✅ Remove bullet if out of ricochets
+                continue
+            ricochet[i] -= 1
+            obstacle_rect = game.world.obstacles[wall_ids[i] - 1].rect
+
+            # ✅ Determine if collision was horizontal or vertical
+            overlap_x = min(abs(x[i] + BULLET_SIZE - obstacle_rect.left), abs(x[i] - obstacle_rect.right))
+            overlap_y = min(abs(y[i] + BULLET_SIZE - obstacle_rect.top), abs(y[i] - obstacle_rect.bottom))
+            if overlap_x < overlap_y:
+                speed_x[i] = -speed_x[i]  # ✅ Flip horizontally
+                x[i] += speed_x[i] * 3  # ✅ Prevent sticking
             else:
-                if self in game.player.bullets:
-                    game.player.bullets.remove(self)
-                return
-
-                # ✅ If bullet goes out of bounds, remove it
-        if not (0 <= self.rect.x <= self.MAP_WIDTH and 0 <= self.rect.y <= self.MAP_HEIGHT):
-            if self in game.player.bullets:
-                game.player.bullets.remove(self)
+                speed_y[i] = -speed_y[i]  # ✅ Flip vertically
+                y[i] += speed_y[i] * 3  # ✅ Prevent sticking
+
+        # ✅ Check for map border collisions (AFTER obstacles), vertical then horizontal
+        hit_y = alive & ((y <= 0) | (y + BULLET_SIZE >= self.MAP_HEIGHT))
+        bounce_y = hit_y & (ricochet > 0)
+        alive &= ~(hit_y & ~bounce_y)
+        ricochet -= bounce_y
+        speed_y[bounce_y] *= -1  # ✅ Flip only the vertical component
+        y[bounce_y] += speed_y[bounce_y]  # ✅ Prevents sticking
+
+        hit_x = alive & ((x <= 0) | (x + BULLET_SIZE >= self.MAP_WIDTH))
+        bounce_x = hit_x & (ricochet > 0)
+        alive &= ~(hit_x & ~bounce_x)
+        ricochet -= bounce_x
+        speed_x[bounce_x] *= -1  # ✅ Flip only the horizontal component
+        x[bounce_x] += speed_x[bounce_x]
+
+        # ✅ If bullet goes out of bounds, remove it
+        alive &= (x >= 0) & (x <= self.MAP_WIDTH) & (y >= 0) & (y <= self.MAP_HEIGHT)
+
+        self._resolve_enemy_hits(game, alive)
+        self._compact(alive)
+
+    def _resolve_enemy_hits(self, game, alive):
+        """Batched AABB test against all enemies; only bullets that overlap something get per-bullet work."""
+        targets = [enemy for enemy in game.enemies.each(COLLIDER) if enemy.rect is not None]
+        if not targets or not alive.any():
             return
 
-            # ✅ Track enemies hit (prevents multiple hits in one update)
-        enemies_hit = []
-
-        # ✅ Check for collisions with enemies
-        for enemy in enemies[:]:
-            if enemy.rect is not None and self.rect.colliderect(enemy.rect):
-                if enemy in enemies_hit:
-                    continue  # ✅ Prevent hitting the same enemy twice in one update cycle
-
-                enemies_hit.append(enemy)
-
-                if isinstance(enemy, Enemy):  # Ensure it's an actual enemy, not a Missile
-                    enemy_died = enemy.take_damage(self.damage)
-                else:
-                    enemy_died = False  # Ensure enemy_died is always defined
-
-                if self.explosive:
-                    explosion_radius = 50
-                    explosion_center = (self.rect.centerx, self.rect.centery)
-                    game.explosions.append(ExplosionEffect(explosion_center, explosion_radius))
-
-                    # ✅ Damage nearby enemies
-                    for other_enemy in enemies[:]:
-                        if math.dist(explosion_center,
-                                     (other_enemy.rect.centerx, other_enemy.rect.centery)) < explosion_radius:
-                            other_enemy.take_damage()
-
-                if enemy_died:
-                    game.death_animations.append(DeathAnimation(enemy.rect.x, enemy.rect.y, enemy.rect.width))
-                    enemies.remove(enemy)
-
-                    # ✅ Handle XP & Score Rewards
-                    if isinstance(enemy, FastEnemy):
-                        game.score += 75
-                        game.player.gain_xp(4, game)
-                        drop_chance = 0.3
-                        currency_amount = random.randint(1, 3)
-                    elif isinstance(enemy, TankEnemy):
-                        game.score += 200
-                        game.player.gain_xp(8, game)
-                        drop_chance = 0.7
-                        currency_amount = random.randint(3, 7)
-                    elif isinstance(enemy, DasherEnemy):
-                        game.score += 100
-                        game.player.gain_xp(12, game)
-                        drop_chance = 0.5
-                        currency_amount = random.randint(2, 5)
-                    elif isinstance(enemy, ShooterEnemy):
-                        game.score += 100
-                        game.player.gain_xp(14, game)
-                        drop_chance = 0.5
-                        currency_amount = random.randint(2, 4)
-                    elif isinstance(enemy, SwarmEnemy):
-                        game.score += 5
-                        game.player.gain_xp(2, game)
-                        drop_chance = 0.2
-                        currency_amount = 1
-                    else:
-                        game.score += 50
-                        game.player.gain_xp(3, game)
-                        drop_chance = 0.4
-                        currency_amount = random.randint(1, 2)
-
-                    # ✅ Drop Currency with Random Chance
-                    if random.random() < drop_chance:
-                        currency_pickup = CurrencyPickup(enemy.rect.centerx, enemy.rect.centery, currency_amount)
-                        game.currency_drops.append(currency_pickup)
-
-                # ✅ Reduce pierce count after hitting an enemy
-                self.pierce -= 1
-
-                # ✅ Move bullet forward slightly before it can hit another enemy
-                self.rect.x += self.speed_x * TRAVEL_DISTANCE_AFTER_HIT
-                self.rect.y += self.speed_y * TRAVEL_DISTANCE_AFTER_HIT
-
-                if self.pierce < 0:  # ✅ Remove bullet if pierce is depleted
-                    if self in game.player.bullets:
-                        game.player.bullets.remove(self)
-                    return
-
-                    # ✅ Ensure bullet color updates correctly
-        self.update_bullet_color()
+        boxes = np.array([(e.rect.left, e.rect.top, e.rect.right, e.rect.bottom) for e in targets], dtype=np.float64)
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        overlap = ((x[:, None] < boxes[None, :, 2]) & (x[:, None] + BULLET_SIZE > boxes[None, :, 0]) &
+                   (y[:, None] < boxes[None, :, 3]) & (y[:, None] + BULLET_SIZE > boxes[None, :, 1]))
+        overlap &= alive[:, None]
+
+        for i in np.flatnonzero(overlap.any(axis=1)):
+            alive[i] = self._hit_enemies(i, [targets[j] for j in np.flatnonzero(overlap[i])], game)
+
+    def _hit_enemies(self, i, candidates, game):
+        """Applies one bullet's hits in enemy order. Returns False once the bullet is used up."""
+        enemies = game.enemies
+        for enemy in candidates:
+            if enemy.rect is None or enemy not in enemies:
+                continue  # ✅ Already killed by an earlier bullet this tick
+            bullet_rect = pygame.Rect(int(self.x[i]), int(self.y[i]), BULLET_SIZE, BULLET_SIZE)
+            if not bullet_rect.colliderect(enemy.rect):
+                continue  # ✅ Moved past it after an earlier pierce
+
+            enemy_died = enemy.take_damage(int(self.damage[i]))
+
+            if self.explosive[i]:
+                # ✅ Damage nearby enemies once all of this tick's explosions are known
+                game.aoe.queue(bullet_rect.center, EXPLOSION_RADIUS)
+
+            if enemy_died:
+                handle_enemy_kill(enemy, game)
+
+            # ✅ Reduce pierce count after hitting an enemy
+            self.pierce[i] -= 1
+
+            # ✅ Move bullet forward slightly before it can hit another enemy
+            self.x[i] += self.speed_x[i] * TRAVEL_DISTANCE_AFTER_HIT
+            self.y[i] += self.speed_y[i] * TRAVEL_DISTANCE_AFTER_HIT
+
+            if self.pierce[i] < 0:  # ✅ Remove bullet if pierce is depleted
+                return False
+        return True
 
     def draw(self, screen, camera_x, camera_y):
-        """Draws the bullet, changing color based on pierce level."""
-        # Color changes based on pierce level
-        if self.explosive:
-            color = (153,76,0)
-        elif self.pierce == 0:
-            color = (255, 255, 0)  # Yellow (default)
-        elif self.pierce == 1:
-            color = (255, 165, 0)  # Orange (piercing level 1)
-        elif self.pierce == 2:
-            color = (255, 69, 0)  # Red-orange (piercing level 2)
-        else:
-            color = (255, 0, 0)  # Red (high piercing level)
-
-        pygame.draw.rect(screen, color,
-                         pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y, self.rect.width, self.rect.height))
-
-    def update_bullet_color(self):
-        """Updates bullet color based on remaining damage and pierce level."""
-        if self.damage <= 1:
-            color = (255, 255, 0)  # Yellow (base bullet)
-        elif self.damage == 2:
-            color = (255, 165, 0)  # Orange (mid-tier damage)
-        elif self.damage == 3:
-            color = (255, 69, 0)  # Red-orange (higher damage)
-        else:
-            color = (255, 0, 0)  # Red (max damage)
-
-        self.color = color  # ✅ Ensure the color updates dynamically
-
-    class ExplosionEffect:
-        """Handles a visual explosion effect."""
-
-        def __init__(self, position, radius):
-            self.position = position
-            self.radius = radius
-            self.start_time = pygame.time.get_ticks()  # Track when explosion starts
-
-        def draw(self, screen, camera_x, camera_y):
-            """Draws an expanding explosion effect."""
-            time_elapsed = pygame.time.get_ticks() - self.start_time
-
-            if time_elapsed < 300:  # Explosion lasts for 300ms
-                alpha = max(255 - (time_elapsed * 2), 0)  # Fade out effect
-                explosion_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(explosion_surface, (255, 140, 0, alpha), (self.radius, self.radius), self.radius)
-                screen.blit(explosion_surface,
-                            (self.position[0] - camera_x - self.radius, self.position[1] - camera_y - self.radius))
-            return time_elapsed >= 300  # Signal removal after 300ms
+        """Draws all bullets in one blit batch, colored by pierce level."""
+        n = self.count
+        if n == 0:
+            return
 
+        # Color changes based on pierce level
+        color_index = np.where(self.explosive[:n], EXPLOSIVE_COLOR_INDEX, np.clip(self.pierce[:n], 0, 3))
+        scale = WORLD_VIEW.scale
+        sprites = self.scaled_sprites.get(scale)
+        if sprites is None:
+            sprites = self.scaled_sprites[scale] = [scale_sprite(sprite, scale) for sprite in self.sprites]
+        screen_x = ((self.x[:n] - camera_x) * scale).astype(np.int64)
+        screen_y = ((self.y[:n] - camera_y) * scale).astype(np.int64)
+        screen.blits([(sprites[c], (sx, sy)) for c, sx, sy in
+                      zip(color_index.tolist(), screen_x.tolist(), screen_y.tolist())], doreturn=False)
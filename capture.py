@@ -0,0 +1,219 @@
+import atexit
+import json
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from ioworker import IO_WORKER
+
+CAPTURE_ENV = "LAST_STAND_CAPTURE"  # 1 / "raw" = raw RGB24 video, "png" = numbered PNG sequence
+CAPTURE_DIR = "captures"
+CAPTURE_SLOTS = 32  # Frames the ring can hold while the encoder catches up (~3 MB each at 1024x768)
+CAPTURE_FPS = 60  # Nominal rate written to the raw video's sidecar (one capture per game frame)
+ENCODER_IDLE_SLEEP = 0.002  # Seconds the encoder waits when the ring is empty
+
+# Ring header (int64 words) in front of the pixel slots
+HEADER_CLOSED = 0  # Set by the game when capture stops; the encoder drains the ring and exits
+HEADER_DROPPED = 1  # Frames dropped because the ring was full (written by the game)
+HEADER_WORDS = 2
+
+
+def capture_mode():
+    """Returns None (off), "raw" or "png"."""
+    value = os.environ.get(CAPTURE_ENV, "").strip().lower()
+    if value in ("", "0"):
+        return None
+    return "png" if value == "png" else "raw"
+
+
+def _ring_views(buffer, slots, slot_bytes):
+    """(header, slot frame numbers, pixel slots) views over the shared block. A slot is free while its frame is 0."""
+    words = np.ndarray((HEADER_WORDS + slots,), dtype=np.int64, buffer=buffer)
+    pixels = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=buffer, offset=words.nbytes)
+    return words[:HEADER_WORDS], words[HEADER_WORDS:], pixels
+
+
+class FrameCapture:
+    """Records gameplay without stalling the loop: each frame's pixels are memcpy'd straight from the
+    display surface into a preallocated shared-memory ring, and a separate encoder process (this file,
+    run as a script) turns the slots into a video file or image sequence. When the ring is full the
+    frame is dropped and counted instead of waiting."""
+
+    def __init__(self, mode="raw", output_dir=CAPTURE_DIR, slots=CAPTURE_SLOTS):
+        self.mode = mode
+        self.output_dir = output_dir
+        self.slots = slots
+        self.active = False
+        self.requested = False  # Start on the next grab() (LAST_STAND_CAPTURE / --capture)
+        self.shm = None
+        self.process = None
+        self.header = self.frames = self.pixels = None
+        self.head = 0
+        self.frame_number = 0
+        self.captured = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls):
+        """Builds a capture; it starts on the first frame if LAST_STAND_CAPTURE is set."""
+        mode = capture_mode()
+        capture = cls(mode or "raw")
+        capture.requested = mode is not None
+        return capture
+
+    def start(self, surface):
+        """Allocates the ring for `surface`'s pixel format and launches the encoder process."""
+        if self.active:
+            return
+        width, height = surface.get_size()
+        pitch, bytesize = surface.get_pitch(), surface.get_bytesize()
+        slot_bytes = pitch * height
+        self.shm = shared_memory.SharedMemory(create=True, size=(HEADER_WORDS + self.slots) * 8 + self.slots * slot_bytes)
+        self.header, self.frames, self.pixels = _ring_views(self.shm.buf, self.slots, slot_bytes)
+        self.header[:] = 0
+        self.frames[:] = 0
+        self.head = 0
+        self.frame_number = self.captured = self.dropped = 0
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, time.strftime("capture_%Y%m%d_%H%M%S"))
+        # R, G, B byte offsets within a pixel (little-endian shifts)
+        channels = ",".join(str(shift // 8) for shift in surface.get_shifts()[:3])
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__), self.shm.name, str(self.slots),
+                                         str(width), str(height), str(pitch), str(bytesize), channels,
+                                         self.mode, base])
+        self.active = True
+        atexit.register(self.stop)  # Runs before the I/O worker's shutdown, so the encoder still gets reaped
+        print(f"🎥 Capture started ({self.mode}, {width}x{height}, {self.slots}-frame ring) -> {base}")
+
+    def grab(self, surface):
+        """Copies the finished frame into the next free slot. Call right before pygame.display.flip()."""
+        if not self.active:
+            if not self.requested:
+                return
+            self.requested = False
+            self.start(surface)
+
+        self.frame_number += 1
+        slot = self.head
+        if self.frames[slot]:
+            self.dropped += 1  # Encoder is behind: drop rather than wait
+            self.header[HEADER_DROPPED] = self.dropped
+            return
+
+        buffer = surface.get_buffer()  # ✅ Raw pixel view of the surface, no copy
+        np.copyto(self.pixels[slot], np.frombuffer(buffer, dtype=np.uint8))
+        del buffer  # Unlocks the surface
+        self.frames[slot] = self.frame_number  # Publish only after the pixels are in place
+        self.head = (slot + 1) % self.slots
+        self.captured += 1
+
+    def stop(self):
+        """Stops capturing. The encoder drains the ring in the background; the ring is freed once it exits."""
+        if not self.active:
+            return
+        self.header[HEADER_CLOSED] = 1
+        self.active = False
+        atexit.unregister(self.stop)
+        print(f"🎥 Capture stopped: {self.captured} frames captured, {self.dropped} dropped "
+              f"({self.dropped / max(self.frame_number, 1):.1%})")
+        process, shm = self.process, self.shm
+        self.process = self.shm = None
+        self.header = self.frames = self.pixels = None  # Views must go before the block is closed
+        IO_WORKER.submit(_release_ring, process, shm)
+
+    def toggle(self, surface):
+        if self.active:
+            self.stop()
+        else:
+            self.start(surface)
+
+
+def _release_ring(process, shm):
+    """Waits for the encoder to finish (on the I/O thread), then frees the shared block."""
+    process.wait()
+    shm.close()
+    shm.unlink()
+
+
+class _RawWriter:
+    """Appends RGB24 frames to one .rgb file; a .json sidecar holds what's needed to convert it, e.g.
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r 60 -i capture.rgb capture.mp4"""
+
+    def __init__(self, base, width, height):
+        self.base = base
+        self.width, self.height = width, height
+        self.file = open(base + ".rgb", "wb")
+        self.frame_numbers = []
+
+    def write(self, frame_number, rgb):
+        self.file.write(rgb.data)
+        self.frame_numbers.append(frame_number)
+
+    def close(self, dropped):
+        self.file.close()
+        info = {"width": self.width, "height": self.height, "pix_fmt": "rgb24", "fps": CAPTURE_FPS,
+                "frames": len(self.frame_numbers), "dropped": dropped,
+                "frame_numbers": self.frame_numbers}  # Gaps mark dropped frames
+        with open(self.base + ".json", "w") as f:
+            json.dump(info, f)
+
+
+class _PngWriter:
+    """Writes frame_<game frame number>.png into a directory (gaps in the numbering are dropped frames)."""
+
+    def __init__(self, base, width, height):
+        import pygame
+        self.pygame = pygame
+        self.directory = base
+        self.size = (width, height)
+        os.makedirs(base, exist_ok=True)
+
+    def write(self, frame_number, rgb):
+        image = self.pygame.image.frombuffer(rgb.data, self.size, "RGB")
+        self.pygame.image.save(image, os.path.join(self.directory, f"frame_{frame_number:06d}.png"))
+
+    def close(self, dropped):
+        pass
+
+
+def encode_ring(name, slots, width, height, pitch, bytesize, channels, mode, base):
+    """Encoder process main loop: reads slots in ring order, converts them to RGB24 and writes them out."""
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # The game owns (and unlinks) the block
+    header, frames, pixels = _ring_views(shm.buf, slots, pitch * height)
+
+    writer = (_PngWriter if mode == "png" else _RawWriter)(base, width, height)
+    rgb = np.empty((height, width, 3), dtype=np.uint8)  # Reused conversion buffer
+    rows = None
+    slot = 0
+    written = 0
+    while True:
+        frame_number = int(frames[slot])
+        if not frame_number:
+            if header[HEADER_CLOSED]:
+                break  # Stopped and drained
+            time.sleep(ENCODER_IDLE_SLEEP)
+            continue
+        rows = pixels[slot].reshape(height, pitch)[:, :width * bytesize].reshape(height, width, bytesize)
+        for i, offset in enumerate(channels):
+            rgb[:, :, i] = rows[:, :, offset]
+        frames[slot] = 0  # Slot is free again
+        writer.write(frame_number, rgb)
+        written += 1
+        slot = (slot + 1) % slots
+
+    dropped = int(header[HEADER_DROPPED])
+    writer.close(dropped)
+    del header, frames, pixels, rows
+    shm.close()
+    print(f"🎥 Encoder wrote {written} frames ({dropped} dropped) -> {base}")
+
+
+if __name__ == "__main__":
+    # Launched by FrameCapture.start(): capture.py <shm> <slots> <w> <h> <pitch> <bytesize> <r,g,b> <mode> <base>
+    args = sys.argv[1:]
+    encode_ring(args[0], int(args[1]), int(args[2]), int(args[3]), int(args[4]), int(args[5]),
+                [int(c) for c in args[6].split(",")], args[7], args[8])
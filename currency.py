@@ -1,5 +1,6 @@
 import pygame
 import random
+from display import WORLD_VIEW
 
 class CurrencyPickup:
     """Represents a dropped currency item on the gameboard."""
@@ -10,14 +11,15 @@ class CurrencyPickup:
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the currency pickup as a silver coin with a black border."""
-        screen_x = self.rect.x - camera_x + 7
-        screen_y = self.rect.y - camera_y + 7
+        scale = WORLD_VIEW.scale
+        screen_x = (self.rect.x - camera_x + 7) * scale
+        screen_y = (self.rect.y - camera_y + 7) * scale
 
         # Black outline
-        pygame.draw.circle(screen, (0, 0, 0), (screen_x, screen_y), 8)
+        pygame.draw.circle(screen, (0, 0, 0), (screen_x, screen_y), 8 * scale)
 
         # Silver coin
-        pygame.draw.circle(screen, (192, 192, 192), (screen_x, screen_y), 7)
+        pygame.draw.circle(screen, (192, 192, 192), (screen_x, screen_y), 7 * scale)
 
     def check_pickup(self, player):
         """Check if the player touches the currency, and collect it."""
@@ -0,0 +1,135 @@
+import os
+import pygame
+
+WINDOW_ENV = "LAST_STAND_WINDOW"  # Window size: "2560x1440" or a preset name (see WINDOW_PRESETS)
+RENDER_SCALE_ENV = "LAST_STAND_RENDER_SCALE"  # "auto" (default) or a fixed world scale: 1 / 0.75 / 0.5
+DEFAULT_WINDOW = (1024, 768)
+WINDOW_PRESETS = {
+    "768p": (1024, 768),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+    "2160p": (3840, 2160),
+}
+
+RENDER_SCALES = (1.0, 0.75, 0.5)  # World resolution levels, best first
+FRAME_BUDGET_MS = 1000 / 60
+FRAME_SMOOTHING = 0.1  # Weight of the newest frame in the running average
+DROP_AFTER_FRAMES = 30  # Frames the average must stay over budget before the world drops a level
+RAISE_AFTER_FRAMES = 240  # Frames of headroom before trying the next level up again
+RAISE_HEADROOM = 0.6  # "Headroom" = average frame under this share of the budget
+SETTLE_FRAMES = 60  # Frames after a change before it's judged (and before the next change)
+MIN_GAIN = 0.05  # A drop that saves less than this share of frame time is undone
+
+
+def window_size():
+    """Window size from LAST_STAND_WINDOW (WxH or a preset), otherwise DEFAULT_WINDOW."""
+    value = os.environ.get(WINDOW_ENV, "").strip().lower()
+    if not value:
+        return DEFAULT_WINDOW
+    if value in WINDOW_PRESETS:
+        return WINDOW_PRESETS[value]
+    try:
+        width, height = (int(part) for part in value.split("x"))
+    except ValueError:
+        print(f"⚠️ Ignoring {WINDOW_ENV}={value!r} (use WxH or one of {', '.join(WINDOW_PRESETS)})")
+        return DEFAULT_WINDOW
+    return max(width, 320), max(height, 240)
+
+
+def render_scale_setting():
+    """None for adaptive, otherwise the fixed world scale from LAST_STAND_RENDER_SCALE."""
+    value = os.environ.get(RENDER_SCALE_ENV, "").strip().lower()
+    if value in ("", "auto"):
+        return None
+    try:
+        scale = float(value)
+    except ValueError:
+        return None
+    return min(RENDER_SCALES, key=lambda level: abs(level - scale))  # Snap to a supported level
+
+
+def scale_sprite(sprite, scale):
+    """A copy of `sprite` resized for a world render scale (at least 1px each way)."""
+    width, height = sprite.get_size()
+    return pygame.transform.scale(sprite, (max(round(width * scale), 1), max(round(height * scale), 1)))
+
+
+class WorldView:
+    """Where the world layer is drawn. At full scale that's the display itself; at 75% / 50% it's an
+    offscreen surface that present() stretches over the display, and the HUD is then drawn on top at
+    native resolution. In adaptive mode the level follows the measured frame time: it drops after
+    sustained overruns, climbs back with headroom, and a drop that didn't actually save time is undone."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, fixed_scale=None):
+        self.fixed_scale = fixed_scale
+        self.level = RENDER_SCALES.index(fixed_scale) if fixed_scale is not None else 0
+        self.scale = RENDER_SCALES[self.level]
+        self.surface = None
+        self.average_ms = None
+        self.over_frames = 0
+        self.under_frames = 0
+        self.settle_frames = 0
+        self.drop_from_ms = None  # Average just before the last drop, to judge whether it helped
+        self.floor_level = len(RENDER_SCALES) - 1  # Lowest level still worth trying
+        self.changes = 0
+
+    def begin(self, display):
+        """Returns the surface to draw this frame's world into."""
+        if self.scale == 1.0:
+            self.surface = display
+            return display
+        width, height = display.get_size()
+        size = (max(int(width * self.scale), 1), max(int(height * self.scale), 1))
+        if self.surface is None or self.surface is display or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert(display)
+        return self.surface
+
+    def present(self, display):
+        """Stretches the world onto the display (a no-op at full scale)."""
+        if self.surface is not None and self.surface is not display:
+            pygame.transform.scale(self.surface, display.get_size(), display)  # ✅ Nearest-neighbour, straight into the display
+
+    def frame_time(self, ms):
+        """Feeds one frame's work time (excluding the frame-cap sleep) to the adaptive controller."""
+        if self.average_ms is None:
+            self.average_ms = ms
+        else:
+            self.average_ms += (ms - self.average_ms) * FRAME_SMOOTHING
+        if self.fixed_scale is not None:
+            return
+        if self.settle_frames:
+            self.settle_frames -= 1
+            if not self.settle_frames and self.drop_from_ms is not None:
+                self._judge_drop()
+            return
+
+        self.over_frames = self.over_frames + 1 if self.average_ms > FRAME_BUDGET_MS else 0
+        self.under_frames = self.under_frames + 1 if self.average_ms < FRAME_BUDGET_MS * RAISE_HEADROOM else 0
+        if self.over_frames >= DROP_AFTER_FRAMES and self.level < self.floor_level:
+            self.drop_from_ms = self.average_ms
+            self._set_level(self.level + 1)
+        elif self.under_frames >= RAISE_AFTER_FRAMES and self.level > 0:
+            self._set_level(self.level - 1)
+
+    def _judge_drop(self):
+        before, self.drop_from_ms = self.drop_from_ms, None
+        if self.average_ms > before * (1 - MIN_GAIN):
+            # ✅ Lower resolution didn't buy time (the frame is bound elsewhere): undo it and stop trying
+            self.floor_level = self.level - 1
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.scale = RENDER_SCALES[level]
+        self.over_frames = self.under_frames = 0
+        self.settle_frames = SETTLE_FRAMES
+        self.changes += 1
+        print(f"🖥️ World render scale {self.scale:.0%} (frame avg {self.average_ms:.1f}ms)")
+
+
+WORLD_VIEW = WorldView()  # ✅ Shared by Game and every world draw() (they read WORLD_VIEW.scale)
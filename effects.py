@@ -1,19 +1,193 @@
 import pygame
+import numpy as np
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW
 
-class ExplosionEffect:
-    """Handles a visual explosion effect."""
-    def __init__(self, position, radius):
-        self.position = position
-        self.radius = radius
-        self.start_time = pygame.time.get_ticks()  # Track explosion start time
+PARTICLE_CAPACITY = 512  # Initial pool size; doubles on demand up to MAX_PARTICLES
+MAX_PARTICLES = 8192  # Hard cap: bursts past this are trimmed instead of growing the pool
+PARTICLE_DRAG = 0.9  # Velocity kept per tick, so bursts fan out and settle
+RAMP_STEPS = 16  # Pre-rendered fade levels per sprite
+SIZE_BUCKET = 2  # Sprite sizes are rounded to this many pixels so the cache stays small
+SPRITE_CACHE_LIMIT = 4096  # Cached sprites before the cache is rebuilt from scratch
+SPRITE_COLORKEY = (255, 0, 255)  # Transparent background of round sprites (no ramp uses magenta)
+
+# Particle looks: (shape, shrink over life, colour keyframes from birth to death). Each is sampled into
+# RAMP_STEPS sprites per size, so a particle's whole fade is just picking a different cached surface.
+DEATH_FLASH, DEATH_DEBRIS, EXPLOSION_FLASH, EXPLOSION_SPARK = range(4)
+RAMPS = [
+    ("square", 0.0, ((255, 255, 255, 255), (255, 255, 255, 0))),  # White fading out (enemy death)
+    ("square", 0.6, ((255, 255, 255, 230), (170, 170, 170, 0))),  # Death debris
+    ("circle", 0.0, ((255, 140, 0, 255), (255, 140, 0, 0))),  # Orange blast disc
+    ("circle", 0.5, ((255, 235, 130, 255), (255, 140, 0, 190), (110, 40, 0, 0))),  # Sparks: yellow -> orange -> ember
+]
+RAMP_SHRINK = np.array([shrink for _, shrink, _ in RAMPS])
+
+DEATH_DURATION = 500  # ms, same fade as the old per-enemy death animation
+DEBRIS_BURST = (6, 1.0, 3.0, 4, 8, 250, 450)  # count, speed range, size range, lifetime range (ms)
+EXPLOSION_DURATION = 130  # ms until the blast disc has faded out
+SPARKS_PER_RADIUS = 1 / 3  # A radius-50 blast throws ~16 sparks
+SPARK_SIZE = (3, 7)
+SPARK_LIFETIME = (200, 350)
+
+
+def _ramp_color(keyframes, t):
+    """Colour at life fraction t (0..1), linearly interpolated between evenly spaced keyframes."""
+    position = t * (len(keyframes) - 1)
+    index = min(int(position), len(keyframes) - 2)
+    blend = position - index
+    start, end = keyframes[index], keyframes[index + 1]
+    return tuple(int(a + (b - a) * blend) for a, b in zip(start, end))
+
+
+class ParticleSystem:
+    """Every death and explosion effect as particles in NumPy arrays: one vectorised update per tick and
+    one batched blit per frame, drawing from a cache of pre-rendered fade sprites."""
+
+    def __init__(self, rng, capacity=PARTICLE_CAPACITY):
+        self.rng = rng  # The game's fx stream
+        self.count = 0
+        self.trimmed = 0  # Particles dropped because the pool was at MAX_PARTICLES
+        self._allocate(capacity)
+        self.sprites = {}  # (ramp, size px, fade step) -> pre-rendered surface
+
+    def _allocate(self, capacity):
+        """(Re)allocates the arrays, keeping the live particles."""
+        old = getattr(self, "x", None)
+        fields = {
+            "x": np.float64, "y": np.float64,  # Centre
+            "speed_x": np.float64, "speed_y": np.float64,
+            "born": np.int64, "lifetime": np.int64,
+            "size": np.float64, "ramp": np.int8,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, speed_x, speed_y, lifetime, size, ramp):
+        """Adds a batch of particles. Arguments are scalars or arrays; the batch is as long as `lifetime`."""
+        n = len(np.atleast_1d(lifetime))
+        if self.count + n > self.capacity:
+            capacity = self.capacity
+            while capacity < self.count + n and capacity < MAX_PARTICLES:
+                capacity *= 2
+            if capacity != self.capacity:
+                self._allocate(min(capacity, MAX_PARTICLES))
+        room = min(n, self.capacity - self.count)
+        self.trimmed += n - room
+        if room <= 0:
+            return
+
+        batch = slice(self.count, self.count + room)
+        for name, value in (("x", x), ("y", y), ("speed_x", speed_x), ("speed_y", speed_y),
+                            ("lifetime", lifetime), ("size", size), ("ramp", ramp)):
+            getattr(self, name)[batch] = value if np.ndim(value) == 0 else np.asarray(value)[:room]
+        self.born[batch] = GAME_CLOCK.now
+        self.count += room
+
+    def burst(self, x, y, count, ramp, speed, size, lifetime):
+        """`count` particles flying out of (x, y) in random directions. speed/size/lifetime are (low, high)."""
+        if count <= 0:
+            return
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        velocity = rng.uniform(speed[0], speed[1], count)
+        self.emit(x, y, np.cos(angle) * velocity, np.sin(angle) * velocity,
+                  rng.uniform(lifetime[0], lifetime[1], count).astype(np.int64),
+                  rng.uniform(size[0], size[1], count), ramp)
+
+    def death(self, rect):
+        """Enemy death: the body flashes white and fades, shedding a few bits of debris."""
+        center_x, center_y = rect.center
+        self.emit(center_x, center_y, 0.0, 0.0, DEATH_DURATION, rect.width, DEATH_FLASH)
+        count, speed_low, speed_high, size_low, size_high, life_low, life_high = DEBRIS_BURST
+        self.burst(center_x, center_y, count, DEATH_DEBRIS,
+                   (speed_low, speed_high), (size_low, size_high), (life_low, life_high))
+
+    def explosion(self, center, radius):
+        """Blast disc the size of the damage radius, plus sparks thrown roughly to its edge."""
+        self.emit(center[0], center[1], 0.0, 0.0, EXPLOSION_DURATION, radius * 2, EXPLOSION_FLASH)
+        # Sparks travel about speed / (1 - drag) px, so this lands them near the blast edge
+        self.burst(center[0], center[1], int(radius * SPARKS_PER_RADIUS), EXPLOSION_SPARK,
+                   (radius * (1 - PARTICLE_DRAG) * 0.4, radius * (1 - PARTICLE_DRAG)), SPARK_SIZE, SPARK_LIFETIME)
+
+    def update(self):
+        """Moves every particle one tick and drops the expired ones (no drawing, so it also runs headless)."""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.speed_x[:n]
+        self.y[:n] += self.speed_y[:n]
+        self.speed_x[:n] *= PARTICLE_DRAG
+        self.speed_y[:n] *= PARTICLE_DRAG
+
+        alive = GAME_CLOCK.now - self.born[:n] < self.lifetime[:n]
+        kept = int(alive.sum())
+        if kept == n:
+            return
+        for name in ("x", "y", "speed_x", "speed_y", "born", "lifetime", "size", "ramp"):
+            array = getattr(self, name)
+            array[:kept] = array[:n][alive]
+        self.count = kept
+
+    def _sprite(self, ramp, size, step):
+        """Pre-renders one fade step of a ramp at a pixel size. Each step is one flat colour, so it's a
+        colorkeyed surface with surface alpha: RLE-accelerated, ~3x cheaper to blit than per-pixel alpha."""
+        shape, _, keyframes = RAMPS[ramp]
+        *color, alpha = _ramp_color(keyframes, step / RAMP_STEPS)  # The last step stays just visible
+        sprite = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        if shape == "circle":
+            sprite.fill(SPRITE_COLORKEY)
+            pygame.draw.circle(sprite, color, (size / 2, size / 2), size / 2)
+        else:
+            sprite.fill(color)
+        sprite.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+        sprite.set_alpha(alpha, pygame.RLEACCEL)
+        return sprite
 
     def draw(self, screen, camera_x, camera_y):
-        """Draws a fading explosion effect."""
-        time_elapsed = pygame.time.get_ticks() - self.start_time
-
-        if time_elapsed < 300:  # Explosion lasts for 300ms
-            alpha = max(255 - (time_elapsed * 2), 0)  # Fade effect
-            explosion_surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(explosion_surface, (255, 140, 0, alpha), (self.radius, self.radius), self.radius)
-            screen.blit(explosion_surface, (self.position[0] - camera_x - self.radius, self.position[1] - camera_y - self.radius))
-        return time_elapsed >= 300  # Return True when animation ends
+        """Draws every on-screen particle in one blit batch at the current world render scale."""
+        n = self.count
+        if n == 0:
+            return
+        scale = WORLD_VIEW.scale
+        ramp = self.ramp[:n].astype(np.int64)
+        life = np.clip((GAME_CLOCK.now - self.born[:n]) / np.maximum(self.lifetime[:n], 1), 0.0, 1.0)
+        size = self.size[:n] * (1 - RAMP_SHRINK[ramp] * life) * scale
+        size = np.maximum(np.rint(size / SIZE_BUCKET).astype(np.int64) * SIZE_BUCKET, 1)
+        screen_x = ((self.x[:n] - camera_x) * scale - size / 2).astype(np.int64)
+        screen_y = ((self.y[:n] - camera_y) * scale - size / 2).astype(np.int64)
+
+        # ✅ Cull off-screen particles before any per-particle work
+        view_width, view_height = screen.get_size()
+        visible = np.flatnonzero((screen_x + size > 0) & (screen_x < view_width) &
+                                 (screen_y + size > 0) & (screen_y < view_height))
+        if len(visible) == 0:
+            return
+        ramp, size = ramp[visible], size[visible]
+        step = np.minimum((life[visible] * RAMP_STEPS).astype(np.int64), RAMP_STEPS - 1)
+
+        # ✅ Look up each distinct (ramp, size, step) once; the per-particle pick is one object-array take
+        keys = (ramp * (size.max() + 1) + size) * RAMP_STEPS + step
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        if len(self.sprites) + len(first) > SPRITE_CACHE_LIMIT:
+            self.sprites.clear()  # Rare (many rescales / odd sizes): rebuilding is cheaper than tracking use
+        sprites = np.empty(len(first), dtype=object)
+        for index, cache_key in enumerate(zip(ramp[first].tolist(), size[first].tolist(), step[first].tolist())):
+            sprite = self.sprites.get(cache_key)
+            if sprite is None:
+                sprite = self.sprites[cache_key] = self._sprite(*cache_key)
+            sprites[index] = sprite
+
+        positions = zip(screen_x[visible].tolist(), screen_y[visible].tolist())
+        screen.blits(zip(sprites[inverse].tolist(), positions), doreturn=False)
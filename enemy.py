@@ -1,78 +1,123 @@
 import pygame
 import math
 import time
-from shooterbullet import ShooterBullet
+from entities import (TRANSFORM, VELOCITY, HEALTH, COLLIDER, AI_STATE, RENDERABLE, CONTACT_DAMAGE,
+                      DIES_ON_CONTACT, RANGED)
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW
 
 ENEMY_SPEED = 2  # Base enemy speed
 
 class Enemy:
     """Base enemy class with HP system, hit effects, and a brief death animation."""
+    AI_LOD = True  # Distant enemies may run AI at a reduced rate (see ailod.py)
+    COMPONENTS = frozenset({TRANSFORM, VELOCITY, HEALTH, COLLIDER, AI_STATE, RENDERABLE,
+                            CONTACT_DAMAGE, DIES_ON_CONTACT})
+    REWARD = (50, 3, 0.4, (1, 2))  # (score, xp, currency drop chance, currency amount range)
+    SEPARATION_STRENGTH = 1.0  # How hard this enemy shoves overlapping neighbours (0 = never separated)
+    SIZE = 40  # Square hitbox side (px)
+    SPEED = ENEMY_SPEED
+    HIT_EFFECT_DURATION = 75  # Flash effect duration (75ms)
+    DEATH_EFFECT_DURATION = 100  # Time to show death effect (100ms)
+
+    # ✅ No per-instance __dict__: at 10k+ enemies only the fields below are stored, constants live on the class
+    __slots__ = ("x", "y", "_rect", "removed", "speed", "health", "max_health", "hit_timer", "death_timer",
+                 "is_dying", "lod_bucket", "net_id")
+
     def __init__(self, x, y, health):
-        self.rect = pygame.Rect(x, y, 40, 40)
-        self.speed = ENEMY_SPEED
+        self.x = float(x)  # Float top-left: the real position, so slow movers keep their sub-pixel motion
+        self.y = float(y)
+        self._rect = None  # Integer collision rect, derived from (x, y) on first use
+        self.removed = False  # Set once the death effect has finished drawing
+        self.speed = self.SPEED
         self.health = health
         self.max_health = health  # Store max HP for health bar calculations
         self.hit_timer = 0  # Timer for hit flash effect
-        self.hit_effect_duration = 75  # Flash effect duration (75ms)
         self.death_timer = None  # Tracks when enemy dies
-        self.death_effect_duration = 100  # Time to show death effect (100ms)
         self.is_dying = False  # Flag to track if enemy is in the death phase
+        self.lod_bucket = None  # Round-robin slot assigned by the AI LOD scheduler
+        self.net_id = None  # Stable snapshot id, assigned by netserver.py when first streamed
+
+    @property
+    def rect(self):
+        """Collision rect (None once removed). Built on first use, then kept in sync by move()."""
+        if self.removed:
+            return None
+        rect = self._rect
+        if rect is None:
+            rect = self._rect = pygame.Rect(0, 0, self.SIZE, self.SIZE)
+            rect.topleft = (self.x, self.y)  # Rounds like every later move does
+        return rect
+
+    @property
+    def center(self):
+        """Float center of the hitbox."""
+        half = self.SIZE / 2
+        return self.x + half, self.y + half
+
+    def move(self, move_x, move_y, world):
+        """Moves by a float offset, X first then Y, undoing either axis that would end inside an obstacle."""
+        rect = self.rect
+        if move_x:
+            x = self.x + move_x
+            rect.x = x
+            if world.collides(rect):
+                rect.x = self.x  # Undo move if collision occurs
+            else:
+                self.x = x
+        if move_y:
+            y = self.y + move_y
+            rect.y = y
+            if world.collides(rect):
+                rect.y = self.y  # Undo move if collision occurs
+            else:
+                self.y = y
+
+    def chase(self, player, world, step=1):
+        """Walks straight at the player at the current speed."""
+        center_x, center_y = self.center
+        angle = math.atan2(player.rect.centery - center_y, player.rect.centerx - center_x)
+        self.move(self.speed * math.cos(angle) * step, self.speed * math.sin(angle) * step, world)
 
     def take_damage(self, damage=1):
         """Reduces HP when hit. If health reaches zero, starts death effect."""
         self.health -= damage
         print(f"Enemy took {damage} dmg!")
-        self.hit_timer = pygame.time.get_ticks()  # Start hit effect timer
+        self.hit_timer = GAME_CLOCK.now  # Start hit effect timer
 
         if self.health <= 0 and not self.is_dying:
             self.is_dying = True
-            self.death_timer = pygame.time.get_ticks()  # Start death effect timer
+            self.death_timer = GAME_CLOCK.now  # Start death effect timer
             return True  # Now correctly returns True when enemy is dead
 
         return False  # Otherwise, return False
 
-    def update(self, player, obstacles, game, enemy_bullets=None):
+    def update(self, player, world, game, step=1):
         """Updates enemy movement and handles death removal."""
 
         if self.is_dying:
             # ✅ Remove enemy if death effect is finished
-            if pygame.time.get_ticks() - self.death_timer > 100:  # Adjust delay as needed
-                print(f"💀 Enemy removed at {self.rect.topleft}")
+            if GAME_CLOCK.now - self.death_timer > 100:  # Adjust delay as needed
+                print(f"💀 Enemy removed at {(round(self.x), round(self.y))}")
                 game.enemies.remove(self)  # ✅ Now actually removes the enemy
             return  # ✅ Prevents further updates
 
-        if self.rect is None:
+        if self.removed:
             return  # No movement if rect is invalid
 
-        dx, dy = player.rect.centerx - self.rect.centerx, player.rect.centery - self.rect.centery
-        angle = math.atan2(dy, dx)
-
-        move_x = self.speed * math.cos(angle)
-        move_y = self.speed * math.sin(angle)
-
-        old_x, old_y = self.rect.x, self.rect.y
-
-        # Try moving in X first
-        self.rect.x += move_x
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.x = old_x  # Undo move if collision occurs
-
-        # Try moving in Y second
-        self.rect.y += move_y
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.y = old_y  # Undo move if collision occurs
+        self.chase(player, world, step)
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the enemy with a black outline and a flashing hit effect."""
         if self.rect is None:
             return  # Don't draw if the enemy is removed
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)  # Default black outline
         base_color = (255, 0, 0)  # Normal red enemy
 
         # Damage effect
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)  # White flash
             outline_color = (255, 0, 0)  # Red outline on hit
         elif self.is_dying:
@@ -81,164 +126,158 @@ class Enemy:
             enemy_color = base_color
 
         # Shrink slightly when dying
-        shrink_factor = 0.75 if self.is_dying else 1.0
-        width, height = int(self.rect.width * shrink_factor), int(self.rect.height * shrink_factor)
-        draw_x = self.rect.x - camera_x + (self.rect.width - width) // 2
-        draw_y = self.rect.y - camera_y + (self.rect.height - height) // 2
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color, 0.75 if self.is_dying else 1.0)
+
+        # Draw health bar
+        if not self.is_dying:
+            self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
+
+    def draw_box(self, screen, camera_x, camera_y, color, outline_color, shrink=1.0):
+        """Draws the body with a 3px outline, at the world view's render scale."""
+        scale = WORLD_VIEW.scale
+        rect = self.rect
+        width, height = int(rect.width * shrink), int(rect.height * shrink)
+        draw_x = (rect.x - camera_x + (rect.width - width) // 2) * scale
+        draw_y = (rect.y - camera_y + (rect.height - height) // 2) * scale
+        border = 3 * scale
 
         # Draw outline
         pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(draw_x - 3, draw_y - 3, width + 6, height + 6))
+                         (draw_x - border, draw_y - border, (width + 6) * scale, (height + 6) * scale))
 
         # Draw enemy
-        pygame.draw.rect(screen, enemy_color, pygame.Rect(draw_x, draw_y, width, height))
-
-        # Draw health bar
-        if not self.is_dying:
-            self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
+        pygame.draw.rect(screen, color, (draw_x, draw_y, width * scale, height * scale))
 
     def draw_health_bar(self, screen, camera_x, camera_y, color):
         """Draws a health bar above the enemy."""
         if self.health > 0:
+            scale = WORLD_VIEW.scale
             health_bar_width = int((self.health / self.max_health) * self.rect.width)
             pygame.draw.rect(screen, (0, 255, 0),  # Green health bar
-                             pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y - 5, health_bar_width, 3))
+                             ((self.rect.x - camera_x) * scale, (self.rect.y - camera_y - 5) * scale,
+                              health_bar_width * scale, max(3 * scale, 1)))
 
 class FastEnemy(Enemy):
     """Smaller, faster enemy with 1 HP."""
+    REWARD = (75, 4, 0.3, (1, 3))
+    SEPARATION_STRENGTH = 0.8
+    SIZE = 30  # Smaller size
+    SPEED = ENEMY_SPEED * 1.8  # Faster speed
+    __slots__ = ()
+
     def __init__(self, x, y):
         super().__init__(x, y, 2)  # Fast enemies have 2 HP
-        self.rect = pygame.Rect(x, y, 30, 30)  # Smaller size
-        self.speed = ENEMY_SPEED * 1.8  # Faster speed
 
     # Yellow Enemy (Fast)
     def draw(self, screen, camera_x, camera_y):
         """Draws the fast enemy with a black outline and hit effect."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)
         base_color = (255, 255, 0)
 
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)
             outline_color = (255, 0, 0)  # Flash red outline when hit
         else:
             enemy_color = base_color
 
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
-
-        pygame.draw.rect(screen, enemy_color, pygame.Rect(
-            self.rect.x - camera_x, self.rect.y - camera_y, self.rect.width, self.rect.height
-        ))
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color)
 
         self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
 
 
 class TankEnemy(Enemy):
     """Bigger, slower enemy with 5 HP."""
+    REWARD = (200, 8, 0.7, (3, 7))
+    SEPARATION_STRENGTH = 4.0  # Tanks plough through the horde
+    SIZE = 50  # Bigger size
+    SPEED = ENEMY_SPEED * 0.75  # Slower movement
+    __slots__ = ()
+
     def __init__(self, x, y):
         super().__init__(x, y, 8)  # Tank enemies have 8 HP
-        self.rect = pygame.Rect(x, y, 50, 50)  # Bigger size
-        self.speed = ENEMY_SPEED * 0.75  # Slower movement
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the tank enemy with a black outline and hit effect."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)
         base_color = (0, 0, 225)
 
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)
             outline_color = (255, 0, 0)  # Flash red outline when hit
         else:
             enemy_color = base_color
 
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
-
-        pygame.draw.rect(screen, enemy_color, pygame.Rect(
-            self.rect.x - camera_x, self.rect.y - camera_y, self.rect.width, self.rect.height
-        ))
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color)
 
         self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
 
 class DasherEnemy(Enemy):
     """Enemy that dashes when close to the player."""
+    REWARD = (100, 12, 0.5, (2, 5))
+    SIZE = 35  # Slightly smaller hitbox
+    SPEED = ENEMY_SPEED * 1  # Normal movement speed
+    DASH_SPEED = ENEMY_SPEED * 25  # Much faster dash speed
+    DASH_COOLDOWN = 2000  # 2-second cooldown between dashes
+    CHARGE_TIME = 500  # 0.5-second warning before dashing
+    __slots__ = ("last_dash_time", "is_charging", "charge_start_time")
+
     def __init__(self, x, y):
         super().__init__(x, y, 4)  # 4 HP
-        self.rect = pygame.Rect(x, y, 35, 35)  # Slightly smaller hitbox
-        self.base_speed = ENEMY_SPEED * 1  # Normal movement speed
-        self.dash_speed = ENEMY_SPEED * 25  # Much faster dash speed
-        self.speed = self.base_speed
-        self.dash_cooldown = 2000  # 2-second cooldown between dashes
-        self.charge_time = 500  # 0.5-second warning before dashing
-        self.last_dash_time = pygame.time.get_ticks()
+        self.last_dash_time = GAME_CLOCK.now
         self.is_charging = False
         self.charge_start_time = 0
 
-    def update(self, player, obstacles, game, enemy_bullets=None):
+    def update(self, player, world, game, step=1):
         """Updates movement, initiating a charge-up visual before dashing."""
-        current_time = pygame.time.get_ticks()
-        distance_to_player = math.sqrt((player.rect.centerx - self.rect.centerx) ** 2 + (player.rect.centery - self.rect.centery) ** 2)
+        current_time = GAME_CLOCK.now
+        center_x, center_y = self.center
+        distance_to_player = math.sqrt((player.rect.centerx - center_x) ** 2 + (player.rect.centery - center_y) ** 2)
 
         if self.is_dying:
             # ✅ Remove enemy if death effect is finished
-            if pygame.time.get_ticks() - self.death_timer > 100:  # Adjust delay as needed
-                print(f"💀 Enemy removed at {self.rect.topleft}")
+            if GAME_CLOCK.now - self.death_timer > 100:  # Adjust delay as needed
+                print(f"💀 Enemy removed at {(round(self.x), round(self.y))}")
                 game.enemies.remove(self)  # ✅ Now actually removes the enemy
             return  # ✅ Prevents further updates
 
-        if self.rect is None:
+        if self.removed:
             return  # No movement if rect is invalid
 
-        # Start charging phase if close enough and cooldown is up
-        if distance_to_player < 125 and current_time - self.last_dash_time > self.dash_cooldown and not self.is_charging:
+        # Start charging phase if close enough and cooldown is up; the dash itself is a timer
+        if distance_to_player < 125 and current_time - self.last_dash_time > self.DASH_COOLDOWN and not self.is_charging:
             self.is_charging = True
             self.charge_start_time = current_time  # Store charge start time
             self.speed = 0  # Stop moving during charge phase
-
-        # After charge_time, actually dash
-        if self.is_charging and current_time - self.charge_start_time > self.charge_time:
-            self.is_charging = False
-            self.speed = self.dash_speed
-            self.last_dash_time = current_time  # Reset cooldown
-
-        # If not charging, return to normal movement speed
-        elif not self.is_charging:
-            self.speed = self.base_speed
+            GAME_CLOCK.schedule(self.CHARGE_TIME + 1, self.dash, game)
 
         # Steering movement logic
-        dx, dy = player.rect.centerx - self.rect.centerx, player.rect.centery - self.rect.centery
-        angle = math.atan2(dy, dx)
+        self.chase(player, world, step)
 
-        move_x = self.speed * math.cos(angle)
-        move_y = self.speed * math.sin(angle)
-
-        old_x, old_y = self.rect.x, self.rect.y
+        # A dash lasts one movement step; otherwise return to normal movement speed
+        if not self.is_charging:
+            self.speed = self.SPEED
 
-        # Try moving in X first
-        self.rect.x += move_x
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.x = old_x  # Undo move if collision occurs
-
-        # Try moving in Y second
-        self.rect.y += move_y
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.y = old_y  # Undo move if collision occurs
+    def dash(self, game):
+        """Timer callback: the charge-up is over, so the next movement step is a dash."""
+        if self not in game.enemies or self.is_dying:
+            return
+        self.is_charging = False
+        self.speed = self.DASH_SPEED
+        self.last_dash_time = GAME_CLOCK.now  # Reset cooldown
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the dasher enemy with a black outline and a distinct charge effect."""
         if self.rect is None:
             return  # Don't draw if removed
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)
         base_color = (255, 100, 100)  # Default pinkish-red
 
         # Damage & charge effect
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)  # White flash on hit
             outline_color = (255, 0, 0)  # Flash red outline when hit
         elif self.is_charging:
@@ -247,102 +286,110 @@ class DasherEnemy(Enemy):
             enemy_color = (255, 255, 255)  # White flash on death
             outline_color = (255, 0, 0)
 
-            if current_time - self.death_timer > self.death_effect_duration:
-                self.rect = None
+            if current_time - self.death_timer > self.DEATH_EFFECT_DURATION:
+                self.removed = True
                 return
         else:
             enemy_color = base_color
 
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
-
-        pygame.draw.rect(screen, enemy_color,
-                         pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y,
-                                     self.rect.width, self.rect.height))
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color)
 
         self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
 
 class ShooterEnemy(Enemy):
     """An enemy that moves into range, stops, and shoots bullets at the player."""
+    COMPONENTS = Enemy.COMPONENTS | {RANGED}
+    REWARD = (100, 14, 0.5, (2, 4))
+    SIZE = 35  # Slightly smaller than normal enemies
+    SPEED = ENEMY_SPEED * 0.8  # Moves slightly slower than normal enemies
+    ATTACK_RANGE = 300  # Stops moving when within 300 pixels of player
+    SHOOT_COOLDOWN = 2000  # Fires every 2 seconds
+    SHOOT_WARNING_TIME = 500  # Time before actually firing after warning
+    __slots__ = ("last_shot_time", "is_shooting", "shoot_start_time")
+
     def __init__(self, x, y):
         super().__init__(x, y, 4)  # 4 HP
-        self.rect = pygame.Rect(x, y, 35, 35)  # Slightly smaller than normal enemies
-        self.attack_range = 300  # Stops moving when within 300 pixels of player
-        self.shoot_cooldown = 2000  # Fires every 2 seconds
-        self.last_shot_time = pygame.time.get_ticks()  # Track last shot time
-        self.speed = ENEMY_SPEED * 0.8  # Moves slightly slower than normal enemies
+        self.last_shot_time = GAME_CLOCK.now  # Track last shot time
         self.is_shooting = False  # Indicates if preparing to shoot
-        self.shoot_warning_time = 500  # Time before actually firing after warning
+        self.shoot_start_time = 0
 
-    def update(self, player, obstacles, game, enemy_bullets=None):
+    def update(self, player, world, game, step=1):
         """Updates movement and shooting behavior."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
+        center_x, center_y = self.center
         distance_to_player = math.sqrt(
-            (player.rect.centerx - self.rect.centerx) ** 2 +
-            (player.rect.centery - self.rect.centery) ** 2
+            (player.rect.centerx - center_x) ** 2 +
+            (player.rect.centery - center_y) ** 2
         )
 
         if self.is_dying:
             # ✅ Remove enemy if death effect is finished
-            if pygame.time.get_ticks() - self.death_timer > 100:  # Adjust delay as needed
-                print(f"💀 Enemy removed at {self.rect.topleft}")
+            if GAME_CLOCK.now - self.death_timer > 100:  # Adjust delay as needed
+                print(f"💀 Enemy removed at {(round(self.x), round(self.y))}")
                 game.enemies.remove(self)  # ✅ Now actually removes the enemy
             return  # ✅ Prevents further updates
 
-        if self.rect is None:
+        if self.removed:
             return  # No movement if rect is invalid
 
         if self.is_shooting:
-            # Check if the warning period has passed, then fire
-            if current_time - self.shoot_start_time >= self.shoot_warning_time:
-                self.fire(player, enemy_bullets)
-            return  # Stay in shooting state until the bullet fires
+            return  # Stay in shooting state until the warning timer fires the bullet
 
-        if distance_to_player > self.attack_range:
+        if distance_to_player > self.ATTACK_RANGE:
             # Move towards the player if out of range
-            dx, dy = player.rect.centerx - self.rect.centerx, player.rect.centery - self.rect.centery
-            angle = math.atan2(dy, dx)
-            move_x = self.speed * math.cos(angle)
-            move_y = self.speed * math.sin(angle)
+            self.chase(player, world, step)
 
-            old_x, old_y = self.rect.x, self.rect.y
-
-            # Try moving in X first
-            self.rect.x += move_x
-            if any(obstacle.collides(self.rect) for obstacle in obstacles):
-                self.rect.x = old_x  # Undo move if collision occurs
-
-            # Try moving in Y second
-            self.rect.y += move_y
-            if any(obstacle.collides(self.rect) for obstacle in obstacles):
-                self.rect.y = old_y  # Undo move if collision occurs
+        elif not world.line_of_sight(center_x, center_y, *player.rect.center):
+            # ✅ In range but a building is in the way: reposition instead of shooting into the wall
+            self.reposition(player, world, step)
 
         else:
             # If within range, stop and prepare to shoot
-            if current_time - self.last_shot_time > self.shoot_cooldown:
+            if current_time - self.last_shot_time > self.SHOOT_COOLDOWN:
                 self.is_shooting = True  # Enable warning color
                 self.shoot_start_time = current_time  # Track when warning starts
+                GAME_CLOCK.schedule(self.SHOOT_WARNING_TIME, self.warning_over, player, game)
+
+    def reposition(self, player, world, step=1):
+        """Keeps closing in; if the cover stops it dead, sidesteps along it to get round."""
+        x, y = self.x, self.y
+        self.chase(player, world, step)
+        if abs(self.x - x) + abs(self.y - y) < self.speed * step * 0.5:  # Barely moved: sliding into the wall
+            center_x, center_y = self.center
+            angle = math.atan2(player.rect.centery - center_y, player.rect.centerx - center_x) + math.pi / 2
+            self.move(self.speed * math.cos(angle) * step, self.speed * math.sin(angle) * step, world)
+
+    def warning_over(self, player, game):
+        """Timer callback: the pre-fire warning has run its course, so shoot."""
+        if self not in game.enemies or self.is_dying:
+            return
+        if not game.world.line_of_sight(*self.center, *player.rect.center):
+            self.is_shooting = False  # ✅ Player ducked behind cover during the warning: hold fire, keep the cooldown
+            return
+        self.fire(player, game.enemy_bullets)
+        if self.is_shooting:  # Still holding fire (Elite Shooters wait out their own cooldown)
+            GAME_CLOCK.timers.schedule(self.next_shot_time(), self.warning_over, player, game)
+
+    def next_shot_time(self):
+        return GAME_CLOCK.now + 1
 
     def fire(self, player, enemy_bullets):
         """Shoots a bullet at the player after the pre-fire warning."""
-        from shooterbullet import ShooterBullet  # ✅ Fix circular import
-
         self.is_shooting = False  # ✅ Reset shooting state so it can shoot again
-        self.last_shot_time = pygame.time.get_ticks()  # ✅ Reset cooldown timer
-        enemy_bullets.append(ShooterBullet(self.rect.centerx, self.rect.centery, player.rect.centerx, player.rect.centery))
+        self.last_shot_time = GAME_CLOCK.now  # ✅ Reset cooldown timer
+        enemy_bullets.fire(self.rect.centerx, self.rect.centery, player.rect.centerx, player.rect.centery)
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the shooter enemy with a black outline and a visual cue before firing."""
         if self.rect is None:
             return  # Don't draw if removed
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)  # Default black outline
         base_color = (150, 0, 255)  # Default purple
 
         # Damage, pre-fire, and death effects
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)  # White flash when hit
             outline_color = (255, 0, 0)  # Flash red outline when hit
         elif self.is_shooting:
@@ -352,47 +399,42 @@ class ShooterEnemy(Enemy):
             outline_color = (255, 0, 0)
 
             # Ensure death animation plays before removing enemy
-            if current_time - self.death_timer > self.death_effect_duration:
-                self.rect = None
+            if current_time - self.death_timer > self.DEATH_EFFECT_DURATION:
+                self.removed = True
                 return
         else:
             enemy_color = base_color
 
-        # Draw outline first
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
-
-        # Draw enemy
-        pygame.draw.rect(screen, enemy_color,
-                         pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y,
-                                     self.rect.width, self.rect.height))
+        # Draw outline first, then the enemy
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color)
 
         self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
 
 
 class EliteShooter(ShooterEnemy):
     """ An upgraded Shooter enemy with more health and a two-shot spread attack. """
+    COLOR = (100, 0, 150)  # Darker purple shade
+    FIRE_COOLDOWN = 2000  # 2000ms (2 seconds) cooldown between shots
+    __slots__ = ("last_fired_time",)
 
     def __init__(self, x, y):
         super().__init__(x, y)
         self.health = 6  # More HP than regular Shooters
-        self.color = (100, 0, 150)  # Darker purple shade
-        self.fire_cooldown = 2000  # 2000ms (2 seconds) cooldown between shots
         self.last_fired_time = 0  # Track last fire time
 
+    def next_shot_time(self):
+        return self.last_fired_time + self.FIRE_COOLDOWN
+
     def fire(self, player, enemy_bullets):
         """ Fires two bullets in a spread pattern at the player, but only if cooldown has passed. """
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
 
         # Check if enough time has passed since last shot
-        if current_time - self.last_fired_time < self.fire_cooldown:
+        if current_time - self.last_fired_time < self.FIRE_COOLDOWN:
             return  # Too soon to fire again
 
         self.last_fired_time = current_time  # Update last fired time
 
-        from shooterbullet import ShooterBullet  # Avoid circular import
-
         angle_offset = math.radians(10)  # Spread angle
         dx, dy = player.rect.centerx - self.rect.centerx, player.rect.centery - self.rect.centery
         base_angle = math.atan2(dy, dx)
@@ -403,119 +445,85 @@ class EliteShooter(ShooterEnemy):
         target_x2 = self.rect.centerx + math.cos(base_angle + angle_offset) * 1000
         target_y2 = self.rect.centery + math.sin(base_angle + angle_offset) * 1000
 
-        bullet1 = ShooterBullet(self.rect.centerx, self.rect.centery, target_x1, target_y1)
-        bullet2 = ShooterBullet(self.rect.centerx, self.rect.centery, target_x2, target_y2)
-
-        enemy_bullets.append(bullet1)
-        enemy_bullets.append(bullet2)
+        enemy_bullets.fire(self.rect.centerx, self.rect.centery, target_x1, target_y1)
+        enemy_bullets.fire(self.rect.centerx, self.rect.centery, target_x2, target_y2)
 
 
 class SwarmEnemy(Enemy):
     """A weak, fast-moving enemy that spawns in groups and maintains swarm behavior."""
+    REWARD = (5, 2, 0.2, (1, 1))
+    SEPARATION_STRENGTH = 0.3  # Swarms already space themselves out; they mostly get pushed
+    SIZE = 25  # Smaller than regular enemies
+    SPEED = ENEMY_SPEED * 1.5  # Faster movement
+    SWARM_SEPARATION_DISTANCE = 30  # Min distance to avoid stacking
+    SWARM_COHESION_STRENGTH = 0.02  # Strength of movement toward swarm center
+    SWARM_ALIGNMENT_STRENGTH = 0.1  # Strength of moving in similar direction
+    __slots__ = ("swarm_group",)
+
     def __init__(self, x, y, swarm_group):
         super().__init__(x, y, 1)  # 1 HP
-        self.rect = pygame.Rect(x, y, 25, 25)  # Smaller than regular enemies
-        self.speed = ENEMY_SPEED * 1.5  # Faster movement
         self.swarm_group = swarm_group  # Reference to the swarm
-        self.swarm_separation_distance = 30  # Min distance to avoid stacking
-        self.swarm_cohesion_strength = 0.02  # Strength of movement toward swarm center
-        self.swarm_alignment_strength = 0.1  # Strength of moving in similar direction
 
-    def update(self, player, obstacles, game):
+    def update(self, player, world, game, step=1):
         """Moves toward the player while maintaining swarm behavior."""
 
         if self.is_dying:
             # ✅ Remove enemy if death effect is finished
-            if pygame.time.get_ticks() - self.death_timer > 100:  # Adjust delay as needed
-                print(f"💀 Enemy removed at {self.rect.topleft}")
+            if GAME_CLOCK.now - self.death_timer > 100:  # Adjust delay as needed
+                print(f"💀 Enemy removed at {(round(self.x), round(self.y))}")
                 game.enemies.remove(self)  # ✅ Now actually removes the enemy
             return  # ✅ Prevents further updates
 
-        if self.rect is None:
+        if self.removed:
             return  # No movement if rect is invalid
 
         # Get direction toward player
-        dx, dy = player.rect.centerx - self.rect.centerx, player.rect.centery - self.rect.centery
+        center_x, center_y = self.center
+        dx, dy = player.rect.centerx - center_x, player.rect.centery - center_y
         angle = math.atan2(dy, dx)
 
         move_x = self.speed * math.cos(angle)
         move_y = self.speed * math.sin(angle)
 
         # Swarm Cohesion: Move toward the center of the swarm
+        half = self.SIZE / 2
         if self.swarm_group:
-            swarm_center_x = sum(enemy.rect.centerx for enemy in self.swarm_group) / len(self.swarm_group)
-            swarm_center_y = sum(enemy.rect.centery for enemy in self.swarm_group) / len(self.swarm_group)
-            move_x += (swarm_center_x - self.rect.centerx) * self.swarm_cohesion_strength
-            move_y += (swarm_center_y - self.rect.centery) * self.swarm_cohesion_strength
+            swarm_center_x = sum(enemy.x for enemy in self.swarm_group) / len(self.swarm_group) + half
+            swarm_center_y = sum(enemy.y for enemy in self.swarm_group) / len(self.swarm_group) + half
+            move_x += (swarm_center_x - center_x) * self.SWARM_COHESION_STRENGTH
+            move_y += (swarm_center_y - center_y) * self.SWARM_COHESION_STRENGTH
 
         # Swarm Separation: Avoid stacking with other swarm members
         for other in self.swarm_group:
-            if other != self:
-                distance = math.sqrt((self.rect.centerx - other.rect.centerx) ** 2 +
-                                     (self.rect.centery - other.rect.centery) ** 2)
-                if distance < self.swarm_separation_distance:
-                    move_x += (self.rect.centerx - other.rect.centerx) * 0.05
-                    move_y += (self.rect.centery - other.rect.centery) * 0.05
+            if other is not self:
+                offset_x, offset_y = self.x - other.x, self.y - other.y  # Same size, so top-lefts compare like centers
+                distance = math.sqrt(offset_x ** 2 + offset_y ** 2)
+                if distance < self.SWARM_SEPARATION_DISTANCE:
+                    move_x += offset_x * 0.05
+                    move_y += offset_y * 0.05
 
         # Swarm Alignment: Move in the general direction of the swarm
         avg_velocity_x = sum(enemy.speed * math.cos(angle) for enemy in self.swarm_group) / len(self.swarm_group)
         avg_velocity_y = sum(enemy.speed * math.sin(angle) for enemy in self.swarm_group) / len(self.swarm_group)
-        move_x += avg_velocity_x * self.swarm_alignment_strength
-        move_y += avg_velocity_y * self.swarm_alignment_strength
+        move_x += avg_velocity_x * self.SWARM_ALIGNMENT_STRENGTH
+        move_y += avg_velocity_y * self.SWARM_ALIGNMENT_STRENGTH
 
-        # Collision Handling
-        old_x, old_y = self.rect.x, self.rect.y
-        self.rect.x += move_x
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.x = old_x
-
-        self.rect.y += move_y
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
-            self.rect.y = old_y
+        # Skipped ticks are made up with one proportionally larger step
+        self.move(move_x * step, move_y * step, world)
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the swarm enemy with a black outline and sickly green color."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         outline_color = (0, 0, 0)  # Black outline
         base_color = (100, 255, 100)  # Sickly green
 
         # Flash effect when hit
-        if current_time - self.hit_timer < self.hit_effect_duration:
+        if current_time - self.hit_timer < self.HIT_EFFECT_DURATION:
             enemy_color = (255, 255, 255)  # Flash white
             outline_color = (255, 0, 0)  # Red outline when hit
         else:
             enemy_color = base_color
 
-        pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
-
-        pygame.draw.rect(screen, enemy_color, pygame.Rect(
-            self.rect.x - camera_x, self.rect.y - camera_y, self.rect.width, self.rect.height
-        ))
+        self.draw_box(screen, camera_x, camera_y, enemy_color, outline_color)
 
         self.draw_health_bar(screen, camera_x, camera_y, enemy_color)
-
-
-class DeathAnimation:
-    """Handles the death animation effect."""
-    def __init__(self, x, y, size=40, duration=500):
-        self.rect = pygame.Rect(x, y, size, size)  # Same size as enemy
-        self.start_time = pygame.time.get_ticks()  # Track when animation starts
-        self.duration = duration  # How long the effect lasts in ms
-        self.alpha = 255  # Opacity for fade effect
-
-    def update(self):
-        """Updates the animation effect (e.g., fading out)."""
-        elapsed_time = pygame.time.get_ticks() - self.start_time
-        self.alpha = max(255 - (elapsed_time / self.duration) * 255, 0)  # Fade out effect
-
-        return elapsed_time > self.duration  # Returns True when animation is done
-
-    def draw(self, screen, camera_x, camera_y):
-        """Draws the animation effect."""
-        temp_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        temp_surface.fill((255, 255, 255, int(self.alpha)))  # White fading out
-        screen.blit(temp_surface, (self.rect.x - camera_x, self.rect.y - camera_y))
-
-
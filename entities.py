@@ -0,0 +1,81 @@
+# Component names an archetype can declare in its COMPONENTS set
+TRANSFORM = "transform"  # Has a world-space rect
+VELOCITY = "velocity"  # Moves on its own each tick
+HEALTH = "health"  # Can take damage and die
+COLLIDER = "collider"  # Blocked by obstacles, hit by bullets and blasts
+AI_STATE = "ai"  # Runs an update() decision step each tick
+RENDERABLE = "renderable"  # Has a draw() method
+CONTACT_DAMAGE = "contact_damage"  # Hurts the player on touch
+DIES_ON_CONTACT = "dies_on_contact"  # Removed after hurting the player
+RANGED = "ranged"  # Fires into game.enemy_bullets
+PROJECTILE = "projectile"  # Short-lived shot (player and enemy shots live in their own array pools)
+
+
+class EntityStore:
+    """Entities grouped into per-archetype tables, so each system only walks the archetypes it needs."""
+
+    def __init__(self):
+        self.tables = {}  # Archetype (entity class) -> list of its live entities
+        self._slots = {}  # id(entity) -> index in its table, for O(1) membership and removal
+        self._queries = {}  # Component tuple -> cached list of (archetype, table)
+
+    def add(self, entity):
+        archetype = type(entity)
+        table = self.tables.get(archetype)
+        if table is None:
+            table = self.tables[archetype] = []
+            self._queries.clear()  # A new archetype may match existing queries
+        self._slots[id(entity)] = len(table)
+        table.append(entity)
+
+    append = add  # Reads naturally where the store replaced a plain list
+
+    def remove(self, entity):
+        """Swap-removes the entity from its table. Raises ValueError if it isn't stored."""
+        slot = self._slots.pop(id(entity), None)
+        if slot is None:
+            raise ValueError("entity not in store")
+        table = self.tables[type(entity)]
+        last = table.pop()
+        if last is not entity:
+            table[slot] = last
+            self._slots[id(last)] = slot
+
+    def discard(self, entity):
+        """Removes the entity if present. Returns True if it was removed."""
+        if id(entity) not in self._slots:
+            return False
+        self.remove(entity)
+        return True
+
+    def __contains__(self, entity):
+        return id(entity) in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __iter__(self):
+        for table in self.tables.values():
+            yield from table
+
+    def snapshot(self):
+        """A plain list copy, safe to iterate while entities are added or removed."""
+        return [entity for table in self.tables.values() for entity in table]
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+        self._slots.clear()
+
+    def query(self, *components):
+        """Returns [(archetype, table)] for every archetype that has all the given components."""
+        cached = self._queries.get(components)
+        if cached is None:
+            cached = [(archetype, table) for archetype, table in self.tables.items()
+                      if archetype.COMPONENTS.issuperset(components)]
+            self._queries[components] = cached
+        return cached
+
+    def each(self, *components):
+        """Snapshot list of every entity that has all the given components."""
+        return [entity for _, table in self.query(*components) for entity in table]
@@ -1,15 +1,30 @@
 import pygame
-import random
 import sys
+import time
 from player import Player
 from enemy import Enemy, FastEnemy, TankEnemy, DasherEnemy, ShooterEnemy, SwarmEnemy  # Import all enemy types
 from bossenemy import BossEnemy
-from obstacle import generate_town_layout
+from towngen import generate_town, town_seed
+from world import World, MAP_WIDTH, MAP_HEIGHT, FLOOR_TILE_SIZE, GRASS_TILE_SIZE, WALL_TILE_SIZE
 from leaderboard import save_leaderboard
+from ioworker import IO_WORKER
+from inputs import InputSystem, is_active, selected_index
+from ailod import AILODScheduler
+from aoe import AoEResolver
+from spatial import SpatialGrid
+from separation import SeparationSolver
+from shooterbullet import EnemyProjectilePool
+from memdiag import MemoryDiagnostics, memory_diagnostics_enabled
+from profiling import SessionProfiler
+from capture import FrameCapture
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW, window_size, render_scale_setting
+from rng import GameRandom, rng_seed
+from effects import ParticleSystem
+from entities import EntityStore, AI_STATE, COLLIDER, CONTACT_DAMAGE, DIES_ON_CONTACT, RENDERABLE
 
 # Constants
-WIDTH, HEIGHT = 1024, 768
-MAP_WIDTH, MAP_HEIGHT = 2560, 1920
+WIDTH, HEIGHT = window_size()  # LAST_STAND_WINDOW, default 1024x768
 WHITE = (255, 255, 255)
 FONT = pygame.font.Font(None, 36)
 
@@ -23,34 +38,34 @@ XP_BAR_HEIGHT = 20
 XP_BAR_X = (WIDTH - XP_BAR_WIDTH) // 2
 XP_BAR_Y = 10  #
 
-# Load the textures
-FLOOR_TEXTURE = pygame.image.load("textures/StoneFloorTexture.png")  # Update with your file path
-FLOOR_TEXTURE = pygame.transform.scale(FLOOR_TEXTURE, (128, 128))  # Resize to a smaller tile size
 
-GRASS_TEXTURE = pygame.image.load("textures/grass.jpg")  # Update with your file path
-GRASS_TEXTURE = pygame.transform.scale(GRASS_TEXTURE, (128, 128))  # Resize to a smaller tile size
-
-WALL_TEXTURE = pygame.image.load("textures/wall.png")  # Update with actual file path
-WALL_TEXTURE = pygame.transform.scale(WALL_TEXTURE, (30, 30))
+# Textures the game loop needs, preloaded behind the loading screen
+GAME_TEXTURES = [("floor", FLOOR_TILE_SIZE), ("grass", GRASS_TILE_SIZE), ("wall", WALL_TILE_SIZE)]
 
 class Game:
-    def __init__(self):
+    def __init__(self, input_source=None):
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        self.clock = pygame.time.Clock()
+        WORLD_VIEW.reset(render_scale_setting())  # Adaptive unless LAST_STAND_RENDER_SCALE pins it
+        self.clock = pygame.time.Clock()  # Frame-rate cap only; game time comes from GAME_CLOCK
+        GAME_CLOCK.reset()  # ✅ Game time starts at 0 and only runs while the game is unpaused
+        self.rng = GameRandom(rng_seed())  # Seeded streams for spawns, loot, AI and upgrades
+        print(f"🎲 RNG seed {self.rng.seed}")
+        self.input = InputSystem(input_source)  # Live keyboard/mouse unless a scripted source is given
+        self.input_frame = self.input.frame
         self.running = True
         self.paused_for_upgrade = False  # ⬅️ Add this flag to pause the game
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = GAME_CLOCK.now
         self.wave_start_time = self.start_time
         self.wave = 1
         self.score = 0
-        self.last_enemy_spawn_time = pygame.time.get_ticks()
+        self.last_enemy_spawn_time = GAME_CLOCK.now
         self.spawn_interval = INITIAL_SPAWN_INTERVAL
         self.enemy_types = [Enemy]  # Start with only basic enemies
-        self.death_animations = []  # Store active death animations
-        self.enemy_bullets = [] # Store bullets fired by shooter enemies
+        self.enemy_bullets = EnemyProjectilePool(MAP_WIDTH, MAP_HEIGHT)  # Shooter bullets and boss missiles
         self.currency_drops = [] # Store currency of player
 
-        self.explosions = []
+        self.particles = ParticleSystem(self.rng.fx)  # Death and explosion effects
+        self.aoe = AoEResolver(self.particles)  # Explosion damage is queued and resolved once per tick
 
         # Create player
         self.player = Player(MAP_WIDTH // 2, MAP_HEIGHT // 2, MAP_WIDTH, MAP_HEIGHT)
@@ -60,13 +75,29 @@ class Game:
         self.camera_y = self.player.rect.centery - HEIGHT // 2
 
         # Generate structured town layout
-        self.obstacles = generate_town_layout(self.player.rect.x, self.player.rect.y)
-
-        # Enemy list
-        self.enemies = []
+        self.town = generate_town(town_seed(self.rng), MAP_WIDTH, MAP_HEIGHT, self.player.rect.center)
+        self.obstacles = self.town.obstacles
+        print(f"🏘️ Town seed {self.town.seed}: {len(self.obstacles)} obstacles, {len(self.town.roads)} roads"
+              f"{' (cached)' if self.town.from_cache else ''}")
+        self.world = World(self.obstacles)  # Chunked: per-chunk obstacles, baked backgrounds and wall rasters
+
+        # Enemies, grouped into per-archetype tables
+        self.enemies = EntityStore()
+        self.enemy_grid = SpatialGrid(self.enemies)  # Broad-phase queries (sword hits); rebuilt lazily each tick
+        self.ai_lod = AILODScheduler(WIDTH, HEIGHT)  # Throttles AI for distant, off-screen enemies
+        self.separation = SeparationSolver()  # Keeps hordes from collapsing into one blob
 
         self.boss_active = False
 
+        # Memory diagnostics mode (LAST_STAND_MEMDIAG=1): per-wave snapshots and leak report
+        self.memory_diagnostics = MemoryDiagnostics() if memory_diagnostics_enabled() else None
+
+        # On-demand profiler: LAST_STAND_PROFILE=1 / --profile starts it, F9 toggles it mid-run
+        self.profiler = SessionProfiler.from_env()
+
+        # Gameplay capture: LAST_STAND_CAPTURE=1 / --capture records from the first frame, F10 toggles it
+        self.capture = FrameCapture.from_env()
+
     def spawn_enemy(self):
         """Spawns enemies dynamically, but prevents spawns if the Boss is active."""
         if self.boss_active:
@@ -88,15 +119,19 @@ class Game:
         if len(enemy_weights) != len(self.enemy_types):
             raise ValueError("Enemy weights do not match the available enemy types!")
 
-        enemy_class = random.choices(self.enemy_types, weights=enemy_weights, k=1)[0]
-
-        # Randomize spawn location
-        base_x, base_y = random.choice([
-            (random.randint(0, MAP_WIDTH), 0),
-            (random.randint(0, MAP_WIDTH), MAP_HEIGHT),
-            (0, random.randint(0, MAP_HEIGHT)),
-            (MAP_WIDTH, random.randint(0, MAP_HEIGHT))
-        ])
+        spawn_rng = self.rng.spawn
+        enemy_class = spawn_rng.weighted_choice(self.enemy_types, enemy_weights)
+
+        # Randomize spawn location on one of the four map edges
+        side = spawn_rng.randint(0, 3)
+        if side == 0:
+            base_x, base_y = spawn_rng.randint(0, MAP_WIDTH), 0
+        elif side == 1:
+            base_x, base_y = spawn_rng.randint(0, MAP_WIDTH), MAP_HEIGHT
+        elif side == 2:
+            base_x, base_y = 0, spawn_rng.randint(0, MAP_HEIGHT)
+        else:
+            base_x, base_y = MAP_WIDTH, spawn_rng.randint(0, MAP_HEIGHT)
 
         # Handle special spawns like SwarmEnemy
         if enemy_class == Enemy:
@@ -112,10 +147,10 @@ class Game:
         elif enemy_class == SwarmEnemy:
             swarm_group = []
             for i in range(5):  # Spawn a group of SwarmEnemies
-                offset_x = random.randint(-30, 30)
-                offset_y = random.randint(-30, 30)
+                offset_x = spawn_rng.randint(-30, 30)
+                offset_y = spawn_rng.randint(-30, 30)
                 spawn_rect = pygame.Rect(base_x + offset_x, base_y + offset_y, 25, 25)
-                if any(obstacle.collides(spawn_rect) for obstacle in self.obstacles):
+                if self.world.collides(spawn_rect):
                     continue
                 swarm_member = SwarmEnemy(base_x + offset_x, base_y + offset_y, swarm_group)
                 swarm_group.append(swarm_member)
@@ -128,8 +163,12 @@ class Game:
 
     def new_wave(self):
         """Increases difficulty each wave, introducing new enemies and handling Boss waves."""
+        self.profiler.on_wave(self)  # One profile per finished wave
         self.wave += 1
-        self.wave_start_time = pygame.time.get_ticks()
+        self.wave_start_time = GAME_CLOCK.now
+
+        if self.memory_diagnostics:
+            self.memory_diagnostics.on_wave(self)
 
         # Boss Spawns at Wave 10 (or later if needed)
         if self.wave % 10 == 0 and self.wave != 0:
@@ -148,6 +187,11 @@ class Game:
         self.spawn_interval = max(500, int(INITIAL_SPAWN_INTERVAL * difficulty_modifier))
 
         print(f"Starting Wave {self.wave}! Spawn rate: {self.spawn_interval}ms")
+        average_latency, worst_latency = self.input.latency_stats()
+        print(f"⌨️ Input latency: {average_latency:.1f}ms avg, {worst_latency}ms worst")
+        print(f"🎯 Enemy projectiles: {len(self.enemy_bullets)}/{self.enemy_bullets.capacity} "
+              f"({self.enemy_bullets.occupancy():.0%} full, {self.enemy_bullets.evicted} evicted)")
+        print(f"🗺️ World: {self.world.stats()}")
 
         # Introduce new enemy types at wave milestones
         if self.wave == 2 and FastEnemy not in self.enemy_types:
@@ -169,9 +213,8 @@ class Game:
     def run(self):
         """Main game loop."""
         while self.running:
-            self.draw_background()
-            current_time = pygame.time.get_ticks()
-            elapsed_wave_time = current_time - self.wave_start_time
+            GAME_CLOCK.tick()  # One timestamp for every system this tick
+            frame_start = time.perf_counter()
 
             self.camera_x = self.player.rect.centerx - WIDTH // 2
             self.camera_y = self.player.rect.centery - HEIGHT // 2
@@ -183,208 +226,214 @@ class Game:
                 self.clock.tick(60)
                 continue
 
-            current_time = pygame.time.get_ticks()
-            elapsed_wave_time = current_time - self.wave_start_time
-
-
-            keys = pygame.key.get_pressed()
-
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                if self.paused_for_upgrade:
-                    self.handle_upgrade_input()
-                    self.draw_upgrade_screen()
-                    self.clock.tick(60)
-                    continue
+            # Sample input once for this tick
+            frame = self.input.sample()
+            self.input_frame = frame
+            if frame.quit:
+                self.quit()
 
-                if self.paused_for_upgrade and event.type == pygame.KEYDOWN:
-                    self.player.handle_level_up_input(event.key, self)  # Let player pick an upgrade
+            # Toggle the profiler (F9)
+            if "toggle_profiler" in frame.pressed:
+                self.profiler.toggle(self)
+            self.profiler.tick(self)
 
-                if not self.paused_for_upgrade:  # Only process other inputs if game is not paused
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if event.button == 1:  # Left click to shoot
-                            mouse_x, mouse_y = pygame.mouse.get_pos()
-                            self.player.shoot(mouse_x + self.camera_x, mouse_y + self.camera_y)
+            # Toggle gameplay capture (F10)
+            if "toggle_capture" in frame.pressed:
+                self.capture.toggle(self.screen)
 
-                    # Explosive Shot (Press Q)
-                    if keys[pygame.K_q]:
-                        mouse_x, mouse_y = pygame.mouse.get_pos()
-                        self.player.use_explosive_shot(mouse_x + self.camera_x, mouse_y + self.camera_y, self)
+            # Open shop when 'B' is pressed
+            if "open_shop" in frame.pressed:
+                self.open_shop()
 
-                    # Sword Attack (Press E)
-                    if keys[pygame.K_e]:
-                        self.player.use_sword_attack(self)
+            self.simulate(frame)
 
-                    # Dash (Press Shift)
-                    if keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]:
-                        self.player.use_dash()
-
-                # Open shop when 'B' is pressed
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_b:
-                    self.open_shop()
-
-            # Wave system
-            if elapsed_wave_time >= WAVE_DURATION:
-                self.new_wave()
-
-            # Enemy spawning
-            if current_time - self.last_enemy_spawn_time > self.spawn_interval:
-                self.spawn_enemy()
-                self.last_enemy_spawn_time = current_time
-
-            # Update player movement
-            self.player.update(self.obstacles, self)
+            # Check if player dies
+            if self.player.health <= 0:
+                self.end_game()
 
-            # Update enemy movement
-            for enemy in self.enemies[:]:
-                if isinstance(enemy, ShooterEnemy):
-                    enemy.update(self.player, self.obstacles, self, self.enemy_bullets)  # Pass bullets list
-                else:
-                    enemy.update(self.player, self.obstacles, self)  # Normal enemies don't need bullets
+            self.input.mark_consumed(frame)
+            IO_WORKER.poll()  # Completion callbacks for background saves
 
-            for bullet in self.player.bullets[:]:  # Iterate over a copy to avoid modification issues
-                bullet.update(self.obstacles, self.enemies, self)
+            self.draw_frame()
+            self.input.buffer()  # Stamps presses that arrived while drawing; the next sample() picks them up
+            WORLD_VIEW.frame_time((time.perf_counter() - frame_start) * 1000)  # Work time, before the cap's sleep
+            self.clock.tick(60)
 
-            # Update and handle bullets
-            bullets_to_remove = []
-            for bullet in self.player.bullets[:]:  # Iterate over a copy to safely remove bullets
-                if bullet.rect is None:
-                    continue  # Skip bullets that were already removed
+    def quit(self):
+        """Every in-game quit path: flushes the profiler, capture and input recording, then exits."""
+        self.profiler.stop(self)
+        self.capture.stop()
+        self.input.stop()
+        pygame.quit()
+        sys.exit()
+
+    def simulate(self, frame):
+        """Advances the simulation one tick from an InputFrame. No drawing, so it also runs headless (netserver.py)."""
+        current_time = GAME_CLOCK.now
+        elapsed_wave_time = current_time - self.wave_start_time
+        mouse_x, mouse_y = frame.mouse_pos
+
+        # Left click to shoot
+        if "shoot" in frame.pressed:
+            self.player.shoot(mouse_x + self.camera_x, mouse_y + self.camera_y)
+
+        # Explosive Shot (Press Q)
+        if is_active(frame, "explosive_shot"):
+            self.player.use_explosive_shot(mouse_x + self.camera_x, mouse_y + self.camera_y, self)
+
+        # Sword Attack (Press E)
+        if is_active(frame, "sword_attack"):
+            self.player.use_sword_attack(self)
+
+        # Dash (Press Shift)
+        if is_active(frame, "dash"):
+            self.player.use_dash(frame)
+
+        # Wave system
+        if elapsed_wave_time >= WAVE_DURATION:
+            self.new_wave()
+
+        # Enemy spawning
+        if current_time - self.last_enemy_spawn_time > self.spawn_interval:
+            self.spawn_enemy()
+            self.last_enemy_spawn_time = current_time
+
+        # Update player movement
+        self.enemy_grid.mark_dirty()
+        self.player.update(self.world, self)
+
+        # Update enemy movement (distant enemies update less often with larger steps)
+        for enemy, step in self.ai_lod.schedule(self.enemies.each(AI_STATE), self.player,
+                                                self.camera_x, self.camera_y):
+            enemy.update(self.player, self.world, self, step=step)
+
+        # Push overlapping enemies apart (one grid pass over every collider)
+        self.separation.resolve(self.enemies.each(COLLIDER), self.world)
+        self.enemy_grid.mark_dirty()
+
+        # Update player bullets (one batched pass for movement, walls and enemy hits)
+        self.player.bullets.update(self)
+
+        # Resolve every explosion queued this tick (explosive shots, missiles, chain reactions)
+        self.aoe.resolve(self)
+
+        # Remove dead enemies stuck in obstacles
+        for enemy in self.enemies.each(COLLIDER):
+            if self.world.collides(enemy.rect):
+                self.enemies.remove(enemy)
+
+        # Update enemy bullets and missiles (one batched pass; missile blasts resolve next tick)
+        self.enemy_bullets.update(self.player, self)
+
+        # Check if player collides with enemies (take damage)
+        for archetype, table in self.enemies.query(CONTACT_DAMAGE, COLLIDER):
+            removed_on_contact = DIES_ON_CONTACT in archetype.COMPONENTS  # ✅ The boss survives contact
+            for enemy in table[:]:  # Iterate over a copy to avoid modification errors
+                if enemy.rect is not None and enemy.rect.colliderect(self.player.rect):
+                    self.player.take_damage()
+                    if removed_on_contact:
+                        self.enemies.remove(enemy)
 
-                for enemy in self.enemies:
-                    if enemy.rect is not None and bullet.rect.colliderect(enemy.rect):
-                        break  # ✅ Let bullet.py handle enemy damage & removal
+        # Check for currency pickups
+        for currency in self.currency_drops[:]:
+            if currency.check_pickup(self.player):  # If collected, remove it
+                self.currency_drops.remove(currency)
 
-            # Remove bullets after iteration to prevent modifying the list while looping
-            for bullet in bullets_to_remove:
-                if bullet in self.player.bullets:
-                    self.player.bullets.remove(bullet)
+        # Death and explosion particles
+        self.particles.update()
 
-            # Remove dead enemies stuck in obstacles
-            for enemy in self.enemies[:]:
-                if any(obstacle.collides(enemy.rect) for obstacle in self.obstacles):
-                    self.enemies.remove(enemy)
+        # Run every timer that came due this tick (extra bullets, buff expiry, enemy attack windups)
+        GAME_CLOCK.timers.advance(current_time)
 
-            # Update enemy bullets (ShooterBullets)
-            for bullet in self.enemy_bullets[:]:  # Iterate over a copy to safely remove bullets
-                bullet.update(self.player, self.obstacles, self.enemy_bullets)
+    def draw_world(self, background=True):
+        """Draws the world layer at the current render scale and puts it on the display. Without the
+        background (upgrade and shop screens) the floor is a flat dark fill."""
+        surface = WORLD_VIEW.begin(self.screen)
+        if background:
+            self.world.draw_background(surface, self.camera_x, self.camera_y)
 
             # Draw enemy bullets
-            for bullet in self.enemy_bullets:
-                bullet.draw(self.screen, self.camera_x, self.camera_y)
-
-            # Check if player collides with enemies (take damage)
-            for enemy in self.enemies[:]:  # Iterate over a copy to avoid modification errors
-                if enemy.rect is not None and enemy.rect.colliderect(self.player.rect):
-                    self.player.take_damage()
-
-                    # ✅ Only remove the enemy if it's NOT a BossEnemy
-                    if not isinstance(enemy, BossEnemy):
-                        self.enemies.remove(enemy)
+            self.enemy_bullets.draw(surface, self.camera_x, self.camera_y)
+        else:
+            surface.fill((30, 30, 30))
 
-            # Check if player dies
-            if self.player.health <= 0:
-                self.end_game()
+        # Draw everything with camera offset
+        self.player.draw(surface, self.camera_x, self.camera_y, self)
+        self.player.bullets.draw(surface, self.camera_x, self.camera_y)
+        for enemy in self.enemies.each(RENDERABLE):
+            enemy.draw(surface, self.camera_x, self.camera_y)
+        self.world.draw_obstacles(surface, self.camera_x, self.camera_y)
 
-            # Check for currency pickups
-            for currency in self.currency_drops[:]:
-                if currency.check_pickup(self.player):  # If collected, remove it
-                    self.currency_drops.remove(currency)
-
-            # Death animation for enemies
-            for animation in self.death_animations[:]:  # Iterate over a copy for safe removal
-                if animation.update():
-                    self.death_animations.remove(animation)
-
-            # Fire extra bullets
-            self.player.update_bullets()
-
-            # Draw everything with camera offset
-            self.player.draw(self.screen, self.camera_x, self.camera_y, self)
-            for bullet in self.player.bullets:
-                bullet.draw(self.screen, self.camera_x, self.camera_y)
-            for enemy in self.enemies:
-                enemy.draw(self.screen, self.camera_x, self.camera_y)
-            for obstacle in self.obstacles:
-                obstacle.draw(self.screen, self.camera_x, self.camera_y)
-
-            # Draw death animations
-            for animation in self.death_animations:
-                animation.draw(self.screen, self.camera_x, self.camera_y)
-
-            # ✅ Draw explosion effects
-            for explosion in self.explosions[:]:
-                if explosion.draw(self.screen, self.camera_x, self.camera_y):
-                    self.explosions.remove(explosion)  # Remove explosion after animation
+        if background:
+            # ✅ Death and explosion particles, one batched blit
+            self.particles.draw(surface, self.camera_x, self.camera_y)
 
             # Draw currency drops
             for currency in self.currency_drops:
-                currency.draw(self.screen, self.camera_x, self.camera_y)
+                currency.draw(surface, self.camera_x, self.camera_y)
 
-            # Draw UI (Wave, Score, and Player Health)
-            wave_text = FONT.render(f"Wave: {self.wave}", True, WHITE)
-            score_text = FONT.render(f"Score: {self.score}", True, WHITE)
-            health_text = FONT.render(f"Health: {self.player.health}", True, WHITE)
+        WORLD_VIEW.present(self.screen)
 
-            # Draw UI action elements
-            self.draw_ability_ui()
+    def draw_frame(self):
+        """Draws the world and HUD for the current state, then flips the display."""
+        self.draw_world()
 
-            # Draw UI shop button
-            self.draw_shop_ui()
+        # Draw UI (HUD stays at native resolution, on top of the world) (Wave, Score, and Player Health)
+        wave_text = FONT.render(f"Wave: {self.wave}", True, WHITE)
+        score_text = FONT.render(f"Score: {self.score}", True, WHITE)
+        health_text = FONT.render(f"Health: {self.player.health}", True, WHITE)
 
-            # Calculate XP progress width
-            xp_progress_width = int((self.player.xp / self.player.xp_to_next_level) * XP_BAR_WIDTH)
+        # Draw UI action elements
+        self.draw_ability_ui()
 
-            # Draw XP bar background (gray)
-            pygame.draw.rect(self.screen, (100, 100, 100), (XP_BAR_X, XP_BAR_Y, XP_BAR_WIDTH, XP_BAR_HEIGHT))
+        # Draw UI shop button
+        self.draw_shop_ui()
 
-            # Draw XP progress (blue)
-            pygame.draw.rect(self.screen, (50, 150, 255), (XP_BAR_X, XP_BAR_Y, xp_progress_width, XP_BAR_HEIGHT))
+        # Calculate XP progress width
+        xp_progress_width = int((self.player.xp / self.player.xp_to_next_level) * XP_BAR_WIDTH)
 
-            # 🏆 **Level Display**
-            level_text = f"Lvl: {self.player.level}"
-            level_text_x = XP_BAR_X + (XP_BAR_WIDTH - FONT.render(level_text, True, (255, 255, 255)).get_width()) // 2
-            level_text_y = XP_BAR_Y + XP_BAR_HEIGHT + 5
-            draw_text_with_border(self.screen, level_text, level_text_x, level_text_y, FONT)
+        # Draw XP bar background (gray)
+        pygame.draw.rect(self.screen, (100, 100, 100), (XP_BAR_X, XP_BAR_Y, XP_BAR_WIDTH, XP_BAR_HEIGHT))
 
-            # 🌊 **Wave Display**
-            wave_text_str = f"Wave: {self.wave}"  # Ensure this is a string
-            draw_text_with_border(self.screen, wave_text_str, 10, 10, FONT)
+        # Draw XP progress (blue)
+        pygame.draw.rect(self.screen, (50, 150, 255), (XP_BAR_X, XP_BAR_Y, xp_progress_width, XP_BAR_HEIGHT))
 
-            # 🎯 **Score Display**
-            score_text_str = f"Score: {self.score}"  # Convert to string format
-            draw_text_with_border(self.screen, score_text_str, WIDTH - 150, 10, FONT)
+        # 🏆 **Level Display**
+        level_text = f"Lvl: {self.player.level}"
+        level_text_x = XP_BAR_X + (XP_BAR_WIDTH - FONT.render(level_text, True, (255, 255, 255)).get_width()) // 2
+        level_text_y = XP_BAR_Y + XP_BAR_HEIGHT + 5
+        draw_text_with_border(self.screen, level_text, level_text_x, level_text_y, FONT)
 
-            # ❤️ **Health Display**
-            health_text_str = f"Health: {self.player.health}"  # Ensure correct format
-            draw_text_with_border(self.screen, health_text_str, 10, HEIGHT - 50, FONT)
+        # 🌊 **Wave Display**
+        wave_text_str = f"Wave: {self.wave}"  # Ensure this is a string
+        draw_text_with_border(self.screen, wave_text_str, 10, 10, FONT)
 
-            pygame.display.flip()
-            self.clock.tick(60)
+        # 🎯 **Score Display**
+        score_text_str = f"Score: {self.score}"  # Convert to string format
+        draw_text_with_border(self.screen, score_text_str, WIDTH - 150, 10, FONT)
+
+        # ❤️ **Health Display**
+        health_text_str = f"Health: {self.player.health}"  # Ensure correct format
+        draw_text_with_border(self.screen, health_text_str, 10, HEIGHT - 50, FONT)
+
+        self.capture.grab(self.screen)  # Copies the finished frame into the capture ring (if recording)
+        pygame.display.flip()
 
     def handle_upgrade_input(self):
         """Handles player input for selecting an upgrade."""
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                self.player.handle_level_up_input(event.key, self)
+        frame = self.input.sample()
+        self.input_frame = frame
+        if frame.quit:
+            self.quit()
+
+        index = selected_index(frame)
+        if index is not None:
+            self.player.handle_level_up_input(index, self)
 
     def draw_upgrade_screen(self):
         """Displays the upgrade selection screen while keeping the game scene visible."""
         # 1️⃣ Draw the current game scene first (instead of clearing)
-        self.screen.fill((30, 30, 30))  # Keep background visible
-
-        # Draw all game elements
-        for bullet in self.player.bullets:
-            bullet.draw(self.screen, self.camera_x, self.camera_y)
-        for enemy in self.enemies:
-            enemy.draw(self.screen, self.camera_x, self.camera_y)
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen, self.camera_x, self.camera_y)
-        self.player.draw(self.screen, self.camera_x, self.camera_y, self)
+        self.draw_world(background=False)
 
         # 2️⃣ Overlay a semi-transparent dark box to highlight the menu
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -409,18 +458,11 @@ class Game:
     def open_shop(self):
         """Pauses the game and displays the shop UI with a semi-transparent overlay and ESC button."""
         shop_open = True
+        GAME_CLOCK.pause("shop")  # Cooldowns, spawns and wave timer freeze while shopping
 
         while shop_open:
             # ✅ 1️⃣ Keep the game scene visible by drawing everything first
-            self.screen.fill((30, 30, 30))
-
-            for bullet in self.player.bullets:
-                bullet.draw(self.screen, self.camera_x, self.camera_y)
-            for enemy in self.enemies:
-                enemy.draw(self.screen, self.camera_x, self.camera_y)
-            for obstacle in self.obstacles:
-                obstacle.draw(self.screen, self.camera_x, self.camera_y)
-            self.player.draw(self.screen, self.camera_x, self.camera_y, self)
+            self.draw_world(background=False)
 
             # ✅ 2️⃣ Overlay a semi-transparent dark box (like Upgrade Screen)
             overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -496,42 +538,26 @@ class Game:
             pygame.display.flip()
 
             # ✅ 9️⃣ Handle shop interactions
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        shop_open = False  # Close shop and resume game
-                    elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
-                        index = event.key - pygame.K_1  # Convert key to list index
-                        selected_upgrade = upgrades[index]
-
-                        if selected_upgrade["name"] not in self.player.actions and self.player.currency >= \
-                                selected_upgrade["cost"]:
-                            self.player.currency -= selected_upgrade["cost"]
-                            self.player.actions.append(
-                                selected_upgrade["name"])  # Store in actions instead of abilities
-                            selected_upgrade["effect"]()  # Apply the ability
-
-            # ✅ 8️⃣ Handle shop interactions
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        shop_open = False  # Close shop and resume game
-                    elif event.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
-                        index = event.key - pygame.K_1  # Convert key to list index
-                        selected_upgrade = upgrades[index]
-
-                        if selected_upgrade["name"] not in self.player.actions and self.player.currency >= \
-                                selected_upgrade["cost"]:
-                            self.player.currency -= selected_upgrade["cost"]
-                            self.player.actions.append(
-                                selected_upgrade["name"])  # Store in actions instead of abilities
-                            selected_upgrade["effect"]()  # Apply the ability
+            frame = self.input.sample()
+            self.input_frame = frame
+            if frame.quit:
+                self.quit()
+
+            if "back" in frame.pressed:
+                shop_open = False  # Close shop and resume game
+            else:
+                index = selected_index(frame)
+                if index is not None:
+                    selected_upgrade = upgrades[index]
+
+                    if selected_upgrade["name"] not in self.player.actions and self.player.currency >= \
+                            selected_upgrade["cost"]:
+                        self.player.currency -= selected_upgrade["cost"]
+                        self.player.actions.append(
+                            selected_upgrade["name"])  # Store in actions instead of abilities
+                        selected_upgrade["effect"]()  # Apply the ability
+
+        GAME_CLOCK.resume("shop")
 
     def draw_ability_ui(self):
         """Displays UI elements for purchased abilities with proper cooldown indicators."""
@@ -544,7 +570,7 @@ class Game:
         x_offset = WIDTH - 875  # Align abilities correctly
         y_position = HEIGHT - 60  # Bottom of the screen
 
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
 
         for ability in self.player.actions:
             if ability in ability_icons:
@@ -628,38 +654,14 @@ class Game:
 
     # Function to draw the background
     def draw_background(self):
-        camera_x, camera_y = self.camera_x, self.camera_y  # Get camera offset
-
-        # Get tile sizes
-        grass_tile_w = GRASS_TEXTURE.get_width()
-        grass_tile_h = GRASS_TEXTURE.get_height()
-        floor_tile_w = FLOOR_TEXTURE.get_width()
-        floor_tile_h = FLOOR_TEXTURE.get_height()
-
-        for x in range(0, MAP_WIDTH, floor_tile_w):
-            for y in range(0, MAP_HEIGHT, floor_tile_h):
-                self.screen.blit(FLOOR_TEXTURE, (x - camera_x, y - camera_y))
-
-        for x in range(-grass_tile_w * 5, MAP_WIDTH + grass_tile_w * 5, grass_tile_w):
-            for y in range(-grass_tile_h * 5, MAP_HEIGHT + grass_tile_h * 5, grass_tile_h):
-                # Ensure grass is **only drawn outside the playable area**
-                if x < 0 or y < 0 or x >= MAP_WIDTH or y >= MAP_HEIGHT:
-                    self.screen.blit(GRASS_TEXTURE, (x - camera_x, y - camera_y))
-
-
-        # Draw Walls
-        border_thickness = 10
-
-        for x in range(0, MAP_WIDTH, WALL_TEXTURE.get_width()):
-            self.screen.blit(WALL_TEXTURE, (x - camera_x, -camera_y))  # Top
-            self.screen.blit(WALL_TEXTURE, (x - camera_x, MAP_HEIGHT - camera_y - border_thickness))  # Bottom
-
-        for y in range(0, MAP_HEIGHT, WALL_TEXTURE.get_height()):
-            self.screen.blit(WALL_TEXTURE, (-camera_x, y - camera_y))  # Left
-            self.screen.blit(WALL_TEXTURE, (MAP_WIDTH - camera_x - border_thickness, y - camera_y))  # Right
+        """Blits the pre-baked chunks under the camera (floor, grass and walls) into the world layer."""
+        self.world.draw_background(WORLD_VIEW.begin(self.screen), self.camera_x, self.camera_y)
 
     def end_game(self):
         """Ends the game and prompts for leaderboard entry."""
+        self.profiler.stop(self)
+        self.capture.stop()
+        self.input.stop()
         name = ""
         input_active = True
         while input_active:
@@ -672,8 +674,7 @@ class Game:
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN and name:
                         save_leaderboard(name, self.score, self.wave)
@@ -0,0 +1,73 @@
+import pygame
+from timers import TimerWheel
+
+FRAME_MS = 1000 / 60  # Virtual mode advances exactly one 60 FPS frame per tick
+
+
+class GameClock:
+    """Game time in ms, sampled once per tick. Stops while paused and runs at `scale` x real time."""
+
+    def __init__(self, virtual=False, frame_ms=FRAME_MS):
+        self.virtual = virtual  # Virtual: every tick is exactly frame_ms long, no wall clock involved
+        self.frame_ms = frame_ms
+        self.scale = 1.0  # <1 slow motion, >1 fast-forward
+        self.timers = TimerWheel()  # Cooldowns and delayed events on game time (advanced by Game.simulate)
+        self.reset()
+
+    def reset(self):
+        """Restarts game time at 0 (call once per new game)."""
+        self._time = 0.0
+        self.now = 0  # ✅ The one timestamp every system reads this tick
+        self.tick_count = 0
+        self.pause_reasons = set()
+        self._last_real = self._real()
+        self.timers.reset()  # A new game never inherits the last one's pending events
+
+    def _real(self):
+        return 0 if self.virtual else pygame.time.get_ticks()
+
+    def set_virtual(self, virtual=True, frame_ms=FRAME_MS):
+        self.virtual = virtual
+        self.frame_ms = frame_ms
+        self._last_real = self._real()
+
+    def set_scale(self, scale):
+        self.scale = max(0.0, scale)
+
+    @property
+    def paused(self):
+        return bool(self.pause_reasons)
+
+    def pause(self, reason="pause"):
+        """Freezes game time. Pauses stack by reason ("shop", "upgrade"), so overlapping screens don't clash."""
+        self.pause_reasons.add(reason)
+
+    def resume(self, reason="pause"):
+        if reason not in self.pause_reasons:
+            return
+        self.pause_reasons.discard(reason)
+        if not self.pause_reasons:
+            self._last_real = self._real()  # Time spent paused never reaches the game
+
+    def tick(self):
+        """Samples the clock once and advances game time. Returns the new timestamp."""
+        real = self._real()
+        delta = self.frame_ms if self.virtual else real - self._last_real
+        self._last_real = real
+        if not self.pause_reasons:
+            self._time += delta * self.scale
+        self.now = int(self._time)
+        self.tick_count += 1
+        return self.now
+
+    def schedule(self, delay, callback, *args):
+        """Runs callback(*args) once `delay` ms of game time have passed. Returns a cancellable Timer."""
+        return self.timers.schedule(self.now + delay, callback, *args)
+
+    def advance(self, ms):
+        """Jumps game time forward (tests and fast-forward)."""
+        self._time += ms
+        self.now = int(self._time)
+
+
+GAME_CLOCK = GameClock()
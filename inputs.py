@@ -0,0 +1,197 @@
+import json
+import os
+from collections import namedtuple
+import pygame
+
+RECORD_ENV = "LAST_STAND_RECORD"  # Path to record live input to (replay it with ScriptedInputSource.load)
+
+# Action name -> keys that trigger it
+KEY_BINDINGS = {
+    "move_up": (pygame.K_w,),
+    "move_down": (pygame.K_s,),
+    "move_left": (pygame.K_a,),
+    "move_right": (pygame.K_d,),
+    "explosive_shot": (pygame.K_q,),
+    "sword_attack": (pygame.K_e,),
+    "dash": (pygame.K_LSHIFT, pygame.K_RSHIFT),
+    "open_shop": (pygame.K_b,),
+    "back": (pygame.K_ESCAPE,),
+    "select_1": (pygame.K_1,),
+    "select_2": (pygame.K_2,),
+    "select_3": (pygame.K_3,),
+    "dev_level_up": (pygame.K_l,),
+    "toggle_profiler": (pygame.K_F9,),
+    "toggle_capture": (pygame.K_F10,),
+}
+
+# Action name -> mouse buttons that trigger it
+MOUSE_BINDINGS = {
+    "shoot": (1,),  # Left click
+}
+
+SELECT_ACTIONS = ("select_1", "select_2", "select_3")
+
+# One tick of input. `held` is the level state at sample time, `pressed` holds every
+# edge-triggered press since the previous sample (so quick taps are never lost).
+# `timestamp` is when the oldest of those presses was first seen (sample time if there were none).
+InputFrame = namedtuple("InputFrame", ["tick", "timestamp", "held", "pressed", "mouse_pos", "quit"])
+
+
+class LiveInputSource:
+    """Reads the keyboard and mouse through pygame, mapping raw keys to actions."""
+
+    def __init__(self, key_bindings=KEY_BINDINGS, mouse_bindings=MOUSE_BINDINGS):
+        self.key_bindings = key_bindings
+        self.mouse_bindings = mouse_bindings
+        self._key_to_action = {key: action for action, keys in key_bindings.items() for key in keys}
+        self._button_to_action = {button: action for action, buttons in mouse_bindings.items() for button in buttons}
+
+    def poll(self):
+        """Drains the event queue once and returns (held, pressed, mouse_pos, quit)."""
+        pressed = []
+        quit_requested = False
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_requested = True
+            elif event.type == pygame.KEYDOWN and event.key in self._key_to_action:
+                pressed.append(self._key_to_action[event.key])
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in self._button_to_action:
+                pressed.append(self._button_to_action[event.button])
+
+        keys = pygame.key.get_pressed()
+        buttons = pygame.mouse.get_pressed()
+        held = {action for action, bound in self.key_bindings.items() if any(keys[key] for key in bound)}
+        held.update(action for action, bound in self.mouse_bindings.items()
+                    if any(buttons[button - 1] for button in bound if button <= len(buttons)))
+
+        return frozenset(held), tuple(pressed), pygame.mouse.get_pos(), quit_requested
+
+
+class ScriptedInputSource:
+    """Replays a fixed list of (held, pressed, mouse_pos) steps, e.g. from a recording or a test script."""
+
+    def __init__(self, steps, loop=False):
+        self.steps = list(steps)
+        self.loop = loop
+        self.index = 0
+
+    def poll(self):
+        if self.index >= len(self.steps):
+            if not self.loop or not self.steps:
+                return frozenset(), (), (0, 0), False  # Script finished: idle input
+            self.index = 0
+
+        held, pressed, mouse_pos = self.steps[self.index]
+        self.index += 1
+        return frozenset(held), tuple(pressed), tuple(mouse_pos), False
+
+    @classmethod
+    def load(cls, path, loop=False):
+        """Loads a recording written by `RecordingInputSource.save`."""
+        with open(path, "r") as f:
+            return cls([json.loads(line) for line in f if line.strip()], loop)
+
+
+class RecordingInputSource:
+    """Wraps another source and records every polled step so it can be replayed later."""
+
+    def __init__(self, source):
+        self.source = source
+        self.steps = []
+
+    def poll(self):
+        held, pressed, mouse_pos, quit_requested = self.source.poll()
+        self.steps.append((sorted(held), list(pressed), list(mouse_pos)))
+        return held, pressed, mouse_pos, quit_requested
+
+    def save(self, path):
+        with open(path, "w") as f:
+            for step in self.steps:
+                f.write(json.dumps(step) + "\n")
+
+
+class InputSystem:
+    """Samples input once per tick into an immutable InputFrame and tracks input-to-simulation latency."""
+
+    def __init__(self, source=None, latency_window=120):
+        if source is None:
+            source = LiveInputSource()
+            if os.environ.get(RECORD_ENV):
+                source = RecordingInputSource(source)
+        self.source = source
+        self.tick = 0
+        self.frame = InputFrame(0, 0, frozenset(), (), (0, 0), False)
+        self._buffered = []  # Presses seen by `buffer()` between ticks
+        self._buffered_quit = False
+        self._pending_since = None  # When the oldest press not yet in a frame was first seen
+        self._latencies = []
+        self.latency_window = latency_window
+
+    def _stamp(self, pressed):
+        # pygame events carry no timestamp, so a press is stamped when a poll first drains it
+        if pressed and self._pending_since is None:
+            self._pending_since = pygame.time.get_ticks()
+
+    def buffer(self):
+        """Drains the queue between ticks without producing a frame. Presses (and their arrival time)
+        carry over to the next sample(), so time spent drawing and waiting on the frame cap counts as latency."""
+        held, pressed, mouse_pos, quit_requested = self.source.poll()
+        self._stamp(pressed)
+        self._buffered.extend(pressed)
+        self._buffered_quit = self._buffered_quit or quit_requested
+        return quit_requested
+
+    def sample(self):
+        """Produces this tick's InputFrame. Call exactly once per simulation tick."""
+        held, pressed, mouse_pos, quit_requested = self.source.poll()
+        self._stamp(pressed)
+        if self._buffered:
+            pressed = tuple(self._buffered) + pressed
+            self._buffered = []
+        quit_requested = quit_requested or self._buffered_quit
+        self._buffered_quit = False
+
+        now = pygame.time.get_ticks()
+        timestamp = self._pending_since if self._pending_since is not None else now
+        self._pending_since = None
+        self.tick += 1
+        self.frame = InputFrame(self.tick, timestamp, held, pressed, mouse_pos, quit_requested)
+        return self.frame
+
+    def mark_consumed(self, frame=None):
+        """Records how long the frame's oldest press waited before the simulation step finished with it.
+        Frames without presses are skipped so idle ticks don't dilute the numbers."""
+        frame = frame if frame is not None else self.frame
+        if not frame.pressed:
+            return
+        self._latencies.append(pygame.time.get_ticks() - frame.timestamp)
+        if len(self._latencies) > self.latency_window:
+            del self._latencies[0]
+
+    def latency_stats(self):
+        """Returns (average, worst) input-to-simulation latency in ms over the recent window."""
+        if not self._latencies:
+            return 0.0, 0
+        return sum(self._latencies) / len(self._latencies), max(self._latencies)
+
+    def stop(self):
+        """Writes the input recording (if LAST_STAND_RECORD is set)."""
+        if isinstance(self.source, RecordingInputSource):
+            path = os.environ[RECORD_ENV]
+            self.source.save(path)
+            print(f"🎮 Recorded {len(self.source.steps)} input steps to {path}")
+            self.source = self.source.source  # Saved once; later stop() calls are no-ops
+
+
+def is_active(frame, action):
+    """True if the action is held or was pressed at any point since the last tick."""
+    return action in frame.held or action in frame.pressed
+
+
+def selected_index(frame):
+    """Returns the 0-based index of the first select_N action pressed this tick, or None."""
+    for action in frame.pressed:
+        if action in SELECT_ACTIONS:
+            return SELECT_ACTIONS.index(action)
+    return None
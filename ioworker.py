@@ -0,0 +1,115 @@
+import atexit
+import os
+import queue
+import threading
+from collections import deque
+
+IO_QUEUE_SIZE = 64  # Pending jobs before submit() applies backpressure (or drops, for droppable jobs)
+
+
+def write_file(path, data, mode="w", sync=True):
+    """Writes `data` to `path` (atomically for full rewrites) and optionally fsyncs. Runs on the I/O thread."""
+    if "a" in mode:
+        with open(path, mode) as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        return path
+
+    temp_path = path + ".tmp"
+    with open(temp_path, mode) as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)  # ✅ Readers never see a half-written file
+    return path
+
+
+class IOWorker:
+    """One background thread that runs every disk write (leaderboard, reports, profiles) off the game loop.
+    Completion callbacks are handed back to the main thread through poll()."""
+
+    def __init__(self, maxsize=IO_QUEUE_SIZE):
+        self.jobs = queue.Queue(maxsize)
+        self.completed = deque()  # (callback, result, error) waiting for poll()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0  # Droppable jobs refused because the queue was full
+        self.failed = 0
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="io-worker", daemon=True)
+                self.thread.start()
+
+    def submit(self, fn, *args, callback=None, droppable=False, **kwargs):
+        """Queues fn(*args, **kwargs). `callback(result, error)` runs on the next poll().
+        Droppable jobs (telemetry) are discarded when the queue is full; others wait for space.
+        Returns False if the job was dropped."""
+        self._ensure_started()
+        job = (fn, args, kwargs, callback)
+        if droppable:
+            try:
+                self.jobs.put_nowait(job)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self.jobs.put(job)
+        self.submitted += 1
+        return True
+
+    def write(self, path, data, mode="w", sync=True, callback=None, droppable=False):
+        """Shortcut for queueing a write_file job."""
+        return self.submit(write_file, path, data, mode, sync, callback=callback, droppable=droppable)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            fn, args, kwargs, callback = job
+            result, error = None, None
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:  # Keep the worker alive; report through the callback
+                error = e
+                self.failed += 1
+                if callback is None:
+                    print(f"💾 Background write failed: {e!r}")
+            if callback is not None:
+                self.completed.append((callback, result, error))
+            self.jobs.task_done()
+
+    def poll(self):
+        """Runs finished jobs' callbacks. Call once per frame from the main thread."""
+        while self.completed:
+            callback, result, error = self.completed.popleft()
+            callback(result, error)
+
+    def pending(self):
+        return self.jobs.unfinished_tasks
+
+    def flush(self):
+        """Blocks until every queued job has finished, then runs their callbacks."""
+        if self.thread is not None:
+            self.jobs.join()
+        self.poll()
+
+    def shutdown(self):
+        """Flushes and stops the thread (registered with atexit, so sys.exit() never loses a save)."""
+        if self.thread is None:
+            return
+        self.flush()
+        self.jobs.put(None)
+        self.thread.join()
+        self.thread = None
+
+
+IO_WORKER = IOWorker()
+atexit.register(IO_WORKER.shutdown)
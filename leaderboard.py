@@ -1,4 +1,5 @@
 import os
+from ioworker import IO_WORKER
 
 LEADERBOARD_FILE = "leaderboard.txt"
 
@@ -8,8 +9,15 @@ if not os.path.exists(LEADERBOARD_FILE):
         f.write("Isaac,4,2300\nKippyD,9,14000\nTaban,6,6950\n")
 
 
+_scores = None  # In-memory copy; saves update it at once and hit the disk in the background
+
+
 def load_leaderboard():
     """Loads leaderboard and returns sorted list of top scores."""
+    global _scores
+    if _scores is not None:
+        return list(_scores)
+
     scores = []
     with open(LEADERBOARD_FILE, "r") as f:
         for line in f.readlines():
@@ -23,16 +31,22 @@ def load_leaderboard():
                 except ValueError:
                     print(f"Skipping malformed entry: {line.strip()}")  # Debugging message
 
-    return sorted(scores, key=lambda x: x[2], reverse=True)
+    _scores = sorted(scores, key=lambda x: x[2], reverse=True)
+    return list(_scores)
+
+
+def _on_saved(path, error):
+    if error is not None:
+        print(f"⚠️ Leaderboard save failed: {error!r}")
 
 
 def save_leaderboard(name, score, waves):
-    """Saves a new player score, sorts the leaderboard, and keeps the top 10 scores."""
+    """Saves a new player score, sorts the leaderboard, and keeps the top 10 scores.
+    The new list is visible immediately; the file rewrite runs on the I/O worker."""
+    global _scores
     scores = load_leaderboard()
     scores.append((name.strip(), int(waves), int(score)))  # Changed 'time' to 'waves'
-    scores = sorted(scores, key=lambda x: x[2], reverse=True)[:10]  # Sort by highest score
-
-    with open(LEADERBOARD_FILE, "w") as f:
-        for entry in scores:
-            f.write(f"{entry[0]},{entry[1]},{entry[2]}\n")  # Keep saving format consistent
+    _scores = sorted(scores, key=lambda x: x[2], reverse=True)[:10]  # Sort by highest score
 
+    data = "".join(f"{entry[0]},{entry[1]},{entry[2]}\n" for entry in _scores)  # Keep saving format consistent
+    IO_WORKER.write(LEADERBOARD_FILE, data, callback=_on_saved)
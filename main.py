@@ -3,21 +3,30 @@ import pygame
 # Initialize Pygame
 pygame.init()
 
+import os
 import sys
-from game import Game
-from leaderboard import load_leaderboard, save_leaderboard
+from display import WINDOW_ENV, RENDER_SCALE_ENV, window_size
+
+# 🖥️ --window=WxH (or 720p / 1080p / 1440p / 4k) has to be known before game.py sizes its HUD at import
+for arg in sys.argv[1:]:
+    if arg.startswith("--window="):
+        os.environ[WINDOW_ENV] = arg.split("=", 1)[1]
+
+from game import Game, GAME_TEXTURES  # noqa: E402
+from leaderboard import load_leaderboard, save_leaderboard  # noqa: E402
+from assets import ASSETS  # noqa: E402
+from ioworker import IO_WORKER  # noqa: E402
+from profiling import PROFILE_ENV, PROFILE_INTERVAL_ENV  # noqa: E402
+from capture import CAPTURE_ENV  # noqa: E402
+from inputs import RECORD_ENV  # noqa: E402
 
 # Constants
-WIDTH, HEIGHT = 1024, 768
+WIDTH, HEIGHT = window_size()
 WHITE = (255, 255, 255)
 FONT = pygame.font.Font(None, 36)
 
-# Menu background texture
-MENU_BACKGROUND = pygame.image.load("textures/Menu.webp")  # Update path if needed
-MENU_BACKGROUND = pygame.transform.scale(MENU_BACKGROUND, (WIDTH, HEIGHT))  # Resize to fit screen
-# Leaderboard background texture
-LEADERBOARD_BACKGROUND = pygame.image.load("textures/leaderboard_background.webp")  # Update path if needed
-LEADERBOARD_BACKGROUND = pygame.transform.scale(LEADERBOARD_BACKGROUND, (WIDTH, HEIGHT))  # Resize to fit screen
+# Menu textures, resized to fit screen (loaded lazily through the asset manager)
+MENU_TEXTURES = [("menu_background", (WIDTH, HEIGHT)), ("leaderboard_background", (WIDTH, HEIGHT))]
 
 
 # Set up screen (GLOBAL)
@@ -27,13 +36,14 @@ pygame.display.set_caption("Last Stand")
 def main_menu():
     while True:
         # 🖼️ **Apply the menu background**
-        screen.blit(MENU_BACKGROUND, (0, 0))
+        screen.blit(ASSETS.get("menu_background", (WIDTH, HEIGHT)), (0, 0))
 
         # 🖲️ **Draw buttons with rounded corners & outline**
         draw_button("Start Game", WIDTH // 2 - 100, 300, 200, 50, lambda: Game().run())
         draw_button("Leaderboard", WIDTH // 2 - 100, 400, 200, 50, show_leaderboard)
 
         pygame.display.flip()
+        IO_WORKER.poll()
 
         # Handle quit event
         for event in pygame.event.get():
@@ -47,7 +57,7 @@ def show_leaderboard():
     scores = load_leaderboard()
     while True:
         # 🖼️ **Apply the leaderboard background**
-        screen.blit(LEADERBOARD_BACKGROUND, (0, 0))
+        screen.blit(ASSETS.get("leaderboard_background", (WIDTH, HEIGHT)), (0, 0))
 
         y_offset = 150
         backdrop_color = (20, 20, 20, 180)  # Semi-transparent dark gray
@@ -123,4 +133,21 @@ def draw_button(text, x, y, width, height, action=None):
 
 
 if __name__ == "__main__":
+    # 📈 --profile (or --profile=sample) profiles every run; --profile-interval=SECONDS adds timed dumps
+    # 🎥 --capture (or --capture=png) records every run to captures/
+    # 🖥️ --render-scale=auto|1|0.75|0.5 sets the world resolution (auto adapts to frame time; HUD stays native)
+    # 🎮 --record=PATH saves the run's input as JSON lines (replay with ScriptedInputSource.load)
+    for arg in sys.argv[1:]:
+        if arg.startswith("--profile-interval="):
+            os.environ[PROFILE_INTERVAL_ENV] = arg.split("=", 1)[1]
+        elif arg == "--profile" or arg.startswith("--profile="):
+            os.environ[PROFILE_ENV] = arg.split("=", 1)[1] if "=" in arg else "1"
+        elif arg == "--capture" or arg.startswith("--capture="):
+            os.environ[CAPTURE_ENV] = arg.split("=", 1)[1] if "=" in arg else "raw"
+        elif arg.startswith("--render-scale="):
+            os.environ[RENDER_SCALE_ENV] = arg.split("=", 1)[1]
+        elif arg.startswith("--record="):
+            os.environ[RECORD_ENV] = arg.split("=", 1)[1]
+
+    ASSETS.show_loading_screen(screen, FONT, MENU_TEXTURES + GAME_TEXTURES)
     main_menu()
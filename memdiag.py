@@ -0,0 +1,125 @@
+import gc
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from ioworker import IO_WORKER
+from gameclock import GAME_CLOCK
+
+MEMDIAG_ENV = "LAST_STAND_MEMDIAG"  # Set to 1 to enable memory diagnostics
+REPORT_FILE = "memory_report.txt"
+LEAK_WINDOW = 4  # Waves of strictly increasing size before a gauge is flagged
+TOP_ALLOCATIONS = 10
+TOP_TYPES = 15
+
+
+def memory_diagnostics_enabled():
+    return os.environ.get(MEMDIAG_ENV, "") not in ("", "0")
+
+
+def current_rss_kb():
+    """Resident set size in KB, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def stack_depth():
+    """Number of Python frames below the caller (catches menu <-> game recursion)."""
+    depth = 0
+    frame = sys._getframe(1)
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def gauge_game(game):
+    """Sizes of every container that can grow during a run."""
+    swarm_groups = {id(enemy.swarm_group): enemy.swarm_group
+                    for enemy in game.enemies if hasattr(enemy, "swarm_group")}
+    gauges = {
+        "enemies": len(game.enemies),
+        "enemy_projectiles": len(game.enemy_bullets),
+        "player_bullets": len(game.player.bullets),
+        "pending_timers": len(GAME_CLOCK.timers),
+        "sight_cache": len(game.world.sight),
+        "currency_drops": len(game.currency_drops),
+        "particles": len(game.particles),
+        "swarm_members": sum(len(group) for group in swarm_groups.values()),
+        "swarm_dead_members": sum(1 for group in swarm_groups.values()
+                                  for member in group if member not in game.enemies),
+        "stack_depth": stack_depth(),
+    }
+    for archetype, table in game.enemies.tables.items():
+        gauges[f"table:{archetype.__name__}"] = len(table)
+    return gauges
+
+
+class MemoryDiagnostics:
+    """Per-wave tracemalloc snapshots, container gauges and object counts, with monotonic-growth leak flags."""
+
+    def __init__(self, report_path=REPORT_FILE, leak_window=LEAK_WINDOW):
+        self.report_path = report_path
+        self.leak_window = leak_window
+        self.history = {}  # Gauge name -> list of per-wave values
+        self.previous_snapshot = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def _record(self, name, value):
+        self.history.setdefault(name, []).append(value)
+
+    def suspected_leaks(self):
+        """Gauges that grew on every one of the last `leak_window` waves."""
+        leaks = []
+        for name, values in self.history.items():
+            recent = values[-(self.leak_window + 1):]
+            if len(recent) > self.leak_window and all(b > a for a, b in zip(recent, recent[1:])):
+                leaks.append((name, recent[0], recent[-1]))
+        return leaks
+
+    def on_wave(self, game):
+        """Takes a snapshot at the start of a wave and appends a report section."""
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        traced, peak = tracemalloc.get_traced_memory()
+
+        gauges = gauge_game(game)
+        type_counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+        rss = current_rss_kb()
+
+        for name, value in gauges.items():
+            self._record(name, value)
+        for name, count in type_counts.most_common(TOP_TYPES):
+            self._record(f"objects:{name}", count)
+        self._record("traced_kb", traced // 1024)
+        if rss is not None:
+            self._record("rss_kb", rss)
+
+        lines = [f"=== Wave {game.wave} ===",
+                 f"RSS: {rss if rss is not None else 'n/a'} KB | traced: {traced // 1024} KB (peak {peak // 1024} KB)"]
+        lines.append("Containers: " + ", ".join(f"{name}={value}" for name, value in gauges.items()))
+        lines.append("Objects: " + ", ".join(f"{name}={count}" for name, count in type_counts.most_common(TOP_TYPES)))
+
+        if self.previous_snapshot is not None:
+            lines.append("Top allocation growth since last wave:")
+            for stat in snapshot.compare_to(self.previous_snapshot, "lineno")[:TOP_ALLOCATIONS]:
+                lines.append(f"  {stat}")
+        self.previous_snapshot = snapshot
+
+        leaks = self.suspected_leaks()
+        for name, start, end in leaks:
+            lines.append(f"⚠️ Suspected leak: {name} grew every wave for {self.leak_window} waves ({start} -> {end})")
+
+        IO_WORKER.write(self.report_path, "\n".join(lines) + "\n\n", mode="a", sync=False, droppable=True)
+
+        if leaks:
+            print(f"🧠 Memory: {len(leaks)} suspected leak(s), see {self.report_path}")
+        return leaks
@@ -0,0 +1,347 @@
+import contextlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+import pygame
+
+# Micro-benchmarks never open a window; fixtures are seeded so every run measures the same work
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("LAST_STAND_RNG_SEED", "1")  # Gameplay streams and the town layout
+pygame.init()
+
+from game import Game, FONT, draw_text_with_border  # noqa: E402  (game.py needs pygame initialised at import)
+from gameclock import GAME_CLOCK  # noqa: E402
+from inputs import ScriptedInputSource  # noqa: E402
+from ioworker import IO_WORKER  # noqa: E402
+from obstacle import Obstacle  # noqa: E402
+from enemy import Enemy, FastEnemy, TankEnemy, DasherEnemy, ShooterEnemy, EliteShooter, SwarmEnemy  # noqa: E402
+from bossenemy import BossEnemy  # noqa: E402
+from swordattack import SwordAttack  # noqa: E402
+from shooterbullet import EnemyProjectilePool  # noqa: E402
+from world import MAP_WIDTH, MAP_HEIGHT  # noqa: E402
+
+BASELINE_FILE = "microbench_baseline.json"
+WARMUP_REPEATS = 2  # Untimed repeats first (caches, lazy rects, baked chunks)
+REPEATS = 9  # Timed repeats; the median is reported, the best is kept alongside
+REGRESSION_THRESHOLD = 0.10  # Median this much slower than the baseline is flagged
+FIXTURE_SEED = 7  # Synthetic layouts (rect/circle probes, enemy rings)
+ENEMY_RING = 200  # Enemies per archetype in the Enemy.update fixtures
+SWARM_SIZES = (5, 20, 50)
+BULLET_ENEMY_COUNTS = (0, 100, 1000)
+BULLET_COUNT = 100
+TEXT_SAMPLES = ("Wave: 12", "Score: 123456", "Health: 3", "LEVEL UP! Choose an Upgrade:")
+
+BENCHMARKS = []  # (name, ops per call, calls per repeat, setup) in registration order
+
+
+def benchmark(name, ops=1, number=10):
+    """Registers `setup(game) -> fn`. setup runs untimed before every repeat; fn is then called `number`
+    times under the timer. `ops` is how many items one call handles, so results read as time per item."""
+    def register(setup):
+        BENCHMARKS.append((name, ops, number, setup))
+        return setup
+    return register
+
+
+# ---------- fixtures ----------
+
+_GAME = None
+
+
+def fixture_game():
+    """One headless, seeded Game shared by every benchmark; each setup clears what it touches."""
+    global _GAME
+    if _GAME is None:
+        GAME_CLOCK.set_virtual(True)  # Nothing advances game time behind a benchmark's back
+        _GAME = Game(ScriptedInputSource([((), (), (512, 384))], loop=True))
+    game = _GAME
+    GAME_CLOCK.reset()
+    game.enemies.clear()
+    game.enemy_grid.mark_dirty()
+    game.enemy_bullets = EnemyProjectilePool(MAP_WIDTH, MAP_HEIGHT)
+    game.player.bullets.count = 0
+    game.particles.clear()
+    game.currency_drops.clear()
+    return game
+
+
+def ring(count, radius, center, seed=FIXTURE_SEED):
+    """`count` (x, y) top-lefts jittered around a circle, the same every run."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * math.pi, count, endpoint=False) + rng.uniform(-0.05, 0.05, count)
+    radii = radius * rng.uniform(0.8, 1.2, count)
+    return [(center[0] + r * math.cos(a), center[1] + r * math.sin(a)) for a, r in zip(angles, radii)]
+
+
+def probe_rects(obstacle, count=1000, seed=FIXTURE_SEED):
+    """Enemy-sized rects scattered around `obstacle`, roughly half of them touching it."""
+    rng = np.random.default_rng(seed)
+    center_x, center_y = obstacle.rect.center
+    spread = obstacle.rect.width
+    return [pygame.Rect(int(center_x + dx), int(center_y + dy), 40, 40)
+            for dx, dy in rng.uniform(-spread, spread, (count, 2))]
+
+
+def spawn_ring(game, archetype, count, radius=600, health=None):
+    """Adds `count` enemies of `archetype` on a ring around the player."""
+    enemies = []
+    for x, y in ring(count, radius, game.player.rect.center):
+        enemy = archetype(x, y, 3) if archetype is Enemy else archetype(x, y)
+        if health is not None:
+            enemy.health = enemy.max_health = health  # Fixtures that get hit must not die mid-benchmark
+        game.enemies.append(enemy)
+        enemies.append(enemy)
+    return enemies
+
+
+# ---------- benchmarks ----------
+
+def _collides_setup(shape):
+    def setup(game):
+        obstacle = Obstacle(shape, 1000, 1000, 120, 80 if shape == "rectangle" else None)
+        rects = probe_rects(obstacle)
+
+        def run():
+            for rect in rects:
+                obstacle.collides(rect)
+        return run
+    return setup
+
+
+benchmark("Obstacle.collides[rect]", ops=1000)(_collides_setup("rectangle"))
+benchmark("Obstacle.collides[circle]", ops=1000)(_collides_setup("circle"))
+
+
+def _enemy_update_setup(archetype, count):
+    def setup(game):
+        enemies = spawn_ring(game, archetype, count)
+        player, world = game.player, game.world
+
+        def run():
+            for enemy in enemies:
+                enemy.update(player, world, game)
+        return run
+    return setup
+
+
+for _archetype in (Enemy, FastEnemy, TankEnemy, DasherEnemy, ShooterEnemy, EliteShooter):
+    benchmark(f"Enemy.update[{_archetype.__name__}]", ops=ENEMY_RING)(_enemy_update_setup(_archetype, ENEMY_RING))
+benchmark("Enemy.update[BossEnemy]", ops=1, number=200)(_enemy_update_setup(BossEnemy, 1))
+
+
+def _swarm_update_setup(size):
+    def setup(game):
+        group = []
+        for x, y in ring(size, 600, game.player.rect.center):
+            member = SwarmEnemy(x, y, group)
+            group.append(member)
+            game.enemies.append(member)
+        player, world = game.player, game.world
+
+        def run():
+            for member in group:
+                member.update(player, world, game)
+        return run
+    return setup
+
+
+for _size in SWARM_SIZES:
+    benchmark(f"SwarmEnemy.update[{_size}]", ops=_size)(_swarm_update_setup(_size))
+
+
+def _bullet_update_setup(enemy_count):
+    def setup(game):
+        spawn_ring(game, TankEnemy, enemy_count, radius=300, health=10 ** 9)
+        pool = game.player.bullets
+        pool.count = 0
+        center_x, center_y = game.player.rect.center
+        for i in range(BULLET_COUNT):
+            pool.spawn(center_x, center_y, 2 * math.pi * i / BULLET_COUNT, pierce=10 ** 6)
+
+        def run():
+            pool.update(game)
+        return run
+    return setup
+
+
+for _count in BULLET_ENEMY_COUNTS:
+    benchmark(f"BulletPool.update[{_count} enemies]", ops=BULLET_COUNT, number=5)(_bullet_update_setup(_count))
+
+
+@benchmark("draw_text_with_border", ops=len(TEXT_SAMPLES), number=50)
+def _text_setup(game):
+    surface = pygame.Surface(game.screen.get_size())
+
+    def run():
+        for i, text in enumerate(TEXT_SAMPLES):
+            draw_text_with_border(surface, text, 10, 10 + i * 40, FONT)
+    return run
+
+
+@benchmark("Game.draw_background", number=20)
+def _background_setup(game):
+    # A short camera pan, so chunk lookups and edge blits vary like they do in play
+    start_x, start_y = game.camera_x, game.camera_y
+    pan = [(start_x + step * 37, start_y + step * 23) for step in range(20)]
+    cursor = [0]
+
+    def run():
+        game.camera_x, game.camera_y = pan[cursor[0] % len(pan)]
+        cursor[0] += 1
+        game.draw_background()
+    return run
+
+
+@benchmark("ParticleSystem.update+draw[40 blasts, 100 deaths]", number=20)
+def _particles_setup(game):
+    particles = game.particles
+    center_x, center_y = game.player.rect.center
+    for x, y in ring(40, 250, (center_x, center_y)):
+        particles.explosion((x, y), 50)
+    for x, y in ring(100, 350, (center_x, center_y), seed=FIXTURE_SEED + 1):
+        particles.death(pygame.Rect(int(x), int(y), 40, 40))
+    surface = pygame.Surface(game.screen.get_size())
+    camera_x, camera_y = center_x - surface.get_width() // 2, center_y - surface.get_height() // 2
+
+    def run():
+        particles.update()
+        particles.draw(surface, camera_x, camera_y)
+    return run
+
+
+def _sight_setup(cached):
+    def setup(game):
+        sight = game.world.sight
+        # Shooter-to-player rays around the player: attack range and beyond, in every direction
+        center = game.player.rect.center
+        rays = [(x, y, center[0], center[1]) for x, y in ring(1000, 300, center)]
+        sight.cache.clear()
+        if cached:
+            for ray in rays:
+                sight.clear(*ray)
+
+        def run():
+            if not cached:
+                sight.cache.clear()
+            for ray in rays:
+                sight.clear(*ray)
+        return run
+    return setup
+
+
+benchmark("LineOfSight.clear[traced]", ops=1000)(_sight_setup(False))
+benchmark("LineOfSight.clear[cached]", ops=1000)(_sight_setup(True))
+
+
+@benchmark("SwordAttack.execute_attack", number=50)
+def _sword_setup(game):
+    spawn_ring(game, Enemy, 150, radius=120, health=10 ** 9)
+    game.enemy_grid.mark_dirty()
+    sword = SwordAttack(game.player)
+    sword.previous_angle = 0.0
+    sword.sword_angle = 0.6  # A mid-swing tick: sweeps ~35 degrees
+    sword.sword_cos, sword.sword_sin = math.cos(sword.sword_angle), math.sin(sword.sword_angle)
+
+    def run():
+        sword.hit_this_swing.clear()  # Every call hits like the first tick of a swing
+        sword.execute_attack(game)
+    return run
+
+
+# ---------- runner ----------
+
+def measure(game, ops, number, setup, repeats=REPEATS, warmup=WARMUP_REPEATS):
+    """Seconds per op for each timed repeat."""
+    timings = []
+    for repeat in range(warmup + repeats):
+        fn = setup(fixture_game())
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if repeat >= warmup:
+            timings.append(elapsed / (number * ops))
+    return timings
+
+
+def run_benchmarks(selected=None, repeats=REPEATS):
+    """Runs every registered benchmark (or those whose name contains one of `selected`)."""
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # Game code prints on hits and kills
+        game = fixture_game()
+        for name, ops, number, setup in BENCHMARKS:
+            if selected and not any(part in name for part in selected):
+                continue
+            timings = measure(game, ops, number, setup, repeats)
+            results[name] = {"median": statistics.median(timings), "best": min(timings),
+                             "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0, "ops": ops}
+            print(name, file=sys.stderr)  # Progress, outside the silenced stdout
+    return results
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.2f} µs"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def report(results, baseline=None, threshold=REGRESSION_THRESHOLD):
+    """Prints one line per benchmark, with the change against the baseline where it has one."""
+    baseline_results = (baseline or {}).get("results", {})
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'median/op':>11}  {'best/op':>11}  {'baseline':>11}  change")
+    for name, result in results.items():
+        line = f"{name:<{width}}  {format_time(result['median']):>11}  {format_time(result['best']):>11}"
+        previous = baseline_results.get(name)
+        if previous:
+            change = result["median"] / previous["median"] - 1
+            marker = "⚠️ slower" if change > threshold else "✅ faster" if change < -threshold else ""
+            line += f"  {format_time(previous['median']):>11}  {change:+.1%} {marker}"
+        print(line.rstrip())
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    data = {"python": platform.python_version(), "pygame": pygame.version.ver, "numpy": np.__version__,
+            "machine": platform.machine(), "saved": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}
+    IO_WORKER.write(path, json.dumps(data, indent=2))  # sync: written before we exit
+    print(f"💾 Baseline saved to {path}")
+
+
+if __name__ == "__main__":
+    # python microbench.py [name filters...] [--repeat=N] [--baseline=PATH] [--save] [--list]
+    baseline_path = BASELINE_FILE
+    repeats = REPEATS
+    save = False
+    selected = []
+    for arg in sys.argv[1:]:
+        if arg == "--list":
+            print("\n".join(name for name, _, _, _ in BENCHMARKS))
+            sys.exit()
+        elif arg == "--save":
+            save = True
+        elif arg.startswith("--baseline="):
+            baseline_path = arg.split("=", 1)[1]
+        elif arg.startswith("--repeat="):
+            repeats = max(2, int(arg.split("=", 1)[1]))
+        else:
+            selected.append(arg)
+
+    results = run_benchmarks(selected, repeats)
+    report(results, load_baseline(baseline_path))
+    if save:
+        save_baseline(baseline_path, results)
+    IO_WORKER.shutdown()
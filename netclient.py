@@ -0,0 +1,131 @@
+import random
+import socket
+import time
+from collections import OrderedDict
+import numpy as np
+from netprotocol import (DEFAULT_PORT, MAX_PACKET, MSG_WELCOME, MSG_SNAPSHOT, MSG_HELLO, MSG_BYE, HELLO, BYE,
+                         INPUT, WELCOME, SNAPSHOT_UPGRADE_PAUSE, POSITION_QUANTUM, MSG_INPUT, action_mask,
+                         decode_snapshot)
+
+BASELINE_HISTORY = 64  # Reconstructed states kept as possible delta baselines
+MOVES = (("move_up",), ("move_down",), ("move_left",), ("move_right",), ("move_up", "move_right"),
+         ("move_down", "move_left"), ())
+
+
+class StandInClient:
+    """A scripted stand-in for a real player: sends random inputs at 60 Hz, acks every snapshot and
+    rebuilds the entity state from the deltas. Used to load-test netserver.py."""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, seed=None, view_offset=(0, 0)):
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.settimeout(0.5)
+        self.rng = random.Random(seed)
+        self.view_offset = view_offset  # Observers look at a spot offset from the player
+        self.client_id = None
+        self.controller = False
+        self.running = True
+
+        self.input_tick = 0
+        self.recent_pressed = [0, 0, 0]  # Pressed masks for this tick and the two before
+        self.held = ()
+        self.baselines = OrderedDict()  # Snapshot id -> reconstructed state
+        self.latest_id = 0
+        self.state = None
+        self.player = None
+        self.projectiles = None
+        self.flags = 0
+        self.snapshots = 0
+        self.bytes_received = 0
+        self.missing_baseline = 0
+
+    def connect(self, attempts=20):
+        for _ in range(attempts):
+            self.sock.sendto(HELLO.pack(MSG_HELLO), self.address)
+            try:
+                data, _ = self.sock.recvfrom(MAX_PACKET + 1024)
+            except socket.timeout:
+                continue
+            if data and data[0] == MSG_WELCOME:
+                _, self.client_id, controller, _, _ = WELCOME.unpack(data)
+                self.controller = bool(controller)
+                self.sock.setblocking(False)
+                return True
+        return False
+
+    def _script_input(self):
+        """Random walk with occasional shots, abilities and upgrade picks."""
+        if self.input_tick % 30 == 0:
+            self.held = self.rng.choice(MOVES)
+        pressed = []
+        if self.rng.random() < 0.2:
+            pressed.append("shoot")
+        if self.rng.random() < 0.01:
+            pressed.append(self.rng.choice(("explosive_shot", "sword_attack", "dash")))
+        if self.flags & SNAPSHOT_UPGRADE_PAUSE and self.rng.random() < 0.05:
+            pressed.append(self.rng.choice(("select_1", "select_2", "select_3")))
+        return pressed
+
+    def send_input(self):
+        self.input_tick += 1
+        pressed = self._script_input()
+        self.recent_pressed = [action_mask(pressed)] + self.recent_pressed[:2]
+        view_x, view_y = 0, 0
+        if self.player is not None:
+            view_x, view_y = self.player[0] + self.view_offset[0], self.player[1] + self.view_offset[1]
+        mouse = (self.rng.randint(0, 1023), self.rng.randint(0, 767))
+        self.sock.sendto(INPUT.pack(MSG_INPUT, self.input_tick, self.latest_id, action_mask(self.held),
+                                    *self.recent_pressed, *mouse, view_x, view_y), self.address)
+
+    def receive(self):
+        """Applies every queued snapshot (out-of-order ones older than the latest are ignored)."""
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(MAX_PACKET + 1024)
+            except (BlockingIOError, socket.timeout):
+                return
+            except OSError:
+                return  # Server gone
+            if not data or data[0] != MSG_SNAPSHOT:
+                continue
+            self.bytes_received += len(data)
+            decoded = decode_snapshot(data, self.baselines)
+            if decoded is None:
+                self.missing_baseline += 1
+                continue
+            snapshot_id, _, self.flags, player, state, self.projectiles = decoded
+            self.baselines[snapshot_id] = state
+            while len(self.baselines) > BASELINE_HISTORY:
+                self.baselines.popitem(last=False)
+            if snapshot_id > self.latest_id:
+                self.latest_id = snapshot_id
+                self.state = state
+                self.player = player
+            self.snapshots += 1
+
+    def entity_positions(self):
+        """World-space (x, y) of every reconstructed entity."""
+        if self.state is None:
+            return np.zeros((0, 2))
+        return np.stack((self.state["x"], self.state["y"]), axis=1) * POSITION_QUANTUM
+
+    def run(self, duration, input_rate=60):
+        """Sends inputs and applies snapshots for `duration` seconds."""
+        period = 1 / input_rate
+        end = time.perf_counter() + duration
+        next_send = time.perf_counter()
+        while self.running and time.perf_counter() < end:
+            self.receive()
+            now = time.perf_counter()
+            if now >= next_send:
+                self.send_input()
+                next_send += period
+            time.sleep(max(0.0, min(next_send - time.perf_counter(), 0.002)))
+        self.close()
+
+    def close(self):
+        try:
+            self.sock.sendto(BYE.pack(MSG_BYE), self.address)
+        except OSError:
+            pass
+        self.sock.close()
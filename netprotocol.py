@@ -0,0 +1,139 @@
+import struct
+import numpy as np
+from inputs import KEY_BINDINGS, MOUSE_BINDINGS
+
+# Wire format shared by netserver.py and netclient.py. Little-endian, one UDP datagram per message.
+DEFAULT_PORT = 47474
+MAX_PACKET = 60000  # Stay under the 64 KB UDP datagram limit
+POSITION_QUANTUM = 2  # World pixels per quantized position unit
+
+MSG_HELLO = 1
+MSG_INPUT = 2
+MSG_BYE = 3
+MSG_WELCOME = 10
+MSG_SNAPSHOT = 11
+
+# Actions travel as bits: every key binding, then every mouse binding
+ACTIONS = tuple(KEY_BINDINGS) + tuple(action for action in MOUSE_BINDINGS if action not in KEY_BINDINGS)
+ACTION_BITS = {action: 1 << i for i, action in enumerate(ACTIONS)}
+
+# Archetype name -> kind byte (255 = unknown)
+ENTITY_KINDS = ("Enemy", "FastEnemy", "TankEnemy", "DasherEnemy", "ShooterEnemy", "EliteShooter",
+                "SwarmEnemy", "BossEnemy")
+KIND_INDEX = {name: i for i, name in enumerate(ENTITY_KINDS)}
+PROJECTILE_ENEMY_BULLET = 0
+PROJECTILE_MISSILE = 1
+PROJECTILE_PLAYER_BULLET = 2
+
+FLAG_DYING = 1  # Entity flag
+SNAPSHOT_CONTROLLER = 1  # Snapshot flags
+SNAPSHOT_UPGRADE_PAUSE = 2
+SNAPSHOT_NEW_ROUND = 4
+
+HELLO = struct.Struct("<B")
+BYE = struct.Struct("<B")
+# type, input tick, acked snapshot, held bits, pressed bits for this tick and the two before (redundancy
+# against packet loss), mouse x/y (screen), view center x/y (world, for the area of interest)
+INPUT = struct.Struct("<BIIIIIIhhii")
+WELCOME = struct.Struct("<BHBii")  # type, client id, is controller, map width, map height
+SNAPSHOT_HEADER = struct.Struct("<BIIIB")  # type, snapshot id, baseline id (0 = full), server tick, flags
+PLAYER_STATE = struct.Struct("<iihHIH")  # x, y, health, wave, score, level
+SECTION_COUNTS = struct.Struct("<HHHH")  # full records, delta records, removed ids, projectiles
+
+# Absolute entity record (new entities, or moves too big for a delta)
+ENTITY_DTYPE = np.dtype([("id", "<u4"), ("kind", "u1"), ("x", "<i4"), ("y", "<i4"), ("hp", "<i2"), ("flags", "u1")])
+# Small move against the baseline, in quanta
+DELTA_DTYPE = np.dtype([("id", "<u4"), ("dx", "i1"), ("dy", "i1"), ("hp", "<i2"), ("flags", "u1")])
+# Projectiles change every tick, so they are always sent whole, relative to the view center
+PROJECTILE_DTYPE = np.dtype([("kind", "u1"), ("x", "<i2"), ("y", "<i2")])
+
+EMPTY_STATE = np.zeros(0, dtype=ENTITY_DTYPE)
+
+
+def action_mask(actions):
+    mask = 0
+    for action in actions:
+        mask |= ACTION_BITS.get(action, 0)
+    return mask
+
+
+def mask_actions(mask):
+    return [action for action in ACTIONS if mask & ACTION_BITS[action]]
+
+
+def quantize(values):
+    return np.floor_divide(values, POSITION_QUANTUM).astype(np.int32)
+
+
+def encode_snapshot(snapshot_id, baseline_id, tick, flags, player, state, baseline, projectiles):
+    """Encodes `state` (ENTITY_DTYPE sorted by id) as a delta against `baseline` (or whole when None)."""
+    if baseline is None or len(baseline) == 0:
+        full, delta, removed = state, np.zeros(0, dtype=DELTA_DTYPE), np.zeros(0, dtype="<u4")
+        if baseline is None:
+            baseline_id = 0
+    else:
+        pos = np.minimum(np.searchsorted(baseline["id"], state["id"]), len(baseline) - 1)
+        old = baseline[pos]
+        existed = old["id"] == state["id"]
+        dx = state["x"] - old["x"]
+        dy = state["y"] - old["y"]
+        unchanged = (existed & (dx == 0) & (dy == 0) & (state["hp"] == old["hp"]) &
+                     (state["flags"] == old["flags"]))
+        small = existed & ~unchanged & (np.abs(dx) <= 127) & (np.abs(dy) <= 127) & (state["kind"] == old["kind"])
+        full = state[~unchanged & ~small]
+
+        delta = np.zeros(int(small.sum()), dtype=DELTA_DTYPE)
+        delta["id"] = state["id"][small]
+        delta["dx"] = dx[small]
+        delta["dy"] = dy[small]
+        delta["hp"] = state["hp"][small]
+        delta["flags"] = state["flags"][small]
+        removed = baseline["id"][~np.isin(baseline["id"], state["id"], assume_unique=True)].astype("<u4")
+
+    return b"".join((
+        SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, snapshot_id, baseline_id, tick, flags),
+        PLAYER_STATE.pack(*player),
+        SECTION_COUNTS.pack(len(full), len(delta), len(removed), len(projectiles)),
+        full.astype(ENTITY_DTYPE, copy=False).tobytes(),
+        delta.tobytes(),
+        removed.tobytes(),
+        projectiles.tobytes(),
+    ))
+
+
+def decode_snapshot(data, baselines):
+    """Decodes a snapshot and rebuilds the full entity state from `baselines` (snapshot id -> state).
+    Returns (snapshot_id, tick, flags, player, state, projectiles), or None if the baseline is gone."""
+    _, snapshot_id, baseline_id, tick, flags = SNAPSHOT_HEADER.unpack_from(data, 0)
+    offset = SNAPSHOT_HEADER.size
+    player = PLAYER_STATE.unpack_from(data, offset)
+    offset += PLAYER_STATE.size
+    n_full, n_delta, n_removed, n_projectiles = SECTION_COUNTS.unpack_from(data, offset)
+    offset += SECTION_COUNTS.size
+
+    full = np.frombuffer(data, ENTITY_DTYPE, n_full, offset)
+    offset += full.nbytes
+    delta = np.frombuffer(data, DELTA_DTYPE, n_delta, offset)
+    offset += delta.nbytes
+    removed = np.frombuffer(data, "<u4", n_removed, offset)
+    offset += removed.nbytes
+    projectiles = np.frombuffer(data, PROJECTILE_DTYPE, n_projectiles, offset)
+
+    if baseline_id == 0:
+        state = full.copy()
+    else:
+        baseline = baselines.get(baseline_id)
+        if baseline is None:
+            return None  # Baseline already discarded; the server falls back to a full snapshot once acks stop
+        state = baseline[~np.isin(baseline["id"], removed)].copy()
+        if n_delta:
+            pos = np.searchsorted(state["id"], delta["id"])
+            state["x"][pos] += delta["dx"]
+            state["y"][pos] += delta["dy"]
+            state["hp"][pos] = delta["hp"]
+            state["flags"][pos] = delta["flags"]
+        if n_full:
+            state = np.concatenate((state[~np.isin(state["id"], full["id"])], full))
+            state.sort(order="id")
+
+    return snapshot_id, tick, flags, player, state, projectiles
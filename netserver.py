@@ -0,0 +1,383 @@
+import os
+import sys
+import socket
+import time
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+# The server never opens a window: the simulation runs headless on SDL's dummy driver
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame.init()
+
+from game import Game, WIDTH, HEIGHT  # noqa: E402  (game.py needs pygame initialised at import)
+from gameclock import GAME_CLOCK  # noqa: E402
+from world import MAP_WIDTH, MAP_HEIGHT  # noqa: E402
+from netprotocol import (DEFAULT_PORT, MAX_PACKET, MSG_HELLO, MSG_INPUT, MSG_BYE, MSG_WELCOME, INPUT, WELCOME,  # noqa: E402
+                         ENTITY_DTYPE, PROJECTILE_DTYPE, KIND_INDEX, FLAG_DYING, SNAPSHOT_CONTROLLER,
+                         SNAPSHOT_UPGRADE_PAUSE, SNAPSHOT_NEW_ROUND, PROJECTILE_ENEMY_BULLET, PROJECTILE_MISSILE,
+                         PROJECTILE_PLAYER_BULLET, POSITION_QUANTUM, EMPTY_STATE, mask_actions, quantize,
+                         encode_snapshot)
+
+TICK_RATE = 60
+SNAPSHOT_EVERY = 3  # Ticks between snapshots (20 Hz at 60 ticks/s)
+AOI_HALF_WIDTH = 700  # Area of interest around each client's view center (a screen plus margin)
+AOI_HALF_HEIGHT = 600
+SNAPSHOT_HISTORY = 64  # Sent states kept per client as delta baselines
+CLIENT_TIMEOUT = 5.0  # Seconds of silence before a client is dropped
+STATS_INTERVAL = 2.0  # Seconds between stat lines
+
+
+class NetworkInputSource:
+    """Input source for Game's InputSystem, fed by the controlling client's INPUT packets.
+    Each packet repeats the last three ticks of presses, so a lost packet doesn't lose a tap."""
+
+    def __init__(self):
+        self.held = frozenset()
+        self.pressed = []
+        self.mouse_pos = (WIDTH // 2, HEIGHT // 2)
+        self.last_input_tick = 0
+
+    def feed(self, input_tick, held_mask, pressed_masks, mouse_pos):
+        if input_tick <= self.last_input_tick:
+            return  # Duplicate or reordered packet
+        # pressed_masks[k] belongs to input_tick - k; replay only the ticks we haven't seen
+        for k in range(min(input_tick - self.last_input_tick, len(pressed_masks)) - 1, -1, -1):
+            self.pressed.extend(mask_actions(pressed_masks[k]))
+        self.last_input_tick = input_tick
+        self.held = frozenset(mask_actions(held_mask))
+        self.mouse_pos = mouse_pos
+
+    def poll(self):
+        pressed, self.pressed = tuple(self.pressed), []
+        return self.held, pressed, self.mouse_pos, False
+
+
+class ClientSession:
+    """Per-client connection state: address, view, acks and the snapshot history used for deltas."""
+
+    def __init__(self, client_id, address):
+        self.client_id = client_id
+        self.address = address
+        self.view = (MAP_WIDTH // 2, MAP_HEIGHT // 2)
+        self.last_heard = time.perf_counter()
+        self.next_snapshot_id = 1
+        self.acked = 0
+        self.history = OrderedDict()  # Snapshot id -> ENTITY_DTYPE state that was sent
+        self.new_round = False
+
+        # Stats since the last report
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.entities_sent = 0
+        self.full_snapshots = 0
+        self.truncated = 0
+
+    def baseline(self):
+        """The newest acked state still in the history, or (0, None) for a full snapshot."""
+        state = self.history.get(self.acked)
+        return (self.acked, state) if state is not None else (0, None)
+
+    def remember(self, snapshot_id, state):
+        self.history[snapshot_id] = state
+        while len(self.history) > SNAPSHOT_HISTORY:
+            self.history.popitem(last=False)
+
+    def reset_stats(self):
+        self.bytes_sent = self.snapshots_sent = self.entities_sent = self.full_snapshots = self.truncated = 0
+
+
+class GameServer:
+    """Authoritative headless server: runs one Game at a fixed tick rate and streams delta-compressed,
+    area-of-interest-filtered snapshots over UDP. The first client to join drives the player; everyone
+    else observes. The shop is not available over the network."""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, tick_rate=TICK_RATE):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.port = self.sock.getsockname()[1]
+        self.tick_rate = tick_rate
+        self.clients = OrderedDict()  # Address -> ClientSession, in join order (first = controller)
+        self.next_client_id = 1
+        self.next_net_id = 1
+        self.tick = 0
+        self.running = True
+
+        self.input_source = NetworkInputSource()
+        self.game = None
+        self.new_game()
+
+        self.sim_time = 0.0  # Stats since the last report
+        self.encode_time = 0.0
+        self.ticks_since_report = 0
+        self.last_report = time.perf_counter()
+
+    def new_game(self):
+        self.game = Game(self.input_source)
+        GAME_CLOCK.set_virtual(True, 1000 / self.tick_rate)  # One fixed step per server tick
+        for client in self.clients.values():
+            client.new_round = True
+        print(f"🛰️ New round (seed {self.game.town.seed})")
+
+    @property
+    def controller(self):
+        return next(iter(self.clients.values()), None)
+
+    # --- Network input ---------------------------------------------------------------------------
+
+    def receive(self):
+        """Drains every queued datagram."""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except BlockingIOError:
+                return
+            except ConnectionResetError:
+                continue  # Windows reports ICMP port-unreachable here; the timeout handles it
+            if not data:
+                continue
+            kind = data[0]
+            client = self.clients.get(address)
+            if kind == MSG_HELLO:
+                if client is None:
+                    client = self.clients[address] = ClientSession(self.next_client_id, address)
+                    self.next_client_id += 1
+                    print(f"🛰️ Client {client.client_id} joined from {address[0]}:{address[1]}"
+                          f"{' (controller)' if client is self.controller else ''}")
+                self.sock.sendto(WELCOME.pack(MSG_WELCOME, client.client_id, client is self.controller,
+                                              MAP_WIDTH, MAP_HEIGHT), address)
+            elif client is None:
+                continue
+            elif kind == MSG_INPUT and len(data) == INPUT.size:
+                (_, input_tick, ack, held, pressed_0, pressed_1, pressed_2,
+                 mouse_x, mouse_y, view_x, view_y) = INPUT.unpack(data)
+                client.last_heard = time.perf_counter()
+                if ack in client.history and ack > client.acked:
+                    client.acked = ack
+                if client is self.controller:
+                    self.input_source.feed(input_tick, held, (pressed_0, pressed_1, pressed_2), (mouse_x, mouse_y))
+                else:
+                    client.view = (view_x, view_y)
+            elif kind == MSG_BYE:
+                self.drop(client, "left")
+
+    def drop(self, client, reason):
+        was_controller = client is self.controller
+        del self.clients[client.address]
+        print(f"🛰️ Client {client.client_id} {reason}")
+        if was_controller:
+            self.input_source.__init__()  # Release any held keys
+            if self.controller is not None:
+                print(f"🛰️ Client {self.controller.client_id} now controls the player")
+
+    # --- Simulation ------------------------------------------------------------------------------
+
+    def step(self):
+        """One fixed simulation tick (the same systems as Game.run, minus drawing, the shop and game over)."""
+        game = self.game
+        GAME_CLOCK.tick()
+        game.camera_x = game.player.rect.centerx - WIDTH // 2
+        game.camera_y = game.player.rect.centery - HEIGHT // 2
+
+        if game.paused_for_upgrade:
+            game.handle_upgrade_input()  # Picks come in as select_1..3 from the controller
+        else:
+            frame = game.input.sample()
+            game.input_frame = frame
+            game.simulate(frame)
+            game.input.mark_consumed(frame)
+
+        if game.player.health <= 0:
+            print(f"💀 Player died on wave {game.wave} with {game.score} points")
+            self.new_game()
+
+    # --- Snapshots -------------------------------------------------------------------------------
+
+    def world_state(self):
+        """Every live enemy as an ENTITY_DTYPE array sorted by net id (built once per snapshot tick)."""
+        enemies = [enemy for enemy in self.game.enemies if enemy.rect is not None]
+        for enemy in enemies:
+            if enemy.net_id is None:
+                enemy.net_id = self.next_net_id
+                self.next_net_id += 1
+        count = len(enemies)
+        state = np.zeros(count, dtype=ENTITY_DTYPE)
+        if count:
+            state["id"] = np.fromiter((enemy.net_id for enemy in enemies), dtype=np.uint32, count=count)
+            state["kind"] = np.fromiter((KIND_INDEX.get(type(enemy).__name__, 255) for enemy in enemies),
+                                        dtype=np.uint8, count=count)
+            state["x"] = quantize(np.fromiter((enemy.rect.centerx for enemy in enemies), dtype=np.int64, count=count))
+            state["y"] = quantize(np.fromiter((enemy.rect.centery for enemy in enemies), dtype=np.int64, count=count))
+            state["hp"] = np.clip(np.fromiter((enemy.health for enemy in enemies), dtype=np.int64, count=count),
+                                  -32768, 32767)
+            state["flags"] = np.fromiter((FLAG_DYING if enemy.is_dying else 0 for enemy in enemies),
+                                         dtype=np.uint8, count=count)
+            state.sort(order="id")
+        return state
+
+    def projectile_positions(self):
+        """(kind, world x, world y) arrays for every enemy shot, missile and player bullet."""
+        pool = self.game.enemy_bullets
+        alive = np.flatnonzero(pool.alive)
+        bullets = self.game.player.bullets
+        kinds = np.concatenate((np.where(pool.kind[alive] == 1, PROJECTILE_MISSILE, PROJECTILE_ENEMY_BULLET),
+                                np.full(bullets.count, PROJECTILE_PLAYER_BULLET)))
+        xs = np.concatenate((pool.x[alive], bullets.x[:bullets.count]))
+        ys = np.concatenate((pool.y[alive], bullets.y[:bullets.count]))
+        return kinds, xs, ys
+
+    def send_snapshots(self):
+        state = self.world_state()
+        kinds, proj_x, proj_y = self.projectile_positions()
+        player = self.game.player
+        player_state = (player.rect.centerx, player.rect.centery, max(-32768, min(player.health, 32767)),
+                        self.game.wave, max(0, self.game.score), player.level)
+
+        for client in list(self.clients.values()):
+            start = time.perf_counter()
+            is_controller = client is self.controller
+            view_x, view_y = (player.rect.center if is_controller else client.view)
+
+            # Area of interest: only what this client can (nearly) see
+            in_view = ((np.abs(state["x"] * POSITION_QUANTUM - view_x) <= AOI_HALF_WIDTH) &
+                       (np.abs(state["y"] * POSITION_QUANTUM - view_y) <= AOI_HALF_HEIGHT))
+            visible = state[in_view]
+            proj_view = (np.abs(proj_x - view_x) <= AOI_HALF_WIDTH) & (np.abs(proj_y - view_y) <= AOI_HALF_HEIGHT)
+            projectiles = np.zeros(int(proj_view.sum()), dtype=PROJECTILE_DTYPE)
+            projectiles["kind"] = kinds[proj_view]
+            projectiles["x"] = proj_x[proj_view] - view_x
+            projectiles["y"] = proj_y[proj_view] - view_y
+
+            flags = ((SNAPSHOT_CONTROLLER if is_controller else 0) |
+                     (SNAPSHOT_UPGRADE_PAUSE if self.game.paused_for_upgrade else 0) |
+                     (SNAPSHOT_NEW_ROUND if client.new_round else 0))
+            snapshot_id = client.next_snapshot_id
+            baseline_id, baseline = client.baseline()
+            data = encode_snapshot(snapshot_id, baseline_id, self.tick, flags, player_state, visible, baseline,
+                                   projectiles)
+
+            # ✅ Too big for one datagram: keep the entities nearest the view center
+            if len(data) > MAX_PACKET:
+                client.truncated += 1
+                distance = (np.abs(visible["x"] * POSITION_QUANTUM - view_x) +
+                            np.abs(visible["y"] * POSITION_QUANTUM - view_y))
+                nearest = np.argsort(distance, kind="stable")
+                keep = len(visible)
+                while len(data) > MAX_PACKET and keep > 0:
+                    keep //= 2
+                    visible = np.sort(visible[nearest[:keep]], order="id")
+                    projectiles = projectiles[:keep]
+                    data = encode_snapshot(snapshot_id, baseline_id, self.tick, flags, player_state, visible,
+                                           baseline, projectiles)
+
+            try:
+                self.sock.sendto(data, client.address)
+            except OSError:
+                pass  # Lost like any other UDP packet
+            client.next_snapshot_id += 1
+            client.remember(snapshot_id, visible if len(visible) else EMPTY_STATE)
+            client.new_round = False
+            client.bytes_sent += len(data)
+            client.snapshots_sent += 1
+            client.entities_sent += len(visible)
+            client.full_snapshots += baseline_id == 0
+            self.encode_time += time.perf_counter() - start
+
+    # --- Loop --------------------------------------------------------------------------------------
+
+    def report(self):
+        now = time.perf_counter()
+        elapsed = now - self.last_report
+        if elapsed < STATS_INTERVAL:
+            return
+        ticks = max(self.ticks_since_report, 1)
+        print(f"📡 tick {self.tick}: sim {self.sim_time / ticks * 1000:.2f} ms/tick, "
+              f"encode {self.encode_time / ticks * 1000:.2f} ms/tick, {len(self.game.enemies)} enemies, "
+              f"wave {self.game.wave}")
+        for client in self.clients.values():
+            sent = max(client.snapshots_sent, 1)
+            print(f"   client {client.client_id}{' (controller)' if client is self.controller else ''}: "
+                  f"{client.bytes_sent / elapsed / 1024:.1f} KB/s, {client.bytes_sent / sent:.0f} B/snapshot, "
+                  f"{client.entities_sent / sent:.0f} entities, {client.full_snapshots} full, "
+                  f"{client.truncated} truncated, ack lag {client.next_snapshot_id - 1 - client.acked}")
+            client.reset_stats()
+        self.sim_time = self.encode_time = 0.0
+        self.ticks_since_report = 0
+        self.last_report = now
+
+    def serve(self, max_ticks=None):
+        """Runs fixed-rate ticks until stopped (or `max_ticks` have run)."""
+        print(f"🛰️ Listening on UDP port {self.port} at {self.tick_rate} ticks/s")
+        period = 1 / self.tick_rate
+        next_tick = time.perf_counter()
+        while self.running and (max_ticks is None or self.tick < max_ticks):
+            self.receive()
+            now = time.perf_counter()
+            for client in [c for c in self.clients.values() if now - c.last_heard > CLIENT_TIMEOUT]:
+                self.drop(client, "timed out")
+
+            start = time.perf_counter()
+            self.step()
+            self.sim_time += time.perf_counter() - start
+            self.tick += 1
+            self.ticks_since_report += 1
+            if self.tick % SNAPSHOT_EVERY == 0 and self.clients:
+                self.send_snapshots()
+            self.report()
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()  # Overloaded: don't try to catch up with a burst
+        self.sock.close()
+
+
+def run_load_test(clients=3, ticks=600, port=0):
+    """Starts a server plus `clients` stand-in clients (the first controls, the rest observe) on localhost,
+    then checks every client's reconstructed state against what the server sent."""
+    import threading
+    from netclient import StandInClient
+
+    server = GameServer(port=port)
+    stand_ins = [StandInClient(port=server.port, seed=i, view_offset=(0, 0) if i == 0 else (400 * i, -300 * i))
+                 for i in range(clients)]
+    duration = ticks / server.tick_rate + 1
+    threads = []
+    for stand_in in stand_ins:
+        # Connect in order so client 0 becomes the controller
+        thread = threading.Thread(target=lambda c=stand_in: c.connect() and c.run(duration), daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+        server.receive()
+
+    server.serve(max_ticks=ticks)
+    for thread in threads:
+        thread.join()
+
+    ok = True
+    for stand_in, session in zip(stand_ins, list(server.clients.values()) or [None] * clients):
+        sent = session.history.get(stand_in.latest_id) if session is not None else None
+        match = sent is not None and np.array_equal(sent, stand_in.state)
+        ok &= match
+        print(f"✅ client {stand_in.client_id}: {stand_in.snapshots} snapshots, "
+              f"{stand_in.bytes_received / 1024:.0f} KB, reconstruction {'matches' if match else 'MISMATCH'}"
+              f" (snapshot {stand_in.latest_id}, {0 if stand_in.state is None else len(stand_in.state)} entities)")
+    return ok
+
+
+if __name__ == "__main__":
+    # python netserver.py [port]              -> serve until Ctrl+C
+    # python netserver.py --load-test[=N] [ticks]  -> N stand-in clients on localhost
+    args = sys.argv[1:]
+    if args and args[0].startswith("--load-test"):
+        count = int(args[0].split("=", 1)[1]) if "=" in args[0] else 3
+        sys.exit(0 if run_load_test(count, int(args[1]) if len(args) > 1 else 600) else 1)
+    server = GameServer(port=int(args[0]) if args else DEFAULT_PORT)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        print("🛰️ Server stopped")
@@ -1,10 +1,12 @@
 import pygame
 import random
 import math
+import numpy as np
+from display import WORLD_VIEW
 
-MAP_WIDTH, MAP_HEIGHT = 1600, 1200
 BORDER_THICKNESS = 10
 NUM_OBSTACLES = 10  # Adjust for difficulty
+RASTER_CELL_SIZE = 4  # Pixels per collision raster cell
 
 
 class Obstacle:
@@ -26,8 +28,10 @@ class Obstacle:
 
     def draw(self, screen, camera_x, camera_y):
         """Draws the obstacle as a rectangular house with a center beam and a border."""
-        draw_x = self.x - camera_x
-        draw_y = self.y - camera_y
+        scale = WORLD_VIEW.scale
+        draw_x = (self.x - camera_x) * scale
+        draw_y = (self.y - camera_y) * scale
+        width, height = self.width * scale, self.height * scale
 
         if self.shape in ["square", "rectangle"]:
             # 🎨 **Color Definitions**
@@ -36,25 +40,26 @@ class Obstacle:
             roof_color_right = (139, 69, 19)  # Darker brown for right half
             beam_color = (100, 50, 30)  # Dark brown beam in the center
 
-            border_thickness = 4  # Thickness of the outline
+            border_thickness = 4 * scale  # Thickness of the outline
 
             # 🏠 **Draw the border (slightly larger than the building)**
             pygame.draw.rect(screen, border_color,
                              (draw_x - border_thickness, draw_y - border_thickness,
-                              self.width + border_thickness * 2, self.height + border_thickness * 2))
+                              width + border_thickness * 2, height + border_thickness * 2))
 
             # 🏠 **Draw the full rectangular roof inside the border**
-            pygame.draw.rect(screen, roof_color_left, (draw_x, draw_y, self.width // 2, self.height))
-            pygame.draw.rect(screen, roof_color_right, (draw_x + self.width // 2, draw_y, self.width // 2, self.height))
+            pygame.draw.rect(screen, roof_color_left, (draw_x, draw_y, self.width // 2 * scale, height))
+            pygame.draw.rect(screen, roof_color_right,
+                             (draw_x + self.width // 2 * scale, draw_y, self.width // 2 * scale, height))
 
             # 🪵 **Draw the central beam**
             pygame.draw.rect(screen, beam_color,
-                             (draw_x + self.width // 2 - 3, draw_y, 6, self.height))  # Thin vertical beam
+                             (draw_x + (self.width // 2 - 3) * scale, draw_y, 6 * scale, height))  # Thin vertical beam
 
         elif self.shape == "circle":
             pygame.draw.circle(screen, (139, 69, 19),
-                               (draw_x + self.width // 2, draw_y + self.width // 2),
-                               self.radius)
+                               (draw_x + self.width // 2 * scale, draw_y + self.width // 2 * scale),
+                               self.radius * scale)
 
     def collides(self, obj_rect):
         """Checks collision based on shape type."""
@@ -88,35 +93,64 @@ class Obstacle:
             return distance <= (self.radius + 1)  # Small buffer to ensure touching counts
 
 
-def generate_town_layout(player_start_x=1200, player_start_y=900):
-    """Generates a town-like layout with buildings and clear roads for movement."""
-    obstacles = []
-
-    # Define buildings (placed with wide roads)
-    town_buildings = [
-        # (x, y, width, height) - Spaced out for better movement
-        (300, 200, 250, 250),  # House 1
-        (800, 200, 300, 250),  # House 2
-        (1400, 200, 300, 250),  # House 3
-        (2000, 200, 250, 250),  # House 4
-
-        (500, 600, 350, 300),  # Warehouse
-        (1400, 600, 350, 300),  # Store
-
-        (300, 1200, 300, 300),  # Tavern
-        (1000, 1200, 400, 300),  # Market Area
-        (1800, 1200, 350, 300),  # Town Hall
-    ]
-
-    # Convert building data into obstacle objects, ensuring they don’t overlap the player
-    for (x, y, width, height) in town_buildings:
-        obstacle_rect = pygame.Rect(x, y, width, height)
-
-        # Ensure the obstacle doesn't spawn on the player
-        player_safe_zone = pygame.Rect(player_start_x - 100, player_start_y - 100, 200, 200)
-        if obstacle_rect.colliderect(player_safe_zone):
-            continue  # Skip obstacles that would spawn on the player
-
-        obstacles.append(Obstacle("rectangle", x, y, width, height))
-
-    return obstacles
\ No newline at end of file
+class CollisionRaster:
+    """Obstacle ids rasterized onto a grid so many point tests can run as one NumPy lookup.
+    Covers the (origin, width, height) region of the world; the world keeps one raster per chunk."""
+
+    def __init__(self, obstacles, width, height, cell_size=RASTER_CELL_SIZE, origin=(0, 0), ids=None):
+        self.obstacles = obstacles
+        self.cell_size = cell_size
+        self.origin_x, self.origin_y = origin
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.grid = np.zeros((self.rows, self.cols), dtype=np.int32)  # 0 = free, otherwise obstacle id
+
+        for obstacle_id, obstacle in zip(ids or range(1, len(obstacles) + 1), obstacles):
+            self._rasterize(obstacle, obstacle_id)
+
+    def _rasterize(self, obstacle, obstacle_id):
+        cell = self.cell_size
+        rect = obstacle.rect.move(-self.origin_x, -self.origin_y)
+        x0 = max(rect.left // cell, 0)
+        y0 = max(rect.top // cell, 0)
+        x1 = min(-(-rect.right // cell), self.cols)
+        y1 = min(-(-rect.bottom // cell), self.rows)
+        if x0 >= x1 or y0 >= y1:
+            return  # Entirely outside this raster
+
+        if obstacle.shape == "circle":
+            # Mark the cells whose centers fall inside the circle
+            centers_x = (np.arange(x0, x1) + 0.5) * cell - rect.centerx
+            centers_y = (np.arange(y0, y1) + 0.5) * cell - rect.centery
+            inside = centers_x[None, :] ** 2 + centers_y[:, None] ** 2 <= obstacle.radius ** 2
+            self.grid[y0:y1, x0:x1][inside] = obstacle_id
+        else:
+            self.grid[y0:y1, x0:x1] = obstacle_id
+
+    def lookup(self, xs, ys):
+        """Returns the obstacle id (0 if free) under each point. Points outside the raster are free."""
+        cols = ((xs - self.origin_x) // self.cell_size).astype(np.int64)
+        rows = ((ys - self.origin_y) // self.cell_size).astype(np.int64)
+        on_map = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        ids = np.zeros(len(xs), dtype=np.int32)
+        ids[on_map] = self.grid[rows[on_map], cols[on_map]]
+        return ids
+
+    def lookup_rects(self, xs, ys, width, height):
+        """Returns the first obstacle id touched by any corner of each (x, y, width, height) box.
+        Width and height may be scalars or per-box arrays."""
+        return lookup_rect_corners(self.lookup, xs, ys, width, height)
+
+
+def lookup_rect_corners(lookup, xs, ys, width, height):
+    """Runs a point `lookup` on box corners, only re-testing boxes whose earlier corners were free."""
+    ids = lookup(xs, ys)
+    far_x = np.broadcast_to(np.asarray(width, dtype=np.float64) - 1, xs.shape)
+    far_y = np.broadcast_to(np.asarray(height, dtype=np.float64) - 1, ys.shape)
+    zero = np.zeros(xs.shape)
+    for dx, dy in ((far_x, zero), (zero, far_y), (far_x, far_y)):
+        missing = ids == 0
+        if not missing.any():
+            break
+        ids[missing] = lookup(xs[missing] + dx[missing], ys[missing] + dy[missing])
+    return ids
@@ -1,18 +1,24 @@
 import pygame
 import math
-import random
-from bullet import Bullet
-from abilities import ABILITY_LIST
+from bullet import BulletPool
+from abilities import ABILITY_LIST, ADRENALINE_BOOST, ADRENALINE_DURATION
+from stats import StatBlock, AbilitySet, MULTIPLY
 from swordattack import SwordAttack
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW
 
 BORDER_THICKNESS = 10  # Matches the visual border thickness
+BASE_FIRE_DELAY = 300  # ms between shots at fire rate 1.0
+
+# Starting values of every stat abilities can modify
+BASE_STATS = {"speed": 5, "fire_rate": 1.0, "pierce": 0, "bonus_bullets": 0, "ricochet_count": 0}
 
 
 class Player:
     def __init__(self, x, y, map_width, map_height):
         self.rect = pygame.Rect(x, y, 40, 40)
         self.health = 3
-        self.bullets = []
+        self.bullets = BulletPool(map_width, map_height)  # All player bullets, updated in batches
         self.MAP_WIDTH = map_width
         self.MAP_HEIGHT = map_height
         self.xp = 0  # XP system
@@ -21,28 +27,18 @@ class Player:
         self.currency = 0
         self.pending_ability_choices = []
         self.cooldowns = {"explosive_shot": 0, "sword_attack": 0, "dash": 0}
-        self.abilities = []  # Holds selected abilities
-        self.actions = []  # Stores shop abilities
-        self.base_speed = 5
-        self.speed = self.base_speed
+        self.abilities = AbilitySet()  # Selected abilities (with stacks) and unlocks
+        self.actions = AbilitySet()  # Stores shop abilities
 
         self.sword_attack = SwordAttack(self)
 
-        self.move_speed_bonus = 0
-
-        self.adrenaline_boost = 0.00  # ✅ Starts at 0%, increases with Adrenaline Rush upgrades
-        self.adrenaline_active = False  # ✅ Whether Adrenaline Rush is active
-        self.adrenaline_end_time = 0
+        # ✅ Speed, fire delay, pierce, bonus bullets and ricochets are cached here by refresh_stats()
+        # and only recomputed when a modifier is added or a buff expires
+        self.stats = StatBlock(BASE_STATS, on_change=self.refresh_stats)
 
-        self.bonus_bullets = 0  # ✅ Track extra bullets
-        self.queued_shots = []  # ✅ Store bullets with delay
         self.shot_delay = 120  # ✅ Delay between extra bullets (in milliseconds)
-        self.pierce = 0  # ✅ Track number of pierces
-        self.fire_rate_multiplier = 1.0  # ✅ Default is 1.0 (no boost)
         self.last_shot_time = 0  # ✅ Tracks when the last shot was fired
 
-        self.ricochet_count = 0
-
         self.dash_active = False  # ✅ Track if dashing
         self.dash_end_time = 0  # ✅ When the dash should end
         self.dash_vector = pygame.Vector2(0, 0)  # ✅ Store dash direction
@@ -51,70 +47,60 @@ class Player:
         self.hit_timer = 0  # Time when player was last hit
         self.hit_effect_duration = 150  # Flash effect duration in milliseconds
 
-    def update(self, obstacles, game):
-        keys = pygame.key.get_pressed()
+    def refresh_stats(self, stats):
+        """Copies the final stat values onto the player (runs only when a modifier changes)."""
+        self.speed = stats["speed"]
+        self.fire_delay = int(BASE_FIRE_DELAY / stats["fire_rate"])  # ✅ Adjust delay based on fire rate
+        self.pierce = stats["pierce"]
+        self.bonus_bullets = stats["bonus_bullets"]
+        self.ricochet_count = stats["ricochet_count"]
+
+    def update(self, world, game):
+        held = game.input_frame.held
 
         # Move (PRESS WASD)
         move_x, move_y = 0, 0
-        if keys[pygame.K_w]: move_y -= self.speed
-        if keys[pygame.K_s]: move_y += self.speed
-        if keys[pygame.K_a]: move_x -= self.speed
-        if keys[pygame.K_d]: move_x += self.speed
+        if "move_up" in held: move_y -= self.speed
+        if "move_down" in held: move_y += self.speed
+        if "move_left" in held: move_x -= self.speed
+        if "move_right" in held: move_x += self.speed
 
         # ✅ If dashing, override movement
         if self.dash_active:
             self.rect.x += self.dash_vector.x
             self.rect.y += self.dash_vector.y
 
-            if pygame.time.get_ticks() >= self.dash_end_time:
+            if GAME_CLOCK.now >= self.dash_end_time:
                 self.dash_active = False  # ✅ End dash after duration
 
         # Try moving in X first
         old_x = self.rect.x
         self.rect.x += move_x
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
+        if world.collides(self.rect):
             self.rect.x = old_x  # Undo move if collision occurs
 
         # Try moving in Y second
         old_y = self.rect.y
         self.rect.y += move_y
-        if any(obstacle.collides(self.rect) for obstacle in obstacles):
+        if world.collides(self.rect):
             self.rect.y = old_y  # Undo move if collision occurs
 
         # Clamp position inside game boundaries
         self.rect.x = max(BORDER_THICKNESS, min(self.rect.x, self.MAP_WIDTH - self.rect.width - BORDER_THICKNESS))
         self.rect.y = max(BORDER_THICKNESS, min(self.rect.y, self.MAP_HEIGHT - self.rect.height - BORDER_THICKNESS))
 
-        current_time = pygame.time.get_ticks()
-
         self.sword_attack.update(game.enemies, game)
 
-        # ✅ Always apply Speed Boost permanently
-        self.speed = self.base_speed * (1 + self.move_speed_bonus)
-
-        # ✅ Apply temporary Adrenaline Rush bonus if active
-        if self.adrenaline_active:
-            self.speed *= (1 + self.adrenaline_boost)  # ✅ Dynamically modify speed while active
-
-        if self.adrenaline_active and current_time > self.adrenaline_end_time:
-            self.adrenaline_active = False
-            print("🔴 Adrenaline Rush ENDED! Speed Reset.")
-
-            # ✅ Instead of resetting `adrenaline_boost` to 0, keep the stacked value
-            adrenaline_upgrades = self.abilities.count("Adrenaline Rush")
-            self.adrenaline_boost = 0.2 * adrenaline_upgrades  # ✅ Maintain stacking
-
         # ✅ Secret Dev Command: Instant Level Up
-        if keys[pygame.K_l]:
+        if "dev_level_up" in held:
             print("🛠 DEV COMMAND: Instant Level Up Activated!")
             self.force_level_up(game)  # ✅ Calls a dedicated function to handle dev level-up
 
     def shoot(self, mouse_x, mouse_y):
         """Shoots bullets, reducing delay with Rapid Fire stacks."""
-        current_time = pygame.time.get_ticks()
-        fire_delay = int(300 / self.fire_rate_multiplier)  # ✅ Adjust delay based on fire rate
+        current_time = GAME_CLOCK.now
 
-        if current_time - self.last_shot_time < fire_delay:
+        if current_time - self.last_shot_time < self.fire_delay:
             return  # ⛔ Prevents shooting if delay hasn't passed
 
         self.last_shot_time = current_time  # ✅ Update last shot time
@@ -123,44 +109,24 @@ class Player:
         angle = math.atan2(mouse_y - self.rect.centery, mouse_x - self.rect.centerx)
 
         # Fire primary bullet
-        bullet = Bullet(self.rect.centerx, self.rect.centery, angle, self.MAP_WIDTH, self.MAP_HEIGHT, self.pierce,0, self.ricochet_count)
-        bullet.fire()
-        self.bullets.append(bullet)
+        self.bullets.spawn(self.rect.centerx, self.rect.centery, angle, self.pierce, 0, self.ricochet_count)
 
-        # Queue additional bullets with delay
+        # Schedule additional bullets with delay (the timer wheel wakes each one when it's due)
         for i in range(self.bonus_bullets):
-            delay_time = current_time + ((i + 1) * 50)  # ✅ Adjusted to match new fire rate scaling
-            self.queued_shots.append((delay_time, angle, self.ricochet_count))
-
-
-    def update_bullets(self):
-        """Processes queued bullets and fires them when the delay is reached."""
-        current_time = pygame.time.get_ticks()
-        shots_to_fire = []  # Store bullets that need to be fired
-
-        for shot in self.queued_shots[:]:  # Iterate safely over queued shots
-            shot_time, angle, ricochet_count = shot
-            if current_time >= shot_time:
-                # ✅ Create and immediately fire the extra bullet
-                bullet = Bullet(self.rect.centerx, self.rect.centery, angle, self.MAP_WIDTH, self.MAP_HEIGHT,
-                                self.pierce,0, ricochet_count)
-                bullet.fire()  # ✅ Ensure bullet is set to active
-                self.bullets.append(bullet)
-                shots_to_fire.append(shot)  # ✅ Mark this shot for removal
+            GAME_CLOCK.schedule((i + 1) * 50, self.fire_queued_shot, angle, self.ricochet_count)
 
-
-        # ✅ Remove fired shots from the queue
-        for shot in shots_to_fire:
-            self.queued_shots.remove(shot)
+    def fire_queued_shot(self, angle, ricochet_count):
+        """Timer callback: fires one delayed extra bullet from the player's current position."""
+        self.bullets.spawn(self.rect.centerx, self.rect.centery, angle, self.pierce, 0, ricochet_count)
 
     def take_damage(self):
         """Reduces health on collision with enemies and starts hit effect."""
         self.health -= 1
-        self.hit_timer = pygame.time.get_ticks()  # Start hit effect timer
+        self.hit_timer = GAME_CLOCK.now  # Start hit effect timer
 
     def draw(self, screen, camera_x, camera_y, game):
         """Draws the player with a bold black outline and a flashing hit effect when damaged."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
         time_since_hit = current_time - self.hit_timer
 
         flash_interval = 75  # Time between flashes in milliseconds
@@ -178,15 +144,19 @@ class Player:
         else:
             player_color = base_color  # Normal color
 
+        scale = WORLD_VIEW.scale
+        draw_x, draw_y = (self.rect.x - camera_x) * scale, (self.rect.y - camera_y) * scale
+
         # Draw outline slightly larger than before
         pygame.draw.rect(screen, outline_color,
-                         pygame.Rect(self.rect.x - camera_x - 3, self.rect.y - camera_y - 3,
-                                     self.rect.width + 6, self.rect.height + 6))
+                         pygame.Rect(draw_x - 3 * scale, draw_y - 3 * scale,
+                                     (self.rect.width + 6) * scale, (self.rect.height + 6) * scale))
 
         # Draw player with transparency support
-        player_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        player_surface = pygame.Surface((max(int(self.rect.width * scale), 1), max(int(self.rect.height * scale), 1)),
+                                        pygame.SRCALPHA)
         player_surface.fill(player_color)
-        screen.blit(player_surface, (self.rect.x - camera_x, self.rect.y - camera_y))
+        screen.blit(player_surface, (draw_x, draw_y))
 
         self.sword_attack.draw(screen, game)
 
@@ -196,14 +166,16 @@ class Player:
         if self.xp >= self.xp_to_next_level:
             self.level_up(game)
 
-        if "Adrenaline Rush" in self.abilities:
-            if not self.adrenaline_active:
-                self.adrenaline_active = True
-                self.adrenaline_end_time = pygame.time.get_ticks() + 5000  # ✅ Refresh 5s timer
+        if "Adrenaline Rush" in self.abilities and not self.stats.has_buff("Adrenaline Rush"):
+            # ✅ Stack Adrenaline Rush Effect: +20% speed per time it was selected, for 5s
+            boost = 1 + ADRENALINE_BOOST * self.abilities.count("Adrenaline Rush")
+            self.stats.add_buff("Adrenaline Rush", [("speed", MULTIPLY, boost)], GAME_CLOCK.now + ADRENALINE_DURATION)
+            GAME_CLOCK.schedule(ADRENALINE_DURATION + 1, self.expire_buffs)
 
-                # ✅ Stack Adrenaline Rush Effect
-                adrenaline_upgrades = self.abilities.count("Adrenaline Rush")  # Count how many times it was selected
-                self.adrenaline_boost = 0.2 * adrenaline_upgrades  # ✅ Increase boost per stack
+    def expire_buffs(self):
+        """Timer callback: drops buffs whose time is up."""
+        if "Adrenaline Rush" in self.stats.update(GAME_CLOCK.now):
+            print("🔴 Adrenaline Rush ENDED! Speed Reset.")
 
     def level_up(self, game):
         """Handles level-up logic and presents upgrade choices."""
@@ -214,28 +186,36 @@ class Player:
 
     def choose_upgrade(self, game):
         """Presents 3 random upgrade choices and pauses the game until player selects."""
-        options = random.sample(ABILITY_LIST, 3)  # Pick 3 random abilities
+        options = game.rng.upgrades.sample(ABILITY_LIST, 3)  # Pick 3 random abilities
         self.pending_ability_choices = options  # Store choices
         game.paused_for_upgrade = True  # Pause game until player picks
+        GAME_CLOCK.pause("upgrade")
 
         print(f"LEVEL UP! Choose an upgrade:")
         for i, ability in enumerate(options, 1):
             print(f"{i}: {ability['name']} - {ability['description']}")
 
-    def handle_level_up_input(self, key, game):
-        """Handles player's input for choosing an ability and resumes the game."""
+    def handle_level_up_input(self, index, game):
+        """Handles player's choice (0-2) of an ability and resumes the game."""
         if not self.pending_ability_choices:
             return  # No upgrade to select
 
-        if key in (pygame.K_1, pygame.K_2, pygame.K_3):
-            index = key - pygame.K_1  # Convert key to list index
+        if 0 <= index < len(self.pending_ability_choices):
             selected_ability = self.pending_ability_choices[index]
 
             print(f"Selected: {selected_ability['name']}!")  # Debug
-            selected_ability["effect"](self)  # Apply power-up effect
-            self.abilities.append(selected_ability["name"])
+            self.apply_ability(selected_ability)
             self.pending_ability_choices = []  # Clear choices
             game.paused_for_upgrade = False  # Resume the game
+            GAME_CLOCK.resume("upgrade")
+
+    def apply_ability(self, ability):
+        """Registers an ABILITY_LIST entry: its stat modifiers, any one-off effect, and a stack."""
+        for stat, kind, value in ability.get("modifiers", ()):
+            self.stats.add(stat, kind, value, source=ability["name"])
+        if "effect" in ability:
+            ability["effect"](self)
+        self.abilities.add(ability["name"])
 
     def unlock_explosive_shot(self):
         """Unlocks the explosive shot ability."""
@@ -245,9 +225,9 @@ class Player:
 
     def use_explosive_shot(self, mouse_x, mouse_y, game):
         """Fires an explosive shot that explodes on impact, dealing AoE damage."""
-        if "Explosive Shot" in self.actions and pygame.time.get_ticks() >= self.cooldowns["explosive_shot"]:
+        if "Explosive Shot" in self.actions and GAME_CLOCK.now >= self.cooldowns["explosive_shot"]:
             print("💥 Explosive Shot Fired!")
-            self.cooldowns["explosive_shot"] = pygame.time.get_ticks() + 2000 # 2 sec cooldown
+            self.cooldowns["explosive_shot"] = GAME_CLOCK.now + 2000 # 2 sec cooldown
 
             # ✅ Calculate bullet direction using passed mouse coordinates
             angle = math.atan2(mouse_y - self.rect.centery, mouse_x - self.rect.centerx)
@@ -256,10 +236,8 @@ class Player:
                 f"🎯 Aiming: Player ({self.rect.centerx}, {self.rect.centery}) -> Mouse ({mouse_x}, {mouse_y}), Angle: {math.degrees(angle)}°")
 
             # ✅ Create explosive bullet
-            bullet = Bullet(self.rect.centerx, self.rect.centery, angle, self.MAP_WIDTH, self.MAP_HEIGHT,
-                            self.pierce, 0, self.ricochet_count, explosive=True)  # ✅ Explosive flag
-            bullet.fire()
-            self.bullets.append(bullet)
+            self.bullets.spawn(self.rect.centerx, self.rect.centery, angle,
+                               self.pierce, 0, self.ricochet_count, explosive=True)  # ✅ Explosive flag
 
     def unlock_sword_attack(self):
         """Unlocks the sword attack ability."""
@@ -282,18 +260,18 @@ class Player:
             self.dash_end_time = 0  # ✅ When the dash should end
             self.dash_vector = pygame.Vector2(0, 0)  # ✅ Store dash direction
 
-    def use_dash(self):
+    def use_dash(self, frame):
         """Allows the player to dash in the current movement direction if off cooldown."""
-        current_time = pygame.time.get_ticks()
+        current_time = GAME_CLOCK.now
 
         if "Dash" in self.abilities and not self.dash_active and current_time >= self.cooldowns["dash"]:
             move_x, move_y = 0, 0
-            keys = pygame.key.get_pressed()
+            held = frame.held
 
-            if keys[pygame.K_w]: move_y -= 1
-            if keys[pygame.K_s]: move_y += 1
-            if keys[pygame.K_a]: move_x -= 1
-            if keys[pygame.K_d]: move_x += 1
+            if "move_up" in held: move_y -= 1
+            if "move_down" in held: move_y += 1
+            if "move_left" in held: move_x -= 1
+            if "move_right" in held: move_x += 1
 
             if move_x == 0 and move_y == 0:
                 return  # ⛔ Prevent dashing if not moving
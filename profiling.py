@@ -0,0 +1,155 @@
+import cProfile
+import pstats
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from ioworker import IO_WORKER
+
+PROFILE_ENV = "LAST_STAND_PROFILE"  # 1 = cProfile + sampler, "sample" = sampler only
+PROFILE_INTERVAL_ENV = "LAST_STAND_PROFILE_INTERVAL"  # Also dump every N seconds (default: once per wave)
+PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+
+
+def profiling_mode():
+    """Returns None (off), "full" (cProfile + sampler) or "sample" (sampler only)."""
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if value in ("", "0"):
+        return None
+    return "sample" if value == "sample" else "full"
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}".replace(";", ":").replace(" ", "_")
+
+
+class StackSampler:
+    """Low-overhead statistical profiler: a background thread samples one thread's stack at a fixed rate."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()  # "outer;...;inner" -> sample count
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                with self._lock:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def drain(self):
+        """Returns and resets the samples collected so far."""
+        with self._lock:
+            samples, self.samples = self.samples, Counter()
+        return samples
+
+
+class SessionProfiler:
+    """Profiles the game loop in segments (per wave or per N seconds) and writes pstats + collapsed stacks."""
+
+    def __init__(self, mode="full", output_dir=PROFILE_DIR, interval_seconds=None):
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval_seconds = interval_seconds
+        self.active = False
+        self.profile = None
+        self.sampler = None
+        self.segment = 0
+        self.segment_start = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Builds a profiler from the environment; it starts immediately if LAST_STAND_PROFILE is set."""
+        mode = profiling_mode()
+        interval = os.environ.get(PROFILE_INTERVAL_ENV)
+        profiler = cls(mode or "full", interval_seconds=float(interval) if interval else None)
+        if mode:
+            profiler.start()
+        return profiler
+
+    def start(self):
+        if self.active:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == "full":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.sampler = StackSampler(threading.get_ident())
+        self.sampler.start()
+        self.segment_start = time.perf_counter()
+        self.active = True
+        print(f"📈 Profiling started ({self.mode}), writing to {self.output_dir}/")
+
+    def stop(self, game=None):
+        """Stops profiling, writing out the current segment first if a game is given."""
+        if not self.active:
+            return
+        if game is not None:
+            self.dump(game, "stop")
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile = None
+        self.sampler.stop()
+        self.sampler = None
+        self.active = False
+        print("📈 Profiling stopped")
+
+    def toggle(self, game):
+        if self.active:
+            self.stop(game)
+        else:
+            self.start()
+
+    def dump(self, game, reason):
+        """Writes the segment so far as <label>.pstats and <label>.collapsed, then starts a fresh segment."""
+        if not self.active:
+            return
+        self.segment += 1
+        label = (f"{self.segment:03d}_wave{game.wave:03d}_{reason}_{len(game.enemies)}enemies_"
+                 f"{len(game.player.bullets)}bullets_{len(game.enemy_bullets)}shots")
+        base = os.path.join(self.output_dir, label)
+
+        if self.profile is not None:
+            self.profile.disable()
+            stats = pstats.Stats(self.profile)  # Snapshot here; marshalling and writing happen off-thread
+            IO_WORKER.submit(stats.dump_stats, base + ".pstats", droppable=True)
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+        samples = self.sampler.drain()
+        collapsed = "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+        IO_WORKER.write(base + ".collapsed", collapsed, sync=False, droppable=True)
+
+        self.segment_start = time.perf_counter()
+
+    def on_wave(self, game):
+        """Call when a wave ends, before the wave counter moves on."""
+        self.dump(game, "wave")
+
+    def tick(self, game):
+        """Call once per frame; dumps on the optional time interval."""
+        if self.active and self.interval_seconds and time.perf_counter() - self.segment_start >= self.interval_seconds:
+            self.dump(game, "interval")
@@ -0,0 +1,86 @@
+import bisect
+import os
+import numpy as np
+
+RNG_SEED_ENV = "LAST_STAND_RNG_SEED"  # Fix gameplay randomness (replays, benchmarks); unset = fresh each run
+RNG_BATCH = 1024  # Uniforms drawn per refill
+STREAMS = ("spawn", "loot", "ai", "upgrades", "fx")  # New streams go last, so existing ones keep their seeds
+
+
+def rng_seed():
+    """Seed from LAST_STAND_RNG_SEED if set, otherwise a fresh random one."""
+    value = os.environ.get(RNG_SEED_ENV)
+    return int(value) if value else int(np.random.SeedSequence().entropy % 2 ** 32)
+
+
+class RandomStream:
+    """One subsystem's random numbers. A NumPy Generator fills a buffer of uniforms in one call and every
+    roll just reads the next one, so the hot paths never call into the generator per event."""
+
+    def __init__(self, seed_sequence, batch=RNG_BATCH):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.batch = batch
+        self.buffer = []
+        self.index = 0
+        self.refills = 0
+
+    def _refill(self):
+        self.buffer = self.generator.random(self.batch).tolist()  # Plain floats: cheaper to index than numpy scalars
+        self.index = 0
+        self.refills += 1
+
+    def random(self):
+        """Uniform float in [0, 1)."""
+        if self.index == len(self.buffer):
+            self._refill()
+        value = self.buffer[self.index]
+        self.index += 1
+        return value
+
+    def chance(self, probability):
+        return self.random() < probability
+
+    def randint(self, low, high):
+        """Integer in [low, high], like random.randint."""
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, sequence):
+        return sequence[int(self.random() * len(sequence))]
+
+    def weighted_choice(self, items, weights):
+        cumulative = []
+        total = 0
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+        return items[bisect.bisect_right(cumulative, self.random() * total)]
+
+    def uniform(self, low, high, size):
+        """A NumPy array of `size` uniforms in [low, high), straight from the generator (batched effects)."""
+        return self.generator.uniform(low, high, size)
+
+    def sample(self, population, k):
+        """k distinct items (partial Fisher-Yates), like random.sample."""
+        pool = list(population)
+        for i in range(k):
+            j = i + int(self.random() * (len(pool) - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+
+class GameRandom:
+    """Independent streams per subsystem (spawn, loot, ai, upgrades, fx), all derived from one seed. Each
+    subsystem only consumes its own stream, so changing AI code never reshuffles loot in a replay.
+    The town seed is spawned from the same root, so one seed reproduces the whole run."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        root = np.random.SeedSequence(seed)
+        children = root.spawn(len(STREAMS))
+        self.streams = {name: RandomStream(child) for name, child in zip(STREAMS, children)}
+        self.town_seed = int(root.spawn(1)[0].generate_state(1)[0])  # Spawned after the streams, so they keep their seeds
+        self.spawn = self.streams["spawn"]
+        self.loot = self.streams["loot"]
+        self.ai = self.streams["ai"]
+        self.upgrades = self.streams["upgrades"]
+        self.fx = self.streams["fx"]  # Cosmetic only (particles), so effects never shift gameplay rolls
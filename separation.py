@@ -0,0 +1,83 @@
+import numpy as np
+
+SEPARATION_CELL_SIZE = 64  # At least the widest separating enemy, so 3x3 cells hold every overlap
+MAX_NEIGHBOURS_PER_CELL = 8  # Only the first few enemies in a crowded cell push (keeps the pass O(n))
+SEPARATION_RATE = 0.5  # Fraction of the overlap resolved per tick (soft, so hordes ooze rather than snap)
+MAX_PUSH = 3  # Pixels an enemy can be pushed per tick
+MIN_PUSH = 1e-3  # Pushes smaller than this (px) aren't worth a move() call
+
+NEIGHBOUR_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+class SeparationSolver:
+    """Soft enemy-enemy separation. Enemies are bucketed in a uniform grid (sorted cell keys) and each
+    one is pushed away from the overlapping neighbours in its 3x3 cells, weighted by archetype strength."""
+
+    def __init__(self, cell_size=SEPARATION_CELL_SIZE, max_per_cell=MAX_NEIGHBOURS_PER_CELL):
+        self.cell_size = cell_size
+        self.max_per_cell = max_per_cell
+        self.pairs_last_tick = 0
+        self.pushed_last_tick = 0
+
+    def resolve(self, enemies, world):
+        """Pushes overlapping enemies apart, never into obstacles."""
+        movers = [enemy for enemy in enemies
+                  if enemy.SEPARATION_STRENGTH > 0 and enemy.rect is not None and not enemy.is_dying]
+        self.pairs_last_tick = self.pushed_last_tick = 0
+        n = len(movers)
+        if n < 2:
+            return
+
+        radius = np.fromiter((enemy.SIZE / 2 for enemy in movers), dtype=np.float64, count=n)
+        x = np.fromiter((enemy.x for enemy in movers), dtype=np.float64, count=n) + radius
+        y = np.fromiter((enemy.y for enemy in movers), dtype=np.float64, count=n) + radius
+        strength = np.fromiter((enemy.SEPARATION_STRENGTH for enemy in movers), dtype=np.float64, count=n)
+
+        # Bucket by cell: sort once, then every cell is a contiguous [start, end) run
+        cell_size = max(self.cell_size, int(radius.max() * 2) + 1)
+        cx = np.floor_divide(x, cell_size).astype(np.int64)
+        cy = np.floor_divide(y, cell_size).astype(np.int64)
+        span = int(cy.max() - cy.min()) + 3  # Row stride; neighbours never wrap into another column
+        keys = (cx - cx.min() + 1) * span + (cy - cy.min() + 1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        # Candidate neighbours: the first `max_per_cell` entries of each of the 9 surrounding cells
+        neighbour_keys = keys[:, None] + np.array([dx * span + dy for dx, dy in NEIGHBOUR_OFFSETS])[None, :]
+        starts = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        ends = np.minimum(np.searchsorted(sorted_keys, neighbour_keys, side="right"), starts + self.max_per_cell)
+        slots = (starts[:, :, None] + np.arange(self.max_per_cell)[None, None, :]).reshape(n, -1)  # (n, 9*K)
+        valid = slots < np.repeat(ends, self.max_per_cell, axis=1)
+
+        # Flatten to candidate pairs (i, j) so the maths below only touches real neighbours
+        i_idx, slot_idx = np.nonzero(valid)
+        j_idx = order[slots[i_idx, slot_idx]]
+        keep = i_idx != j_idx
+        i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+        dx = x[i_idx] - x[j_idx]
+        dy = y[i_idx] - y[j_idx]
+        distance = np.sqrt(dx * dx + dy * dy)
+        overlap = radius[i_idx] + radius[j_idx] - distance
+        touching = overlap > 0
+        i_idx, j_idx = i_idx[touching], j_idx[touching]
+        dx, dy, distance, overlap = dx[touching], dy[touching], distance[touching], overlap[touching]
+        self.pairs_last_tick = len(i_idx) // 2
+        if not self.pairs_last_tick:
+            return
+
+        # ✅ Heavier archetypes push harder: i moves by its share of the pair's combined strength
+        push = overlap * strength[j_idx] / (strength[i_idx] + strength[j_idx]) * SEPARATION_RATE
+        stacked = distance <= 1e-6
+        safe = np.where(stacked, 1.0, distance)
+        # Exactly stacked enemies get a deterministic nudge apart based on their order
+        nx = np.where(stacked, np.where(i_idx < j_idx, -1.0, 1.0), dx / safe)
+        ny = np.where(stacked, 0.0, dy / safe)
+        # ✅ Float pushes: positions are floats, so sub-pixel shoves accumulate instead of rounding to 0
+        push_x = np.clip(np.bincount(i_idx, push * nx, n), -MAX_PUSH, MAX_PUSH)
+        push_y = np.clip(np.bincount(i_idx, push * ny, n), -MAX_PUSH, MAX_PUSH)
+
+        moved = np.flatnonzero((np.abs(push_x) > MIN_PUSH) | (np.abs(push_y) > MIN_PUSH))
+        self.pushed_last_tick = len(moved)
+        for i, px, py in zip(moved.tolist(), push_x[moved].tolist(), push_y[moved].tolist()):
+            movers[i].move(px, py, world)  # Never shove an enemy into a wall
@@ -1,37 +1,187 @@
 import pygame
 import math
+import numpy as np
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW, scale_sprite
 
-class ShooterBullet:
-    """A bullet fired by enemies that moves in a straight line and damages the player."""
-    BULLET_SPEED = 7  # Slightly slower than player bullets
+BULLET_SPEED = 7  # Slightly slower than player bullets
+BULLET_SIZE = 8
+BULLET_LIFETIME = 5000  # Shots that hit nothing expire after 5 seconds
 
-    def __init__(self, x, y, target_x, target_y):
-        self.rect = pygame.Rect(x, y, 8, 8)
+MISSILE_SPEED = 3  # Base missile speed
+MISSILE_SIZE = 16
+MISSILE_TURN_RATE = 0.05  # How quickly the missile turns toward the player
+MISSILE_EXPLOSION_RADIUS = 50  # Damage area on explosion
+MISSILE_DAMAGE = 2  # Damage dealt to enemies caught in the blast
+MISSILE_LIFETIME = 10000  # Missiles that never reach a wall blow up after 10 seconds
+
+POOL_CAPACITY = 512
+
+KIND_BULLET = 0
+KIND_MISSILE = 1
+
+
+class EnemyProjectilePool:
+    """Fixed-capacity ring buffer holding every enemy shot and boss missile, updated in batched passes."""
+
+    def __init__(self, map_width, map_height, capacity=POOL_CAPACITY):
+        self.MAP_WIDTH = map_width
+        self.MAP_HEIGHT = map_height
+        self.capacity = capacity
+        self.head = 0  # Where the search for a free slot starts; wraps around, overwriting only when full
+        self.live = 0
+        self.evicted = 0  # Live shots overwritten because the pool was full
+
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.x = np.zeros(capacity)  # Top-left of the projectile box
+        self.y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.angle = np.zeros(capacity)  # Heading, used for homing
+        self.size = np.zeros(capacity)
+        self.expire_time = np.zeros(capacity, dtype=np.int64)
+
+        # Pre-rendered sprites and their draw offsets, indexed by kind
+        bullet_sprite = pygame.Surface((BULLET_SIZE, BULLET_SIZE))
+        bullet_sprite.fill((222, 10, 10))
+        missile_sprite = pygame.Surface((MISSILE_SIZE + 4, MISSILE_SIZE + 4))
+        missile_sprite.fill((0, 0, 0))  # Outline
+        missile_sprite.fill((255, 50, 50), pygame.Rect(2, 2, MISSILE_SIZE, MISSILE_SIZE))  # Missile
+        self.sprites = [(bullet_sprite, 0), (missile_sprite, -2)]
+        self.scaled_sprites = {1.0: self.sprites}  # Per world render scale, built on first use
+
+    def _spawn(self, kind, x, y, angle, speed, size, lifetime):
+        i = self.head
+        if not self.alive[i]:
+            self.live += 1
+        elif self.live < self.capacity:
+            # ✅ Shots die out of order: skip live ones (e.g. a long-lived missile) and take the next free slot
+            free = np.flatnonzero(~self.alive)
+            after = free[free > i]
+            i = int(after[0] if len(after) else free[0])
+            self.live += 1
+        else:
+            self.evicted += 1  # Pool really full: the shot at the cursor makes room
+        self.head = (i + 1) % self.capacity
+
+        self.alive[i] = True
+        self.kind[i] = kind
+        self.x[i] = x
+        self.y[i] = y
+        self.angle[i] = angle
+        self.speed_x[i] = speed * math.cos(angle)
+        self.speed_y[i] = speed * math.sin(angle)
+        self.size[i] = size
+        self.expire_time[i] = GAME_CLOCK.now + lifetime
+
+    def fire(self, x, y, target_x, target_y):
+        """Fires a straight shot from (x, y) toward the target point."""
         angle = math.atan2(target_y - y, target_x - x)
-        self.speed_x = self.BULLET_SPEED * math.cos(angle)
-        self.speed_y = self.BULLET_SPEED * math.sin(angle)
+        self._spawn(KIND_BULLET, x, y, angle, BULLET_SPEED, BULLET_SIZE, BULLET_LIFETIME)
 
-    def update(self, player, obstacles, enemy_bullets):
-        """Moves the bullet and checks for collisions."""
-        self.rect.x += self.speed_x
-        self.rect.y += self.speed_y
+    def fire_missile(self, x, y, target):
+        """Fires a homing missile that slowly tracks `target` (the player) and explodes on wall impact."""
+        angle = math.atan2(target.rect.centery - y, target.rect.centerx - x)  # Initial trajectory
+        self._spawn(KIND_MISSILE, x, y, angle, MISSILE_SPEED, MISSILE_SIZE, MISSILE_LIFETIME)
 
-        # Check collision with player
-        if self.rect.colliderect(player.rect):
-            player.take_damage()
-            enemy_bullets.remove(self)
+    def __len__(self):
+        return self.live
+
+    def occupancy(self):
+        """Fraction of the pool in use (0-1)."""
+        return self.live / self.capacity
+
+    def _expire(self, mask):
+        self.alive &= ~mask
+        self.live -= int(mask.sum())
+
+    def _explode(self, mask, game):
+        """Detonates the missiles in `mask`, queueing their blasts with the AoE resolver."""
+        half = MISSILE_SIZE // 2
+        for i in np.flatnonzero(mask):
+            game.aoe.queue((int(self.x[i]) + half, int(self.y[i]) + half), MISSILE_EXPLOSION_RADIUS, MISSILE_DAMAGE)
+        self._expire(mask)
+
+    def update(self, player, game):
+        """Moves every projectile and resolves homing, expiry, player hits and wall hits in batched passes."""
+        if self.live == 0:
             return
 
-        # Check collision with obstacles
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle.rect):
-                enemy_bullets.remove(self)
-                return
+        alive = self.alive
+        missiles = alive & (self.kind == KIND_MISSILE)
+
+        # Homing logic - gradually adjust missile trajectories toward the player
+        if missiles.any():
+            size = self.size[missiles]
+            target_angle = np.arctan2(player.rect.centery - (self.y[missiles] + size // 2),
+                                      player.rect.centerx - (self.x[missiles] + size // 2))
+            angle = self.angle[missiles]
+            angle += (target_angle - angle) * MISSILE_TURN_RATE
+            self.angle[missiles] = angle
+            self.speed_x[missiles] = MISSILE_SPEED * np.cos(angle)
+            self.speed_y[missiles] = MISSILE_SPEED * np.sin(angle)
+
+        self.x += np.where(alive, self.speed_x, 0.0)
+        self.y += np.where(alive, self.speed_y, 0.0)
+
+        # Lifetime and out-of-bounds expiry
+        right, bottom = self.x + self.size, self.y + self.size
+        expired = alive & ((self.expire_time <= GAME_CLOCK.now) |
+                           (right < 0) | (bottom < 0) | (self.x > self.MAP_WIDTH) | (self.y > self.MAP_HEIGHT))
+        if expired.any():
+            self._explode(expired & missiles, game)
+            self._expire(expired & ~missiles)
+
+        # Check collision with player
+        rect = player.rect
+        hit_player = self.alive & (self.x < rect.right) & (right > rect.left) & (self.y < rect.bottom) & (bottom > rect.top)
+        if hit_player.any():
+            for _ in range(int(hit_player.sum())):
+                player.take_damage()
+            self._expire(hit_player)
+
+        # Check collision with obstacles (missiles explode on impact)
+        live_slots = np.flatnonzero(self.alive)
+        if len(live_slots):
+            size = self.size[live_slots]
+            wall_ids = game.world.lookup_rects(self.x[live_slots], self.y[live_slots], size, size)
+            hit_wall = np.zeros(self.capacity, dtype=bool)
+            hit_wall[live_slots[wall_ids > 0]] = True
+            if hit_wall.any():
+                self._explode(hit_wall & missiles, game)
+                self._expire(hit_wall & ~missiles)
+
+    def detonate_near(self, blasts, game):
+        """Chain reaction: missiles within any (x, y, radius) blast explode. Returns True if any did."""
+        missiles = self.alive & (self.kind == KIND_MISSILE)
+        if not missiles.any():
+            return False
+
+        half = MISSILE_SIZE / 2
+        dx = (self.x + half)[None, :] - blasts[:, 0, None]
+        dy = (self.y + half)[None, :] - blasts[:, 1, None]
+        caught = missiles & (dx * dx + dy * dy <= (blasts[:, 2] ** 2)[:, None]).any(axis=0)
+        if caught.any():
+            self._explode(caught, game)
+            return True
+        return False
 
     def draw(self, screen, camera_x, camera_y):
-        """Draws the enemy bullet."""
-        pygame.draw.rect(
-            screen,
-            (222, 10, 10),
-            pygame.Rect(self.rect.x - camera_x, self.rect.y - camera_y, self.rect.width, self.rect.height)
-        )
+        """Draws every live projectile in one blit batch."""
+        if self.live == 0:
+            return
+
+        slots = np.flatnonzero(self.alive)
+        scale = WORLD_VIEW.scale
+        sprites = self.scaled_sprites.get(scale)
+        if sprites is None:
+            sprites = self.scaled_sprites[scale] = [(scale_sprite(sprite, scale), round(offset * scale))
+                                                    for sprite, offset in self.sprites]
+        screen_x = ((self.x[slots] - camera_x) * scale).astype(np.int64).tolist()
+        screen_y = ((self.y[slots] - camera_y) * scale).astype(np.int64).tolist()
+        batch = []
+        for kind, sx, sy in zip(self.kind[slots].tolist(), screen_x, screen_y):
+            sprite, offset = sprites[kind]
+            batch.append((sprite, (sx + offset, sy + offset)))
+        screen.blits(batch, doreturn=False)
@@ -0,0 +1,80 @@
+import math
+import numpy as np
+from obstacle import CollisionRaster
+from gameclock import GAME_CLOCK
+
+SIGHT_CELL_SIZE = 16  # Pixels per sight-grid cell (coarse on purpose: a ray crosses few cells)
+SIGHT_CACHE_MS = 100  # How long a cell-pair answer is reused (~6 ticks)
+SIGHT_CACHE_LIMIT = 4096  # Cached pairs before expired ones are swept out
+
+
+class LineOfSight:
+    """Answers "can a shot from A reach B?" by walking a coarse blocked-cell grid with an Amanatides-Woo
+    DDA traversal. Any cell an obstacle touches counts as blocked, so a clear line is clear for a bullet too.
+    Answers are cached per (start cell, end cell) for SIGHT_CACHE_MS, so shooters standing still re-asking
+    every tick cost one dict lookup."""
+
+    def __init__(self, obstacles, width, height, cell_size=SIGHT_CELL_SIZE):
+        raster = CollisionRaster(obstacles, width, height, cell_size)
+        self.cell_size = cell_size
+        self.cols, self.rows = raster.cols, raster.rows
+        self.blocked = (raster.grid != 0).astype(np.uint8).tobytes()  # Flat bytes: cheap to index per cell
+        self.cache = {}  # (col0, row0, col1, row1) -> (clear, expires_at)
+        self.traces = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.cache)
+
+    def clear(self, x0, y0, x1, y1):
+        """True if nothing blocks the segment between the two world points (cached per cell pair)."""
+        cell = self.cell_size
+        key = (int(x0 // cell), int(y0 // cell), int(x1 // cell), int(y1 // cell))
+        now = GAME_CLOCK.now
+        cached = self.cache.get(key)
+        if cached is not None and cached[1] > now:
+            self.hits += 1
+            return cached[0]
+
+        if len(self.cache) >= SIGHT_CACHE_LIMIT:
+            self.cache = {k: v for k, v in self.cache.items() if v[1] > now}
+            if len(self.cache) >= SIGHT_CACHE_LIMIT:
+                self.cache.clear()
+        result = self._trace(x0, y0, x1, y1)
+        self.cache[key] = (result, now + SIGHT_CACHE_MS)
+        return result
+
+    def _trace(self, x0, y0, x1, y1):
+        """Steps cell by cell along the segment (always into the nearer grid line), stopping at the first
+        blocked cell. The start and end cells are skipped: that's where the shooter and target stand."""
+        self.traces += 1
+        cell = self.cell_size
+        col, row = int(x0 // cell), int(y0 // cell)
+        end_col, end_row = int(x1 // cell), int(y1 // cell)
+        dx, dy = x1 - x0, y1 - y0
+
+        # Ray parameter t (0..1 along the segment) at the next column / row boundary, and per cell crossed
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        if dx:
+            t_max_x = ((col + (step_col > 0)) * cell - x0) / dx
+            t_delta_x = cell / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy:
+            t_max_y = ((row + (step_row > 0)) * cell - y0) / dy
+            t_delta_y = cell / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        blocked, cols, rows = self.blocked, self.cols, self.rows
+        for _ in range(abs(end_col - col) + abs(end_row - row) - 1):  # Cells strictly between the two ends
+            if t_max_x < t_max_y:
+                col += step_col
+                t_max_x += t_delta_x
+            else:
+                row += step_row
+                t_max_y += t_delta_y
+            if 0 <= col < cols and 0 <= row < rows and blocked[row * cols + col]:
+                return False
+        return True
@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+GRID_CELL_SIZE = 128  # Pixels per spatial grid cell
+
+
+class SpatialGrid:
+    """Uniform grid that buckets entities by center so area queries only look at nearby cells."""
+
+    def __init__(self, entities, cell_size=GRID_CELL_SIZE):
+        self.entities = entities  # Live list the grid is rebuilt from (e.g. game.enemies)
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.max_half_extent = 0  # Largest half width/height seen, used to pad queries
+        self.dirty = True
+
+    def mark_dirty(self):
+        """Call once per tick (entities moved); the next query rebuilds the grid."""
+        self.dirty = True
+
+    def rebuild(self):
+        cells = defaultdict(list)
+        cell_size = self.cell_size
+        max_half_extent = 0
+
+        for entity in self.entities:
+            rect = entity.rect
+            if rect is None:
+                continue
+            cells[(rect.centerx // cell_size, rect.centery // cell_size)].append(entity)
+            half_extent = max(rect.width, rect.height) // 2 + 1
+            if half_extent > max_half_extent:
+                max_half_extent = half_extent
+
+        self.cells = cells
+        self.max_half_extent = max_half_extent
+        self.dirty = False
+
+    def query(self, rect):
+        """Returns candidate entities whose rect may overlap `rect` (a pygame.Rect in world space)."""
+        if self.dirty:
+            self.rebuild()
+
+        pad = self.max_half_extent
+        cell_size = self.cell_size
+        x0, x1 = (rect.left - pad) // cell_size, (rect.right + pad) // cell_size
+        y0, y1 = (rect.top - pad) // cell_size, (rect.bottom + pad) // cell_size
+
+        cells = self.cells
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
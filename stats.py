@@ -0,0 +1,128 @@
+# Modifier kinds, applied as (base + ADD) * (1 + sum of PERCENT) * product of MULTIPLY
+ADD = "add"
+PERCENT = "percent"
+MULTIPLY = "multiply"
+
+
+class Modifier:
+    """One change to one stat, owned by a source (ability name, buff name). Timed buffs carry an expiry."""
+    __slots__ = ("stat", "kind", "value", "source", "expires_at")
+
+    def __init__(self, stat, kind, value, source=None, expires_at=None):
+        self.stat = stat
+        self.kind = kind
+        self.value = value
+        self.source = source
+        self.expires_at = expires_at
+
+
+class StatBlock:
+    """Base stats plus modifiers. Final values are cached and only recomputed when a modifier is added,
+    removed or expires; `on_change(stats)` then runs once so the owner can refresh its derived values."""
+
+    def __init__(self, base, on_change=None):
+        self.base = dict(base)
+        self.modifiers = {stat: [] for stat in self.base}
+        self.values = {}
+        self.on_change = on_change
+        self.buffs = {}  # Source -> its timed modifiers
+        self.next_expiry = None  # Earliest buff expiry, so update() is O(1) while nothing expires
+        self._dirty = set(self.base)
+        self._recompute()
+
+    def __getitem__(self, stat):
+        return self.values[stat]
+
+    def add(self, stat, kind, value, source=None):
+        """Adds a permanent modifier."""
+        modifier = Modifier(stat, kind, value, source)
+        self.modifiers[stat].append(modifier)
+        self._dirty.add(stat)
+        self._recompute()
+        return modifier
+
+    def add_buff(self, source, modifiers, expires_at):
+        """Adds timed modifiers [(stat, kind, value)] under `source`, replacing an active buff of the same name."""
+        if source in self.buffs:
+            self._remove(self.buffs.pop(source))
+        buff = [Modifier(stat, kind, value, source, expires_at) for stat, kind, value in modifiers]
+        for modifier in buff:
+            self.modifiers[modifier.stat].append(modifier)
+            self._dirty.add(modifier.stat)
+        self.buffs[source] = buff
+        self.next_expiry = expires_at if self.next_expiry is None else min(self.next_expiry, expires_at)
+        self._recompute()
+
+    def has_buff(self, source):
+        return source in self.buffs
+
+    def remove_source(self, source):
+        """Removes every modifier (permanent or timed) owned by `source`."""
+        self.buffs.pop(source, None)
+        self._remove([modifier for stat_modifiers in self.modifiers.values() for modifier in stat_modifiers
+                      if modifier.source == source])
+        self._recompute()
+
+    def update(self, now):
+        """Expires buffs whose time has passed. Returns the names of the buffs that ended."""
+        if self.next_expiry is None or now <= self.next_expiry:
+            return ()
+        ended = [source for source, buff in self.buffs.items() if now > buff[0].expires_at]
+        for source in ended:
+            self._remove(self.buffs.pop(source))
+        self.next_expiry = min((buff[0].expires_at for buff in self.buffs.values()), default=None)
+        self._recompute()
+        return ended
+
+    def _remove(self, modifiers):
+        for modifier in modifiers:
+            self.modifiers[modifier.stat].remove(modifier)
+            self._dirty.add(modifier.stat)
+
+    def _recompute(self):
+        if not self._dirty:
+            return
+        for stat in self._dirty:
+            flat, percent, factor = 0, 0.0, 1.0
+            for modifier in self.modifiers[stat]:
+                if modifier.kind == ADD:
+                    flat += modifier.value
+                elif modifier.kind == PERCENT:
+                    percent += modifier.value
+                else:
+                    factor *= modifier.value
+            value = self.base[stat] + flat
+            if percent:
+                value *= 1 + percent
+            if factor != 1.0:
+                value *= factor
+            self.values[stat] = value
+        self._dirty.clear()
+        if self.on_change is not None:
+            self.on_change(self)
+
+
+class AbilitySet:
+    """Owned abilities in the order they were gained, with stack counts. O(1) membership and counts."""
+
+    def __init__(self, names=()):
+        self.stacks = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        self.stacks[name] = self.stacks.get(name, 0) + 1
+
+    append = add  # Reads naturally where this replaced a plain list
+
+    def count(self, name):
+        return self.stacks.get(name, 0)
+
+    def __contains__(self, name):
+        return name in self.stacks
+
+    def __iter__(self):
+        return iter(self.stacks)
+
+    def __len__(self):
+        return len(self.stacks)
@@ -1,8 +1,8 @@
 import pygame
 import math
-import random
-from enemy import Enemy, FastEnemy, TankEnemy, DasherEnemy, ShooterEnemy, DeathAnimation, SwarmEnemy
-from currency import CurrencyPickup
+from bullet import handle_enemy_kill
+from gameclock import GAME_CLOCK
+from display import WORLD_VIEW
 
 class SwordAttack:
     """Handles the sword attack logic."""
@@ -15,113 +15,109 @@ class SwordAttack:
         self.attacking = False
         self.attack_start_time = 0
         self.attack_duration = 300  # Sword remains visible for this duration
-        self.sword_angle = 0
+        self.sword_angle = 0  # Radians
+        self.previous_angle = None  # Blade angle last tick; the hit area is the arc swept since then
+        self.sword_cos, self.sword_sin = 1.0, 0.0  # Cached once per tick for hit tests and drawing
+        self.hit_this_swing = set()  # Each enemy is hit at most once per swing
         self.sword_offset = 80  # Distance of hilt from player center
         self.sword_length = 60  # Adjusted for bigger sword
         self.sword_width = 8  # Adjusted for bigger sword
 
     def can_attack(self):
         """Check if the sword attack is off cooldown."""
-        return pygame.time.get_ticks() - self.last_attack_time >= self.cooldown
+        return GAME_CLOCK.now - self.last_attack_time >= self.cooldown
 
     def start_attack(self):
         """Begin the sword attack."""
         if self.can_attack():
             self.attacking = True
-            self.attack_start_time = pygame.time.get_ticks()
-            self.last_attack_time = pygame.time.get_ticks()
+            self.attack_start_time = GAME_CLOCK.now
+            self.last_attack_time = GAME_CLOCK.now
+            self.previous_angle = None
+            self.hit_this_swing.clear()
 
     def update(self, enemies, game):
         """Update sword position and check if the attack duration has ended."""
         if self.attacking:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            self.sword_angle = math.degrees(math.atan2(
+            mouse_x, mouse_y = game.input_frame.mouse_pos
+            self.sword_angle = math.atan2(
                 (mouse_y + game.camera_y) - self.player.rect.centery,
                 (mouse_x + game.camera_x) - self.player.rect.centerx
-            ))
+            )
+            self.sword_cos, self.sword_sin = math.cos(self.sword_angle), math.sin(self.sword_angle)
 
-            if pygame.time.get_ticks() - self.attack_start_time >= self.attack_duration:
+            if GAME_CLOCK.now - self.attack_start_time >= self.attack_duration:
                 self.attacking = False
 
         # Check for enemy hits
         if self.attacking:
-            self.execute_attack(enemies, game, self.player)
-
-    def execute_attack(self, enemies, game, player):
-        """Deal damage to enemies within the sword hitbox and handle XP, score, and drops."""
-        """Deal damage to enemies within the sword hitbox."""
-        hilt_x = self.player.rect.centerx + self.sword_offset * math.cos(math.radians(self.sword_angle))
-        hilt_y = self.player.rect.centery + self.sword_offset * math.sin(math.radians(self.sword_angle))
-        sword_tip_x = hilt_x + self.sword_length * math.cos(math.radians(self.sword_angle))
-        sword_tip_y = hilt_y + self.sword_length * math.sin(math.radians(self.sword_angle))
-
-        for enemy in enemies:
-            if math.hypot(enemy.rect.centerx - (hilt_x + sword_tip_x) / 2,
-                          enemy.rect.centery - (hilt_y + sword_tip_y) / 2) < self.sword_length / 2:
-                enemy_died = enemy.take_damage()
-                if enemy_died:
-                    game.death_animations.append(DeathAnimation(enemy.rect.x, enemy.rect.y, enemy.rect.width))
-                    enemies.remove(enemy)
-
-                    # ✅ Handle XP & Score Rewards
-                    if isinstance(enemy, FastEnemy):
-                        game.score += 75
-                        game.player.gain_xp(4, game)
-                        drop_chance = 0.3
-                        currency_amount = random.randint(1, 3)
-                    elif isinstance(enemy, TankEnemy):
-                        game.score += 200
-                        game.player.gain_xp(8, game)
-                        drop_chance = 0.7
-                        currency_amount = random.randint(3, 7)
-                    elif isinstance(enemy, DasherEnemy):
-                        game.score += 100
-                        game.player.gain_xp(12, game)
-                        drop_chance = 0.5
-                        currency_amount = random.randint(2, 5)
-                    elif isinstance(enemy, ShooterEnemy):
-                        game.score += 100
-                        game.player.gain_xp(14, game)
-                        drop_chance = 0.5
-                        currency_amount = random.randint(2, 4)
-                    elif isinstance(enemy, SwarmEnemy):
-                        game.score += 5
-                        game.player.gain_xp(2, game)
-                        drop_chance = 0.2
-                        currency_amount = 1
-                    else:
-                        game.score += 50
-                        game.player.gain_xp(3, game)
-                        drop_chance = 0.4
-                        currency_amount = random.randint(1, 2)
-
-                    # ✅ Drop Currency with Random Chance
-                    if random.random() < drop_chance:
-                        currency_pickup = CurrencyPickup(enemy.rect.centerx, enemy.rect.centery, currency_amount)
-                        game.currency_drops.append(currency_pickup)
+            self.execute_attack(game)
+            self.previous_angle = self.sword_angle
+
+    def execute_attack(self, game):
+        """Deal damage to enemies inside the arc the blade swept since last tick, once per swing."""
+        center_x, center_y = self.player.rect.center
+        inner_radius = self.sword_offset
+        outer_radius = self.sword_offset + self.sword_length
+
+        # Swept angle interval, taking the short way round
+        start_angle = self.sword_angle if self.previous_angle is None else self.previous_angle
+        sweep = (self.sword_angle - start_angle + math.pi) % (2 * math.pi) - math.pi
+        mid_angle = start_angle + sweep / 2
+        half_sweep = abs(sweep) / 2
+
+        # Broad phase: only enemies near the blade's circle
+        reach = outer_radius + self.sword_width
+        area = pygame.Rect(center_x - reach, center_y - reach, reach * 2, reach * 2)
+
+        hits = []
+        for enemy in game.enemy_grid.query(area):
+            if enemy in self.hit_this_swing or enemy.is_dying:
+                continue  # Nothing is hit twice per swing
+
+            dx, dy = enemy.rect.centerx - center_x, enemy.rect.centery - center_y
+            pad = enemy.rect.width / 2 + self.sword_width
+            distance = math.hypot(dx, dy)
+            if not inner_radius - pad <= distance <= outer_radius + pad:
+                continue
+
+            # Angular slack so enemies touching the blade's edge still count
+            slack = math.asin(min(1.0, pad / distance)) if distance > 0 else math.pi
+            offset = abs((math.atan2(dy, dx) - mid_angle + math.pi) % (2 * math.pi) - math.pi)
+            if offset <= half_sweep + slack:
+                hits.append(enemy)
+
+        # Apply after the scan so nothing is removed from a list mid-iteration
+        for enemy in hits:
+            self.hit_this_swing.add(enemy)
+            if enemy.take_damage():
+                handle_enemy_kill(enemy, game)
 
     def draw(self, screen, game):
         """Draw a simple sword-like shape following the cursor direction, ensuring the hilt rotates around the player."""
         if self.attacking:
+            cos_a, sin_a = self.sword_cos, self.sword_sin
+
             # Calculate sword hilt position along a circular path around the player
-            hilt_x = self.player.rect.centerx + self.sword_offset * math.cos(math.radians(self.sword_angle))
-            hilt_y = self.player.rect.centery + self.sword_offset * math.sin(math.radians(self.sword_angle))
+            hilt_x = self.player.rect.centerx + self.sword_offset * cos_a
+            hilt_y = self.player.rect.centery + self.sword_offset * sin_a
 
             # Calculate sword tip and base
-            tip_x = hilt_x + self.sword_length * math.cos(math.radians(self.sword_angle))
-            tip_y = hilt_y + self.sword_length * math.sin(math.radians(self.sword_angle))
-            base_x = hilt_x - (self.sword_length * 0.3) * math.cos(math.radians(self.sword_angle))
-            base_y = hilt_y - (self.sword_length * 0.3) * math.sin(math.radians(self.sword_angle))
+            tip_x = hilt_x + self.sword_length * cos_a
+            tip_y = hilt_y + self.sword_length * sin_a
+            base_x = hilt_x - (self.sword_length * 0.3) * cos_a
+            base_y = hilt_y - (self.sword_length * 0.3) * sin_a
 
-            # Calculate side points for width
-            left_x = base_x + self.sword_width * math.cos(math.radians(self.sword_angle + 90))
-            left_y = base_y + self.sword_width * math.sin(math.radians(self.sword_angle + 90))
-            right_x = base_x + self.sword_width * math.cos(math.radians(self.sword_angle - 90))
-            right_y = base_y + self.sword_width * math.sin(math.radians(self.sword_angle - 90))
+            # Calculate side points for width (perpendicular to the blade)
+            left_x = base_x - self.sword_width * sin_a
+            left_y = base_y + self.sword_width * cos_a
+            right_x = base_x + self.sword_width * sin_a
+            right_y = base_y - self.sword_width * cos_a
 
             # Draw sword shape
+            scale = WORLD_VIEW.scale
             pygame.draw.polygon(screen, (200, 200, 200), [
-                (tip_x - game.camera_x, tip_y - game.camera_y),
-                (left_x - game.camera_x, left_y - game.camera_y),
-                (right_x - game.camera_x, right_y - game.camera_y)
+                ((tip_x - game.camera_x) * scale, (tip_y - game.camera_y) * scale),
+                ((left_x - game.camera_x) * scale, (left_y - game.camera_y) * scale),
+                ((right_x - game.camera_x) * scale, (right_y - game.camera_y) * scale)
             ])
@@ -0,0 +1,124 @@
+WHEEL_LEVELS = (8, 6, 6, 6)  # Bits per level: 256 1ms slots, then 64 coarser slots per level (~18 hours, then overflow)
+
+
+class Timer:
+    """A scheduled callback. Cancelling just marks it; the wheel drops it when its slot comes up."""
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Hierarchical timing wheel on game time (ms). Scheduling and cancelling are O(1), and advancing
+    only touches the slots that time passes over, so per-tick cost scales with the timers that fire,
+    not with how many entities are waiting on one."""
+
+    def __init__(self, now=0):
+        self.shifts = []
+        shift = 0
+        for bits in WHEEL_LEVELS:
+            self.shifts.append(shift)
+            shift += bits
+        self.masks = [(1 << bits) - 1 for bits in WHEEL_LEVELS]
+        self.reset(now)
+
+    def reset(self, now=0):
+        self.current = now
+        self.levels = [[[] for _ in range(1 << bits)] for bits in WHEEL_LEVELS]
+        self.level_counts = [0] * len(WHEEL_LEVELS)  # Timers per level, so empty stretches are skipped
+        self.overflow = []  # Beyond the top level's span (re-placed as time catches up)
+        self.due = []  # Scheduled at or before `current`: run on the next advance
+        self.count = 0
+        self.fired = 0
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, deadline, callback, *args):
+        """Runs callback(*args) on the first advance() whose time reaches `deadline`. Returns the Timer."""
+        timer = Timer(int(deadline), callback, args)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def _place(self, timer):
+        delta = timer.deadline - self.current
+        if delta <= 0:
+            self.due.append(timer)
+            return
+        for level, shift in enumerate(self.shifts):
+            if delta < 1 << (shift + WHEEL_LEVELS[level]):
+                self.levels[level][(timer.deadline >> shift) & self.masks[level]].append(timer)
+                self.level_counts[level] += 1
+                return
+        self.overflow.append(timer)
+
+    def advance(self, now):
+        """Moves the wheel up to `now`, running every timer that came due (in deadline-slot order)."""
+        if self.due:
+            self._run(self.due)
+            self.due = []
+        if self.count == 0:
+            self.current = max(self.current, now)  # ✅ Nothing scheduled: jump straight there
+            return
+        wheel = self.levels[0]
+        mask = self.masks[0]
+        while self.current < now:
+            if not self.level_counts[0]:
+                # ✅ Fine wheel empty: jump to the next boundary where a non-empty coarse level cascades
+                level = 1
+                while level < len(self.levels) and not self.level_counts[level]:
+                    level += 1
+                span = 1 << (self.shifts[level] if level < len(self.levels) else self.shifts[-1] + WHEEL_LEVELS[-1])
+                boundary = (self.current | (span - 1)) + 1
+                if boundary > now:
+                    self.current = now
+                    break
+                self.current = boundary - 1
+            self.current += 1
+            index = self.current & mask
+            if index == 0:
+                self._cascade(1)
+            slot = wheel[index]
+            if slot:
+                wheel[index] = []
+                self.level_counts[0] -= len(slot)
+                self._run(slot)
+            if self.count == 0:
+                self.current = now
+                break
+
+    def _cascade(self, level):
+        """Re-places the coarse slot the wheel just reached; its timers fall into finer levels."""
+        if level == len(self.levels):
+            timers, self.overflow = self.overflow, []
+        else:
+            index = (self.current >> self.shifts[level]) & self.masks[level]
+            if index == 0:
+                self._cascade(level + 1)
+            timers = self.levels[level][index]
+            self.levels[level][index] = []
+            self.level_counts[level] -= len(timers)
+        for timer in timers:
+            if timer.cancelled:
+                self.count -= 1
+            else:
+                self._place(timer)
+        # Timers placed exactly on `current` land in `due`; run them with this tick's slot
+        if self.due and level == 1:
+            due, self.due = self.due, []
+            self._run(due)
+
+    def _run(self, timers):
+        for timer in timers:
+            self.count -= 1
+            if not timer.cancelled:
+                self.fired += 1
+                timer.callback(*timer.args)
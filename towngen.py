@@ -0,0 +1,265 @@
+import os
+import random
+import hashlib
+import bisect
+import zipfile
+from collections import deque
+import numpy as np
+import pygame
+from obstacle import Obstacle
+from ioworker import IO_WORKER
+
+GENERATOR_VERSION = 1  # Bump when generation changes so stale cache files are ignored
+CACHE_DIR = "cache"
+SEED_ENV = "LAST_STAND_SEED"  # Override the town seed (otherwise it comes from the game's RNG seed)
+
+EDGE_MARGIN = 80  # Keep buildings off the border walls
+SAFE_ZONE = 200  # Half-size of the empty square around the player start
+ROAD_WIDTH = 140
+ROAD_SPACING = (600, 900)  # Distance between parallel roads
+BUILDING_SIZE = (180, 380)  # Min/max building side
+BUILDING_GAP = 80  # Min space between buildings (wider than the biggest enemy)
+BUILDINGS_PER_MEGAPIXEL = 4.0
+PROP_RADIUS = (18, 40)  # Circle props (trees, wells)
+PROPS_PER_MEGAPIXEL = 2.0
+ATTEMPTS_PER_OBJECT = 10  # Rejection sampling tries before giving up on an object
+NAV_CELL = 32  # Connectivity grid resolution
+NAV_CLEARANCE = 25  # Half the biggest walker (tank enemy); cells closer than this to an obstacle are blocked
+
+
+def town_seed(game_random):
+    """Seed from LAST_STAND_SEED if set, otherwise the one spawned from the game's root seed (rng.GameRandom)."""
+    value = os.environ.get(SEED_ENV)
+    return int(value) if value else game_random.town_seed
+
+
+class TownLayout:
+    """A generated town: obstacles, road rects and the walkable nav grid used for the connectivity check."""
+
+    def __init__(self, seed, width, height, obstacles, roads, walkable):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+        self.roads = roads
+        self.walkable = walkable  # (rows, cols) bool grid of NAV_CELL cells
+        self.from_cache = False
+
+
+class PlacementGrid:
+    """Uniform hash of placed rects so overlap tests only look at nearby cells."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _cells(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def overlaps(self, rect):
+        return any(rect.colliderect(other) for cell in self._cells(rect) for other in self.cells.get(cell, ()))
+
+    def add(self, rect):
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, []).append(rect)
+
+
+class RoadIndex:
+    """Axis-aligned roads sorted by position, so 'does this rect touch a road' is a bisect, not a scan."""
+
+    def __init__(self, positions, width):
+        self.positions = sorted(positions)
+        self.width = width
+
+    def touches(self, start, end):
+        """True if the span [start, end) overlaps any road."""
+        i = bisect.bisect_right(self.positions, start - self.width)
+        return i < len(self.positions) and self.positions[i] < end
+
+
+def _road_positions(rng, length, start):
+    """Road offsets along one axis: one through the player start, then randomly spaced both ways."""
+    positions = [start - ROAD_WIDTH // 2]
+    position = positions[0]
+    while True:
+        position -= rng.randint(*ROAD_SPACING)
+        if position < EDGE_MARGIN:
+            break
+        positions.append(position)
+    position = positions[0]
+    while True:
+        position += rng.randint(*ROAD_SPACING)
+        if position + ROAD_WIDTH > length - EDGE_MARGIN:
+            break
+        positions.append(position)
+    return positions
+
+
+def _cache_path(seed, width, height, start):
+    params = (GENERATOR_VERSION, seed, width, height, start, EDGE_MARGIN, SAFE_ZONE, ROAD_WIDTH, ROAD_SPACING,
+              BUILDING_SIZE, BUILDING_GAP, BUILDINGS_PER_MEGAPIXEL, PROP_RADIUS, PROPS_PER_MEGAPIXEL,
+              ATTEMPTS_PER_OBJECT, NAV_CELL, NAV_CLEARANCE)
+    key = hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"town_{seed}_{width}x{height}_{key}.npz")
+
+
+def _pack(layout):
+    """The layout as plain arrays (copies), safe to hand to the I/O thread."""
+    obstacles = layout.obstacles
+    return {
+        "is_circle": np.array([obstacle.shape == "circle" for obstacle in obstacles], dtype=bool),
+        "boxes": np.array([(o.x, o.y, o.width, o.height) for o in obstacles], dtype=np.int32).reshape(-1, 4),
+        "roads": np.array([tuple(road) for road in layout.roads], dtype=np.int32).reshape(-1, 4),
+        "walkable": layout.walkable.copy(),
+    }
+
+
+def _save(path, arrays):
+    """Writes packed arrays to a temp file and swaps it in, so a crash mid-save never leaves a torn cache file.
+    Runs on the I/O thread."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:  # A file object, so numpy doesn't append ".npz" to the temp name
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return path
+
+
+def _load(path, seed, width, height):
+    with np.load(path) as data:
+        obstacles = [Obstacle("circle", x, y, w) if circle else Obstacle("rectangle", x, y, w, h)
+                     for circle, (x, y, w, h) in zip(data["is_circle"].tolist(), data["boxes"].tolist())]
+        roads = [pygame.Rect(road) for road in data["roads"].tolist()]
+        return TownLayout(seed, width, height, obstacles, roads, data["walkable"])
+
+
+def nav_grid(obstacles, width, height):
+    """Walkable grid: False where a NAV_CLEARANCE-sized walker centered in the cell would touch an obstacle."""
+    cols, rows = -(-width // NAV_CELL), -(-height // NAV_CELL)
+    walkable = np.ones((rows, cols), dtype=bool)
+    for obstacle in obstacles:
+        rect = obstacle.rect.inflate(NAV_CLEARANCE * 2, NAV_CLEARANCE * 2)
+        # A cell is blocked if its center lies inside the inflated obstacle
+        x0 = max(-(-(rect.left - NAV_CELL // 2) // NAV_CELL), 0)
+        y0 = max(-(-(rect.top - NAV_CELL // 2) // NAV_CELL), 0)
+        x1 = min(-(-(rect.right - NAV_CELL // 2) // NAV_CELL), cols)
+        y1 = min(-(-(rect.bottom - NAV_CELL // 2) // NAV_CELL), rows)
+        if x0 < x1 and y0 < y1:
+            walkable[y0:y1, x0:x1] = False
+    return walkable
+
+
+def _reachable(walkable, start):
+    """Flood fill from `start` (row, col) over walkable cells."""
+    rows, cols = walkable.shape
+    seen = np.zeros_like(walkable)
+    open_cells = walkable.ravel()
+    flat = seen.ravel()
+    first = start[0] * cols + start[1]
+    flat[first] = True
+    queue = deque([first])
+    while queue:
+        cell = queue.popleft()
+        col = cell % cols
+        for neighbour in (cell - cols, cell + cols, cell - 1 if col > 0 else -1, cell + 1 if col < cols - 1 else -1):
+            if 0 <= neighbour < len(flat) and open_cells[neighbour] and not flat[neighbour]:
+                flat[neighbour] = True
+                queue.append(neighbour)
+    return seen
+
+
+def connect_regions(obstacles, width, height, start):
+    """Removes obstacles until every walkable cell is reachable from `start`. Returns (obstacles, walkable)."""
+    start_cell = (start[1] // NAV_CELL, start[0] // NAV_CELL)
+    while True:
+        walkable = nav_grid(obstacles, width, height)
+        walkable[start_cell] = True
+        pockets = walkable & ~_reachable(walkable, start_cell)
+        if not pockets.any():
+            return obstacles, walkable
+
+        # ✅ Carve an L-shaped road from the first sealed-off pocket back toward the start
+        row, col = (int(v) for v in np.argwhere(pockets)[0])
+        corridor = [pygame.Rect(min(col, start_cell[1]) * NAV_CELL, row * NAV_CELL,
+                                (abs(col - start_cell[1]) + 1) * NAV_CELL, NAV_CELL),
+                    pygame.Rect(start_cell[1] * NAV_CELL, min(row, start_cell[0]) * NAV_CELL,
+                                NAV_CELL, (abs(row - start_cell[0]) + 1) * NAV_CELL)]
+        corridor = [rect.inflate(NAV_CLEARANCE * 2, NAV_CLEARANCE * 2) for rect in corridor]
+        kept = [obstacle for obstacle in obstacles if obstacle.rect.collidelist(corridor) == -1]
+        if len(kept) == len(obstacles):
+            return obstacles, walkable  # Nothing left to remove (shouldn't happen)
+        print(f"🏘️ Sealed pocket at {col * NAV_CELL},{row * NAV_CELL}: removed {len(obstacles) - len(kept)} obstacle(s)")
+        obstacles = kept
+
+
+def generate_town(seed, width, height, start, use_cache=True):
+    """Seeded town: a road grid through the start, buildings and props placed by grid-accelerated
+    rejection sampling off the roads, then a connectivity pass. Cached on disk by seed and parameters."""
+    path = _cache_path(seed, width, height, start)
+    if use_cache and os.path.exists(path):
+        try:
+            layout = _load(path, seed, width, height)
+            layout.from_cache = True
+            return layout
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            # Corrupt or truncated cache file: throw it away and generate the town again
+            print(f"🏘️ Town cache {path} unreadable ({e!r}), regenerating")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    rng = random.Random(seed)
+    start_x, start_y = start
+    road_xs = _road_positions(rng, width, start_x)  # Vertical roads
+    road_ys = _road_positions(rng, height, start_y)  # Horizontal roads
+    vertical_roads = RoadIndex(road_xs, ROAD_WIDTH)
+    horizontal_roads = RoadIndex(road_ys, ROAD_WIDTH)
+    roads = ([pygame.Rect(x, 0, ROAD_WIDTH, height) for x in road_xs] +
+             [pygame.Rect(0, y, width, ROAD_WIDTH) for y in road_ys])
+
+    safe_zone = pygame.Rect(start_x - SAFE_ZONE, start_y - SAFE_ZONE, SAFE_ZONE * 2, SAFE_ZONE * 2)
+    placed = PlacementGrid(BUILDING_SIZE[1] + BUILDING_GAP)
+    obstacles = []
+    megapixels = width * height / 1_000_000
+
+    def try_place(rect):
+        padded = rect.inflate(BUILDING_GAP, BUILDING_GAP)
+        if (rect.left < EDGE_MARGIN or rect.top < EDGE_MARGIN or
+                rect.right > width - EDGE_MARGIN or rect.bottom > height - EDGE_MARGIN):
+            return False
+        if (vertical_roads.touches(rect.left, rect.right) or horizontal_roads.touches(rect.top, rect.bottom) or
+                rect.colliderect(safe_zone) or placed.overlaps(padded)):
+            return False
+        placed.add(rect)
+        return True
+
+    target = int(megapixels * BUILDINGS_PER_MEGAPIXEL)
+    for _ in range(target * ATTEMPTS_PER_OBJECT):
+        if len(obstacles) >= target:
+            break
+        w, h = rng.randint(*BUILDING_SIZE), rng.randint(*BUILDING_SIZE)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        if try_place(pygame.Rect(x, y, w, h)):
+            obstacles.append(Obstacle("rectangle", x, y, w, h))
+
+    buildings = len(obstacles)
+    target = int(megapixels * PROPS_PER_MEGAPIXEL)
+    for _ in range(target * ATTEMPTS_PER_OBJECT):
+        if len(obstacles) - buildings >= target:
+            break
+        diameter = rng.randint(*PROP_RADIUS) * 2
+        x, y = rng.randint(0, width - diameter), rng.randint(0, height - diameter)
+        if try_place(pygame.Rect(x, y, diameter, diameter)):
+            obstacles.append(Obstacle("circle", x, y, diameter))
+
+    obstacles, walkable = connect_regions(obstacles, width, height, start)
+    layout = TownLayout(seed, width, height, obstacles, roads, walkable)
+    if use_cache:
+        IO_WORKER.submit(_save, path, _pack(layout))  # ✅ Compressing and fsyncing stays off the loading path
+    return layout
@@ -0,0 +1,279 @@
+import pygame
+import numpy as np
+from collections import OrderedDict
+from assets import ASSETS
+from obstacle import CollisionRaster, lookup_rect_corners
+from display import WORLD_VIEW
+from sightline import LineOfSight
+
+# The one place the map size lives (game, player and projectile pools all read it from here)
+MAP_WIDTH, MAP_HEIGHT = 2560, 1920
+CHUNK_SIZE = 512  # World pixels per chunk side
+CHUNK_CACHE_BYTES = 48 * 1024 * 1024  # LRU cap for baked backgrounds + collision rasters
+PREFETCH_RING = 1  # Chunks around the view baked ahead of time
+PREFETCH_PER_FRAME = 1  # Off-screen bakes per frame, so walking never causes a hitch
+
+WALL_THICKNESS = 10  # Visual border thickness
+
+# Texture sizes (loaded lazily through the asset manager)
+FLOOR_TILE_SIZE = (128, 128)  # Resize to a smaller tile size
+GRASS_TILE_SIZE = (128, 128)
+WALL_TILE_SIZE = (30, 30)
+
+
+def _tile_range(start, end, step, lo=None, hi=None):
+    """World positions of the `step`-aligned tiles overlapping [start, end), optionally kept inside [lo, hi)."""
+    first = start - start % step
+    if lo is not None:
+        first = max(first, lo)
+    if hi is not None:
+        end = min(end, hi)
+    return range(first, end, step)
+
+
+class Chunk:
+    """One CHUNK_SIZE square of the world: its obstacles plus a lazily baked background and collision raster."""
+
+    def __init__(self, cx, cy, obstacles):
+        self.cx, self.cy = cx, cy
+        self.x, self.y = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+        self.obstacles = obstacles
+        self.surface = None
+        self.scaled = None  # Background resized for a reduced world render scale
+        self.scaled_for = None
+        self.raster = None
+
+    def nbytes(self):
+        size = 0
+        if self.surface is not None:
+            size += self.surface.get_bytesize() * CHUNK_SIZE * CHUNK_SIZE
+        if self.scaled is not None:
+            width, height = self.scaled.get_size()
+            size += self.scaled.get_bytesize() * width * height
+        if self.raster is not None:
+            size += self.raster.grid.nbytes
+        return size
+
+    def bake_raster(self):
+        self.raster = CollisionRaster(self.obstacles, CHUNK_SIZE, CHUNK_SIZE, origin=(self.x, self.y),
+                                      ids=[obstacle.obstacle_id for obstacle in self.obstacles])
+
+    def bake_surface(self, map_width, map_height):
+        """Pre-renders floor, outer grass and border walls for this chunk into one surface."""
+        floor_texture = ASSETS.get("floor", FLOOR_TILE_SIZE)
+        grass_texture = ASSETS.get("grass", GRASS_TILE_SIZE)
+        wall_texture = ASSETS.get("wall", WALL_TILE_SIZE)
+
+        surface = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        x0, y0 = self.x, self.y
+        x1, y1 = x0 + CHUNK_SIZE, y0 + CHUNK_SIZE
+
+        floor_w, floor_h = floor_texture.get_size()
+        for x in _tile_range(x0, x1, floor_w, 0, map_width):
+            for y in _tile_range(y0, y1, floor_h, 0, map_height):
+                surface.blit(floor_texture, (x - x0, y - y0))
+
+        # Grass only outside the playable area
+        grass_w, grass_h = grass_texture.get_size()
+        for x in _tile_range(x0, x1, grass_w):
+            for y in _tile_range(y0, y1, grass_h):
+                if x < 0 or y < 0 or x >= map_width or y >= map_height:
+                    surface.blit(grass_texture, (x - x0, y - y0))
+
+        # Walls along the map border
+        wall_w, wall_h = wall_texture.get_size()
+        for x in _tile_range(x0 - wall_w, x1, wall_w, 0, map_width):
+            surface.blit(wall_texture, (x - x0, -y0))  # Top
+            surface.blit(wall_texture, (x - x0, map_height - WALL_THICKNESS - y0))  # Bottom
+        for y in _tile_range(y0 - wall_h, y1, wall_h, 0, map_height):
+            surface.blit(wall_texture, (-x0, y - y0))  # Left
+            surface.blit(wall_texture, (map_width - WALL_THICKNESS - x0, y - y0))  # Right
+
+        self.surface = surface
+
+    def ready(self, scale):
+        """True if the background for this render scale is already baked."""
+        return self.surface is not None and (scale == 1.0 or self.scaled_for == scale)
+
+    def scale_surface(self, scale):
+        """Resizes the baked background once per render scale, so each frame is still a plain blit."""
+        size = (round(CHUNK_SIZE * scale), round(CHUNK_SIZE * scale))
+        if self.surface.get_bitsize() >= 24:
+            self.scaled = pygame.transform.smoothscale(self.surface, size)
+        else:
+            self.scaled = pygame.transform.scale(self.surface, size)  # smoothscale needs 24/32-bit surfaces
+        self.scaled_for = scale
+
+
+class World:
+    """Chunked map. Obstacles are bucketed per chunk; backgrounds and rasters are baked around the camera
+    and evicted least-recently-used once the cache passes `cache_bytes`."""
+
+    def __init__(self, obstacles, width=MAP_WIDTH, height=MAP_HEIGHT, cache_bytes=CHUNK_CACHE_BYTES):
+        self.width = width
+        self.height = height
+        self.cache_bytes = cache_bytes
+        self.obstacles = obstacles
+        self.chunk_cols = -(-width // CHUNK_SIZE)
+        self.chunk_rows = -(-height // CHUNK_SIZE)
+
+        # Obstacle data per chunk (small, kept for the whole run). Ids are index + 1 into self.obstacles.
+        self.chunk_obstacles = {}
+        for obstacle_id, obstacle in enumerate(obstacles, 1):
+            obstacle.obstacle_id = obstacle_id
+            for key in self._keys_for(obstacle.rect.inflate(2, 2)):
+                self.chunk_obstacles.setdefault(key, []).append(obstacle)
+
+        self.sight = LineOfSight(obstacles, width, height)  # Coarse whole-map grid for ranged AI line of sight
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, least recently used first
+        self.used_bytes = 0
+        self.pinned = set()  # Chunks on screen this frame; never evicted
+        self.baked = 0
+        self.evicted = 0
+
+    def _keys_for(self, rect):
+        """Chunk keys (inside the map) overlapped by a world rect."""
+        cx0 = max(rect.left // CHUNK_SIZE, 0)
+        cy0 = max(rect.top // CHUNK_SIZE, 0)
+        cx1 = min((rect.right - 1) // CHUNK_SIZE, self.chunk_cols - 1)
+        cy1 = min((rect.bottom - 1) // CHUNK_SIZE, self.chunk_rows - 1)
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def chunk(self, key):
+        """Returns the chunk for `key`, creating it if needed, and marks it most recently used."""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(key[0], key[1], self.chunk_obstacles.get(key, []))
+        else:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def _account(self, chunk, before):
+        self.used_bytes += chunk.nbytes() - before
+        self.baked += 1
+        # ✅ Evict the least recently used chunks until back under the cap
+        for key in list(self.chunks):
+            if self.used_bytes <= self.cache_bytes:
+                break
+            if key in self.pinned or self.chunks[key] is chunk:
+                continue
+            self.used_bytes -= self.chunks.pop(key).nbytes()
+            self.evicted += 1
+
+    def _raster(self, key):
+        chunk = self.chunk(key)
+        if chunk.raster is None:
+            before = chunk.nbytes()
+            chunk.bake_raster()
+            self._account(chunk, before)
+        return chunk.raster
+
+    def _surface(self, key, scale=1.0):
+        chunk = self.chunk(key)
+        if not chunk.ready(scale):
+            before = chunk.nbytes()
+            if chunk.surface is None:
+                chunk.bake_surface(self.width, self.height)
+            if scale != 1.0:
+                chunk.scale_surface(scale)
+            self._account(chunk, before)
+        return chunk.surface if scale == 1.0 else chunk.scaled
+
+    # --- Obstacle queries ---
+
+    def obstacles_near(self, rect):
+        """Obstacles in the chunks a rect overlaps (may repeat obstacles that span chunks)."""
+        return [obstacle for key in self._keys_for(rect) for obstacle in self.chunk_obstacles.get(key, ())]
+
+    def collides(self, rect):
+        """True if the rect hits any obstacle. Only checks obstacles in the chunks it overlaps."""
+        if rect is None:
+            return False  # Avoid errors when checking dead enemies
+        # Hot path (every enemy move and push): walk the chunk range inline instead of building key lists
+        chunk_obstacles = self.chunk_obstacles
+        cy0 = max(rect.top // CHUNK_SIZE, 0)
+        cy1 = min((rect.bottom - 1) // CHUNK_SIZE, self.chunk_rows - 1)
+        for cx in range(max(rect.left // CHUNK_SIZE, 0), min((rect.right - 1) // CHUNK_SIZE, self.chunk_cols - 1) + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = chunk_obstacles.get((cx, cy))
+                if bucket:
+                    for obstacle in bucket:
+                        if obstacle.collides(rect):
+                            return True
+        return False
+
+    def line_of_sight(self, x0, y0, x1, y1):
+        """True if no obstacle stands between the two points (cached, see LineOfSight)."""
+        return self.sight.clear(x0, y0, x1, y1)
+
+    def lookup(self, xs, ys):
+        """Obstacle id (0 if free) under each point, using the per-chunk collision rasters."""
+        ids = np.zeros(len(xs), dtype=np.int32)
+        on_map = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not on_map.any():
+            return ids
+        keys = np.where(on_map, (ys // CHUNK_SIZE).astype(np.int64) * self.chunk_cols +
+                        (xs // CHUNK_SIZE).astype(np.int64), -1)
+        for key in np.unique(keys[on_map]).tolist():
+            coords = (key % self.chunk_cols, key // self.chunk_cols)
+            if coords not in self.chunk_obstacles:
+                continue  # Open ground: no raster needed
+            mask = keys == key
+            ids[mask] = self._raster(coords).lookup(xs[mask], ys[mask])
+        return ids
+
+    def lookup_rects(self, xs, ys, width, height):
+        """Same as CollisionRaster.lookup_rects, across chunks."""
+        return lookup_rect_corners(self.lookup, xs, ys, width, height)
+
+    # --- Rendering ---
+
+    def _view_keys(self, camera_x, camera_y, view_width, view_height, ring=0):
+        """Chunk keys covering the view (plus `ring` chunks around it). May lie outside the map (grass)."""
+        cx0 = camera_x // CHUNK_SIZE - ring
+        cy0 = camera_y // CHUNK_SIZE - ring
+        cx1 = (camera_x + view_width - 1) // CHUNK_SIZE + ring
+        cy1 = (camera_y + view_height - 1) // CHUNK_SIZE + ring
+        return [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+
+    def draw_background(self, screen, camera_x, camera_y):
+        """Blits the baked chunks under the view, then bakes a neighbouring chunk ahead of the camera."""
+        scale = WORLD_VIEW.scale
+        view_width, view_height = (int(side / scale) for side in screen.get_size())  # View size in world px
+        visible = self._view_keys(camera_x, camera_y, view_width, view_height)
+        self.pinned = set(visible)
+
+        if scale == 1.0:
+            screen.blits([(self._surface(key), (key[0] * CHUNK_SIZE - camera_x, key[1] * CHUNK_SIZE - camera_y))
+                          for key in visible], doreturn=False)
+        else:
+            screen.blits([(self._surface(key, scale), (round((key[0] * CHUNK_SIZE - camera_x) * scale),
+                                                       round((key[1] * CHUNK_SIZE - camera_y) * scale)))
+                          for key in visible], doreturn=False)
+
+        budget = PREFETCH_PER_FRAME
+        for key in self._view_keys(camera_x, camera_y, view_width, view_height, PREFETCH_RING):
+            if budget == 0:
+                break
+            chunk = self.chunks.get(key)
+            if chunk is None or not chunk.ready(scale):
+                self._surface(key, scale)
+                budget -= 1
+
+    def draw_obstacles(self, screen, camera_x, camera_y):
+        """Draws only the obstacles in on-screen chunks."""
+        scale = WORLD_VIEW.scale
+        view_width, view_height = (int(side / scale) for side in screen.get_size())
+        view = pygame.Rect(camera_x, camera_y, view_width, view_height).inflate(16, 16)  # Roof borders overhang
+        seen = set()
+        for key in self._keys_for(view):
+            for obstacle in self.chunk_obstacles.get(key, ()):
+                if obstacle.obstacle_id not in seen:
+                    seen.add(obstacle.obstacle_id)
+                    obstacle.draw(screen, camera_x, camera_y)
+
+    def stats(self):
+        return (f"{len(self.chunks)} chunks cached, {self.used_bytes // 1024} KB, "
+                f"{self.baked} bakes, {self.evicted} evicted")